@@ -0,0 +1,185 @@
+"""
+Python API for BakingBakes addon
+
+Drives bakes from scripts without going through the operator. Jobs are plain
+data (an object or its name, Blender bake types, resolutions); the scene's
+BakingBakes settings are copied rather than modified, the object to bake is
+selected through a context override, and every job produces a BakeResult.
+All jobs of a call share one bake session, so render settings, UV masks and
+the output store are set up once for the whole batch.
+
+    from bakingbakes import api    # the addon's module name
+
+    results = api.bake(
+        [api.BakeJob("Crate", passes=('DIFFUSE', 'NORMAL'), resolution=2048),
+         {"obj": "Barrel", "passes": ["ROUGHNESS"], "resolution": 1024}],
+        output_dir="/tmp/bakes",
+        file_format='DDS',
+    )
+
+    # Results stream out one job at a time
+    for result in api.iter_bake(jobs, recipe='GAME_ASSETS'):
+        print(result.object_name, result.success, result.outputs)
+
+Extra keyword arguments override any BakingBakes bake or output setting for
+the call (bake_margin=8, prune_shader_graphs=True, ...).
+"""
+
+import time
+from types import SimpleNamespace
+
+import bpy
+
+from .core import baking, recipes
+from .core.session import BakeSession
+
+# Blender bake type -> BakeSettings checkbox enabling it
+PASS_SETTINGS = {bake_type: attr_name for attr_name, (bake_type, suffix) in baking.get_bake_type_mapping().items()}
+
+class BakeJob:
+    """One object to bake
+
+    passes are Blender bake types ('DIFFUSE', 'NORMAL', ...); None bakes the
+    passes enabled in the scene. resolution and output_resolution are a size
+    or a (width, height) pair; None keeps the scene's output settings, and
+    output_resolution defaults to resolution.
+    """
+    def __init__(self, obj, passes=None, resolution=None, output_resolution=None):
+        self.obj = obj
+        self.passes = tuple(passes) if passes is not None else None
+        self.resolution = resolution
+        self.output_resolution = output_resolution if output_resolution is not None else resolution
+
+        unknown = [bake_type for bake_type in self.passes or () if bake_type not in PASS_SETTINGS]
+        if unknown:
+            raise ValueError(f"Unknown bake types: {', '.join(unknown)}")
+
+    @property
+    def object_name(self):
+        """Name of the object to bake"""
+        return self.obj if isinstance(self.obj, str) else self.obj.name
+
+    def resolve(self):
+        """Get the object to bake, or None when it does not exist"""
+        if isinstance(self.obj, str):
+            return bpy.data.objects.get(self.obj)
+        return self.obj
+
+class BakeResult:
+    """Outcome of one BakeJob"""
+    def __init__(self, job, success, message, outputs, seconds):
+        self.job = job
+        self.success = success
+        self.message = message
+        # Absolute paths of the files the job wrote (background encoded files
+        # are complete once the bake call or generator has finished)
+        self.outputs = outputs
+        self.seconds = seconds
+
+    @property
+    def object_name(self):
+        """Name of the object the job baked"""
+        return self.job.object_name
+
+    def as_dict(self):
+        """Get the result as plain data, e.g. for JSON reports"""
+        return {
+            "object": self.object_name,
+            "success": self.success,
+            "message": self.message,
+            "outputs": list(self.outputs),
+            "seconds": round(self.seconds, 3),
+        }
+
+def as_job(job):
+    """Turn an object, an object name, a dict of BakeJob arguments or a BakeJob into a BakeJob"""
+    if isinstance(job, BakeJob):
+        return job
+    if isinstance(job, dict):
+        return BakeJob(**job)
+    return BakeJob(job)
+
+def copy_settings(settings):
+    """Copy the values of a BakingBakes property group into a dict"""
+    return {
+        name: getattr(settings, name)
+        for name in settings.bl_rna.properties.keys() if name != 'rna_type'
+    }
+
+def _size(resolution):
+    """Split a size or (width, height) pair"""
+    if isinstance(resolution, int):
+        return resolution, resolution
+    width, height = resolution
+    return width, height
+
+def job_settings(job, bake_values, output_values):
+    """Build the bake and output settings one job runs with"""
+    bake_values = dict(bake_values)
+    output_values = dict(output_values)
+
+    if job.passes is not None:
+        for bake_type, attr_name in PASS_SETTINGS.items():
+            bake_values[attr_name] = bake_type in job.passes
+
+    if job.resolution is not None:
+        output_values['bake_width'], output_values['bake_height'] = _size(job.resolution)
+        output_values['output_width'], output_values['output_height'] = _size(job.output_resolution)
+
+    return SimpleNamespace(**bake_values), SimpleNamespace(**output_values)
+
+def iter_bake(jobs, recipe=None, output_dir=None, context=None, **settings):
+    """Bake jobs one at a time, yielding a BakeResult as each finishes
+
+    recipe is a preset name or a list of them; recipe outputs replace the
+    jobs' passes. output_dir defaults to the folder of the .blend. The
+    output manifest is written once the generator is exhausted or closed.
+    """
+    context = context or bpy.context
+    scene = context.scene
+
+    bake_values = copy_settings(scene.bakingbakes_settings)
+    output_values = copy_settings(scene.bakingbakes_output)
+    for name, value in settings.items():
+        if name in bake_values:
+            bake_values[name] = value
+        elif name in output_values:
+            output_values[name] = value
+        else:
+            raise ValueError(f"Unknown BakingBakes setting: {name}")
+
+    session = BakeSession(context, output_dir)
+    session.selection_override = True
+    if recipe:
+        if output_values['bake_target'] != 'IMAGE_TEXTURES':
+            raise ValueError("Recipes write image files and cannot target color attributes")
+        session.recipe_plan = recipes.compile_recipes(sorted([recipe] if isinstance(recipe, str) else recipe))
+
+    try:
+        for job in jobs:
+            yield _run_job(context, session, as_job(job), bake_values, output_values)
+    finally:
+        session.close()
+
+def _run_job(context, session, job, bake_values, output_values):
+    """Bake one job inside a selection override"""
+    start = time.perf_counter()
+    obj = job.resolve()
+    if obj is None or obj.type != 'MESH':
+        return BakeResult(job, False, f"{job.object_name} is not a mesh object", [], 0.0)
+
+    bake_settings, output_settings = job_settings(job, bake_values, output_values)
+    first_output = len(session.written)
+    try:
+        with context.temp_override(
+            object=obj, active_object=obj, selected_objects=[obj], selected_editable_objects=[obj]
+        ):
+            success, message = baking.perform_multi_baking(context, obj, bake_settings, output_settings, session)
+    except Exception as e:
+        success, message = False, str(e)
+
+    return BakeResult(job, success, message, session.written[first_output:], time.perf_counter() - start)
+
+def bake(jobs, recipe=None, output_dir=None, context=None, **settings):
+    """Bake jobs and return their BakeResults in job order (see iter_bake)"""
+    return list(iter_bake(jobs, recipe, output_dir, context, **settings))
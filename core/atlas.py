@@ -0,0 +1,242 @@
+"""
+Texture atlases for BakingBakes addon
+
+Scenes full of small props bake one image set per prop and material, so a
+bake run makes hundreds of Cycles calls and hands the game hundreds of tiny
+textures. Atlas mode gathers the bake UV islands of a group of objects,
+scales them to a shared texel density by surface area, packs them into one
+layout with a shelf packer and writes it to a "BakeAtlas" UV map. Each pass
+is then baked once for the whole group into a single texture set, and the
+atlas UV map stays on the meshes so the set can be used downstream.
+
+Objects sharing a mesh share its islands, so only one of them is baked per
+mesh, like linked duplicates.
+"""
+
+import re
+
+import numpy as np
+
+from . import bake_list, planner
+
+ATLAS_UV_NAME = "BakeAtlas"
+# UVs closer than this are treated as the same UV when joining faces into islands
+UV_WELD_PRECISION = 1e5
+# Characters replaced when a bake list label becomes part of an atlas file name
+UNSAFE_NAME_CHARACTERS = re.compile(r"[^\w.-]")
+# Packing passes spent growing island gaps to the bake margin at the final scale
+GAP_PASSES = 3
+
+class AtlasLayout:
+    """One packed atlas: the objects it covers and how well they fill it"""
+    def __init__(self, name, objects, group_size, island_count, fill):
+        self.name = name
+        # One object per packed mesh, in bake list order
+        self.objects = objects
+        self.group_size = group_size
+        self.island_count = island_count
+        # Fraction of the atlas covered by island bounds
+        self.fill = fill
+
+    def summary(self):
+        """Describe the layout for the console"""
+        return (f"{self.name}: {self.island_count} islands from {len(self.objects)} meshes "
+                f"({self.group_size} objects), {self.fill:.0%} filled")
+
+def atlas_groups(scene, bake_objects, grouping, objects=None):
+    """Split the bake list into (label, objects) atlas groups
+
+    'LIST' puts the whole list in one atlas; 'ITEM' makes one atlas per bake
+    list entry, so each collection or pattern gets its own texture set.
+    objects restricts the groups to those objects.
+    """
+    allowed = set(objects) if objects is not None else None
+    groups = {}
+    for obj, item in bake_list.resolve_items(scene, bake_objects):
+        if allowed is not None and obj not in allowed:
+            continue
+        label = bake_list.item_label(item) if grouping == 'ITEM' else ""
+        groups.setdefault(label, []).append(obj)
+    return list(groups.items())
+
+def atlas_name(base_name, label):
+    """Get the output name of an atlas group, safe to use in file names"""
+    if not label:
+        return base_name
+    return f"{base_name}_{UNSAFE_NAME_CHARACTERS.sub('_', label)}"
+
+def _faces_of_loops(mesh):
+    """Get the polygon index of every loop, plus polygon loop starts and counts"""
+    count = len(mesh.polygons)
+    starts = np.empty(count, dtype=np.int64)
+    totals = np.empty(count, dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", starts)
+    mesh.polygons.foreach_get("loop_total", totals)
+    return np.repeat(np.arange(count), totals), starts, totals
+
+def read_uvs(mesh, uv_name):
+    """Read a UV map into an (loops, 2) float64 array"""
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float64)
+    mesh.uv_layers[uv_name].data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
+
+def find_islands(mesh, uvs):
+    """Label every loop with its UV island
+
+    Faces sharing a vertex at the same UV belong to one island. Returns
+    (island index per loop, island count).
+    """
+    faces, starts, totals = _faces_of_loops(mesh)
+    if not len(faces):
+        return np.zeros(0, dtype=np.int64), 0
+
+    vertices = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", vertices)
+    welded = np.round(uvs * UV_WELD_PRECISION).astype(np.int64)
+    keys = np.unique(np.column_stack([vertices, welded]), axis=0, return_inverse=True)[1].ravel()
+
+    # Loops sharing a key join their faces; consecutive loops in key order are enough
+    order = np.argsort(keys, kind='stable')
+    same = np.flatnonzero(keys[order[1:]] == keys[order[:-1]])
+    pairs = np.column_stack([faces[order[same]], faces[order[same + 1]]])
+
+    parent = list(range(len(starts)))
+
+    def find(face):
+        while parent[face] != face:
+            parent[face] = parent[parent[face]]
+            face = parent[face]
+        return face
+
+    for face_a, face_b in pairs.tolist():
+        root_a, root_b = find(face_a), find(face_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = np.array([find(face) for face in range(len(starts))], dtype=np.int64)
+    unique_roots, face_islands = np.unique(roots, return_inverse=True)
+    return face_islands.ravel()[faces], len(unique_roots)
+
+def uv_area(mesh, uvs):
+    """Get the total UV area of a mesh's polygons"""
+    faces, starts, totals = _faces_of_loops(mesh)
+    if not len(faces):
+        return 0.0
+    following = np.arange(len(faces)) + 1
+    following[starts + totals - 1] = starts
+    cross = uvs[:, 0] * uvs[following, 1] - uvs[following, 0] * uvs[:, 1]
+    return float(np.abs(np.add.reduceat(cross, starts)).sum() / 2)
+
+def world_area(obj):
+    """Get the surface area of obj's mesh in world space (scale applied approximately)"""
+    areas = np.empty(len(obj.data.polygons), dtype=np.float64)
+    obj.data.polygons.foreach_get("area", areas)
+    scale = obj.matrix_world.to_scale()
+    return float(areas.sum()) * abs(scale.x * scale.y * scale.z) ** (2 / 3)
+
+def pack_shelves(sizes, gap):
+    """Pack (N, 2) rectangle sizes into rows, tallest first
+
+    Each rectangle is padded by gap. Returns (N, 2) lower corners of the
+    unpadded rectangles and the side of the square that holds them all.
+    """
+    padded = sizes + gap
+    order = np.argsort(-padded[:, 1], kind='stable')
+    # Rows about as wide as a square of the total area, a little over to leave room for row ends
+    shelf_width = max(np.sqrt((padded[:, 0] * padded[:, 1]).sum()) * 1.05, padded[:, 0].max())
+
+    corners = np.empty_like(sizes)
+    x = y = shelf_height = width = 0.0
+    for index in order.tolist():
+        rect_width, rect_height = padded[index]
+        if x > 0 and x + rect_width > shelf_width:
+            y += shelf_height
+            x = shelf_height = 0.0
+        corners[index] = (x + gap / 2, y + gap / 2)
+        x += rect_width
+        width = max(width, x)
+        shelf_height = max(shelf_height, rect_height)
+
+    return corners, max(width, y + shelf_height)
+
+def build_atlas(name, objects, use_bake_uv_map, resolution, margin):
+    """Pack the bake UV islands of objects into one layout written to ATLAS_UV_NAME
+
+    Islands are read from the map a normal bake would use (see
+    planner.bake_uv_map_name()), scaled to a shared texel density by world
+    surface area and laid on their long side to fill rows better; margin is
+    the padding in pixels kept around every island at resolution. Returns
+    the AtlasLayout.
+    """
+    # Objects sharing a mesh share its islands
+    mesh_objects = {}
+    for obj in objects:
+        mesh_objects.setdefault(obj.data, obj)
+
+    # Per packed mesh: (object, uvs, island per loop, island base index, density scale)
+    sources = []
+    lower_bounds = []
+    upper_bounds = []
+    scales = []
+    for obj in mesh_objects.values():
+        mesh = obj.data
+        uv_name = planner.bake_uv_map_name(obj, use_bake_uv_map)
+        if not uv_name or uv_name not in mesh.uv_layers:
+            raise ValueError(f"{obj.name} has no {uv_name or 'UV'} map to build the atlas from")
+        uvs = read_uvs(mesh, uv_name)
+        islands, count = find_islands(mesh, uvs)
+
+        area = uv_area(mesh, uvs)
+        scale = np.sqrt(world_area(obj) / area) if area > 0 else 0.0
+        if not count or scale <= 0:
+            print(f"Skipping {obj.name} in atlas {name}: no UV area")
+            continue
+
+        lower = np.full((count, 2), np.inf)
+        upper = np.full((count, 2), -np.inf)
+        np.minimum.at(lower, islands, uvs)
+        np.maximum.at(upper, islands, uvs)
+        sources.append((obj, uvs, islands, sum(len(bounds) for bounds in lower_bounds), scale))
+        lower_bounds.append(lower)
+        upper_bounds.append(upper)
+        scales.append(np.full(count, scale))
+
+    if not lower_bounds:
+        raise ValueError(f"No UV islands to pack into atlas {name}")
+
+    lower = np.concatenate(lower_bounds)
+    sizes = (np.concatenate(upper_bounds) - lower) * np.concatenate(scales)[:, np.newaxis]
+    sizes = np.maximum(sizes, 1e-9)
+    rotated = sizes[:, 1] > sizes[:, 0]
+    flat = np.where(rotated[:, np.newaxis], sizes[:, ::-1], sizes)
+
+    # The gap is in packed units, which only map to pixels once the final side is known
+    gap = 0.0
+    for _ in range(GAP_PASSES):
+        corners, side = pack_shelves(flat, gap)
+        gap = (2 * margin + 1) * side / resolution
+    corners, side = pack_shelves(flat, gap)
+
+    for obj, uvs, islands, base, scale in sources:
+        island_index = islands + base
+        local = (uvs - lower[island_index]) * scale
+        turned = rotated[island_index]
+        # Tall islands turn a quarter onto their side: (x, y) -> (height - y, x)
+        local[turned] = np.column_stack([sizes[island_index[turned], 1] - local[turned, 1], local[turned, 0]])
+        packed = (local + corners[island_index]) / side
+
+        mesh = obj.data
+        atlas_layer = mesh.uv_layers.get(ATLAS_UV_NAME) or mesh.uv_layers.new(name=ATLAS_UV_NAME, do_init=False)
+        if atlas_layer is None:
+            raise ValueError(f"{obj.name} has no free UV map slot for {ATLAS_UV_NAME}")
+        atlas_layer.data.foreach_set("uv", packed.astype(np.float32).ravel())
+        mesh.update()
+
+    fill = float((sizes[:, 0] * sizes[:, 1]).sum() / (side * side))
+    return AtlasLayout(name, [source[0] for source in sources], len(objects), len(sizes), fill)
+
+def use_atlas_uv(objects):
+    """Make the atlas UV map the active one on every object's mesh"""
+    for obj in objects:
+        for uv_layer in obj.data.uv_layers:
+            uv_layer.active = uv_layer.name == ATLAS_UV_NAME
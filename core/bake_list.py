@@ -0,0 +1,166 @@
+"""
+Bake list management for BakingBakes addon
+
+A bake list item is either one object or a bake set: a collection or an
+object name pattern. Sets are resolved lazily at bake time, so they follow
+the scene without being re-added. Every item also caches the status of its
+last bake so the list can draw it without touching the objects.
+"""
+
+import array
+import fnmatch
+import hashlib
+import time
+
+from .planner import modifier_signature
+
+def item_label(item):
+    """Get the text a bake list item is listed under"""
+    if item.source_type == 'COLLECTION':
+        return item.collection.name if item.collection else "Missing Collection"
+    if item.source_type == 'PATTERN':
+        return item.pattern or "Empty Pattern"
+    return item.object.name if item.object else "Invalid Object"
+
+def item_objects(scene, item):
+    """Resolve one item to its mesh objects"""
+    if item.source_type == 'COLLECTION':
+        objects = item.collection.all_objects if item.collection else []
+    elif item.source_type == 'PATTERN':
+        if not item.pattern:
+            return []
+        objects = [obj for obj in scene.objects if fnmatch.fnmatchcase(obj.name, item.pattern)]
+    else:
+        objects = [item.object] if item.object else []
+    return [obj for obj in objects if obj.type == 'MESH']
+
+def resolve_items(scene, bake_objects):
+    """Resolve the whole list to unique (object, item) pairs in list order
+
+    An object reached through several items belongs to the first of them.
+    """
+    resolved = []
+    seen = set()
+    for item in bake_objects.objects:
+        for obj in item_objects(scene, item):
+            if obj not in seen:
+                seen.add(obj)
+                resolved.append((obj, item))
+    return resolved
+
+def resolve_objects(scene, bake_objects):
+    """Resolve the whole list to unique mesh objects in list order"""
+    return [obj for obj, item in resolve_items(scene, bake_objects)]
+
+def add_objects(bake_objects, objects):
+    """Add objects not already listed, checking membership against a set. Returns the count added"""
+    listed = {item.object for item in bake_objects.objects if item.source_type == 'OBJECT' and item.object}
+    added = 0
+    for obj in objects:
+        if obj in listed:
+            continue
+        item = bake_objects.objects.add()
+        item.source_type = 'OBJECT'
+        item.object = obj
+        item.name = obj.name
+        listed.add(obj)
+        added += 1
+    return added
+
+def add_set(bake_objects, collection=None, pattern=""):
+    """Add a collection or name pattern bake set unless an identical one is listed"""
+    source_type = 'COLLECTION' if collection else 'PATTERN'
+    for item in bake_objects.objects:
+        if item.source_type == source_type and (
+            (collection and item.collection == collection) or (not collection and item.pattern == pattern)
+        ):
+            return None
+
+    item = bake_objects.objects.add()
+    item.source_type = source_type
+    if collection:
+        item.collection = collection
+        item.name = collection.name
+    else:
+        item.pattern = pattern
+        item.name = pattern
+    return item
+
+def remove_objects(bake_objects, objects):
+    """Remove the object items for objects in one pass. Returns the count removed"""
+    objects = set(objects)
+    indices = [
+        index for index, item in enumerate(bake_objects.objects)
+        if item.source_type == 'OBJECT' and item.object in objects
+    ]
+    # Remove from the end so earlier indices stay valid
+    for index in reversed(indices):
+        bake_objects.objects.remove(index)
+    bake_objects.active_index = min(bake_objects.active_index, max(len(bake_objects.objects) - 1, 0))
+    return len(indices)
+
+def mesh_digest(mesh):
+    """Hash a mesh's vertex positions and face topology
+
+    Read in bulk into stdlib arrays, so the bake list needs no NumPy.
+    """
+    coords = array.array('f', bytes(4 * 3 * len(mesh.vertices)))
+    mesh.vertices.foreach_get("co", coords)
+    loop_vertices = array.array('i', bytes(4 * len(mesh.loops)))
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_totals = array.array('i', bytes(4 * len(mesh.polygons)))
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+
+    digest = hashlib.blake2b(digest_size=8)
+    for values in (coords, loop_vertices, loop_totals):
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def bake_input_hash(obj):
+    """Short hash of what an object's bake depends on, cheap enough to take per bake
+
+    Covers the mesh data, material names, modifier settings and placement,
+    all of which read the same in every session.
+    """
+    mesh = obj.data
+    signature = (
+        mesh.name,
+        mesh_digest(mesh),
+        tuple(slot.material.name if slot.material else "" for slot in obj.material_slots),
+        tuple(modifier_signature(modifier) for modifier in obj.modifiers),
+        tuple(round(value, 6) for row in obj.matrix_world for value in row),
+    )
+    return hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:12]
+
+class StatusRecorder:
+    """Writes bake results onto the list items the baked objects came from
+
+    Takes the (object, item) pairs from resolve_items(). Object items show their own result; set items show a summary of their
+    objects once finish() is called.
+    """
+    def __init__(self, resolved):
+        self.items = dict(resolved)
+        self.set_results = {}
+
+    def record(self, obj, success, message=""):
+        """Record the result of baking obj"""
+        item = self.items.get(obj)
+        if item is None:
+            return
+
+        if item.source_type == 'OBJECT':
+            item.last_result = 'DONE' if success else 'FAILED'
+            item.last_message = message
+            item.last_bake_time = time.strftime("%Y-%m-%d %H:%M:%S")
+            item.last_hash = bake_input_hash(obj)
+        else:
+            done, failed = self.set_results.get(item, (0, 0))
+            self.set_results[item] = (done + success, failed + (not success))
+
+    def finish(self):
+        """Write summaries onto set items"""
+        for item, (done, failed) in self.set_results.items():
+            item.last_result = 'FAILED' if failed else 'DONE'
+            item.last_message = f"{done} baked, {failed} failed" if failed else f"{done} baked"
+            item.last_bake_time = time.strftime("%Y-%m-%d %H:%M:%S")
+            item.last_hash = ""
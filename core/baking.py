@@ -1,9 +1,23 @@
 """
-Baking logic and operations for BakingBakes addon
+Bake engine for BakingBakes addon
+
+Everything that runs a bake lives here and is imported on first use by the
+operators, so enabling the addon does not load NumPy or the post-process
+modules.
 """
 
+import os
+import shutil
+import time
+
 import bpy
 
+from . import (
+    atlas, bake_list, block_compression, cage, derived, imaging, isolation, output_store, pass_cache,
+    planner, preview, proxy, pruning, recipes, storage, tuning, vertex_colors, watchdog
+)
+from .session import BakeSession
+
 def ensure_uv_map(obj, uv_name="Bake"):
     """Ensure object has UV map with specified name"""
     if obj.type != 'MESH':
@@ -20,14 +34,28 @@ def ensure_uv_map(obj, uv_name="Bake"):
     return uv_maps.new(name=uv_name)
 
 def create_bake_image(material_name, suffix, resolution=1024):
-    """Create new image for baking with proper naming"""
+    """Create new image for baking with proper naming
+
+    A bake image left by an earlier run under the same name is reset and
+    reused, so rebakes do not pile up numbered copies.
+    """
     image_name = f"{material_name}_{suffix}"
+    image = bpy.data.images.get(image_name)
+    if image and image.get(storage.BAKE_IMAGE_TAG):
+        if image.packed_file:
+            image.unpack(method='REMOVE')
+        image.source = 'GENERATED'
+        image.generated_width = resolution
+        image.generated_height = resolution
+        return image
+
     image = bpy.data.images.new(
         name=image_name,
         width=resolution,
         height=resolution,
         alpha=(suffix in ['Normal', 'Alpha'])
     )
+    storage.tag_bake_image(image)
     return image
 
 def setup_material_for_baking(material, bake_image):
@@ -51,14 +79,18 @@ def setup_material_for_baking(material, bake_image):
     if not output_node:
         return None
 
-    # Create image texture node for baking (unconnected)
-    tex_node = nodes.new(type='ShaderNodeTexImage')
-    tex_node.location = (-600, -300)  # Position below main material
+    # Reuse the image texture node an earlier bake of this pass left, or create one (unconnected)
+    label = f"{storage.BAKE_NODE_LABEL_PREFIX}{bake_image.name.split('_')[-1]}"
+    tex_node = next((node for node in nodes if node.type == 'TEX_IMAGE' and node.label == label), None)
+    if not tex_node:
+        tex_node = nodes.new(type='ShaderNodeTexImage')
+        tex_node.location = (-600, -300)  # Position below main material
+        tex_node.label = label
     tex_node.image = bake_image
-    tex_node.label = f"Baked {bake_image.name.split('_')[-1]}"
 
     # Don't connect to anything - keep it unconnected as requested
-    # The bake operation will use this node as the bake target
+    # The bake operation will use the active node as the bake target
+    nodes.active = tex_node
 
     return tex_node
 
@@ -68,7 +100,7 @@ def get_bake_type_mapping():
         'bake_diffuse': ('DIFFUSE', 'Albedo'),
         'bake_normal': ('NORMAL', 'Normal'),
         'bake_roughness_glossy': ('ROUGHNESS', 'Roughness'),
-        'bake_emission': ('EMIT', 'Emission'),
+        'bake_emit': ('EMIT', 'Emission'),
         'bake_ao': ('AO', 'AmbientOcclusion'),
         'bake_shadow': ('SHADOW', 'Shadow'),
         'bake_uv': ('UV', 'UV'),
@@ -87,15 +119,22 @@ def get_bake_type_mapping():
         'bake_bump': ('BUMP', 'Bump'),
     }
 
-def check_uv_maps_for_objects(bake_objects, require_bake_uv=True):
+def get_selected_bakes(bake_settings):
+    """Get (bake_type, suffix) pairs for every enabled bake type checkbox"""
+    selected_bakes = []
+    for attr_name, (bake_type, suffix) in get_bake_type_mapping().items():
+        if getattr(bake_settings, attr_name, False):
+            selected_bakes.append((bake_type, suffix))
+    return selected_bakes
+
+def check_uv_maps_for_objects(objects, require_bake_uv=True):
     """Check if all objects have required UV maps"""
     if not require_bake_uv:
         return True, []
 
     missing_uv_objects = []
 
-    for item in bake_objects.objects:
-        obj = item.object
+    for obj in objects:
         if not obj or obj.type != 'MESH':
             continue
 
@@ -105,7 +144,10 @@ def check_uv_maps_for_objects(bake_objects, require_bake_uv=True):
 
     return len(missing_uv_objects) == 0, missing_uv_objects
 
-# REFACTORED: Clean dictionary-based bake operations instead of ugly elif chain
+# ============================================================================
+# CLEAN BAKE OPERATIONS (No more ugly elif chain!)
+# ============================================================================
+
 BAKE_OPERATIONS = {
     'NORMAL': lambda: bpy.ops.object.bake(type='NORMAL', pass_filter={'COLOR'}),
     'ROUGHNESS': lambda: bpy.ops.object.bake(type='ROUGHNESS', pass_filter={'COLOR'}),
@@ -136,10 +178,609 @@ def perform_bake_operation(bake_type):
     else:
         raise ValueError(f"Unsupported bake type: {bake_type}")
 
-def perform_multi_baking(context, obj, bake_settings):
-    """Perform baking for multiple selected bake types - REFACTORED"""
+def pass_parts(session, image, bake_type, objects, uv_name):
+    """Get the raw pass cache key parts of a pass, or None when the cache is off
+
+    Taken once the pass configuration is applied but before shader graphs are
+    pruned, so materials are keyed as the artist left them. objects are
+    everything the bake reads.
+    """
+    if not session.pass_cache:
+        return None
+    width, height = image.size
+    return pass_cache.job_parts(session.context.scene, objects, uv_name, bake_type, width, height)
+
+def bake_pass(session, image, bake_type, entry, parts):
+    """Bake a pass into image with Cycles, or get it from the raw pass cache when replaying
+
+    entry names the pass in the cache ({object}_{material}_{suffix}, with
+    the original object for proxies); parts comes from pass_parts(). Fresh
+    bakes are stored when the cache is on. Returns (Cycles seconds, None),
+    or (None, pixels) when the pass was replayed: pixels is the read-only
+    mapped buffer and image is left as it was.
+    """
+    cache = session.pass_cache
+    if cache and session.replay:
+        width, height = image.size
+        cached = cache.load(entry, parts)
+        if cached is not None and cached.shape == (height, width, image.channels):
+            return None, cached
+        print(f"Baking {bake_type} for {entry}")
+
+    bake_start = time.perf_counter()
+    perform_bake_operation(bake_type)
+    bake_seconds = time.perf_counter() - bake_start
+
+    if cache:
+        cache.store(entry, parts, imaging.read_image_pixels(image))
+    return bake_seconds, None
+
+def apply_bake_configuration(scene, configuration, applied):
+    """Write configuration values that differ from those last applied this session"""
+    for path, value in configuration.items():
+        if path in applied and applied[path] == value:
+            continue
+
+        owner_path, attr_name = path.rsplit('.', 1)
+        setattr(scene.path_resolve(owner_path), attr_name, value)
+        applied[path] = value
+
+def apply_tuning(session, scene, bake_settings, bake_type, width, height):
+    """Apply this machine's calibrated Cycles settings for a pass at a resolution
+
+    The scene's own values come back when the session closes.
+    """
+    if not bake_settings.use_tuning_profile:
+        return
+    if session.tuning is None:
+        session.tuning = tuning.load_profile()
+
+    configuration = tuning.profile_configuration(session.tuning, bake_type, width, height)
+    session.remember_settings(configuration)
+    apply_bake_configuration(scene, configuration, session.applied_config)
+
+def select_for_bake(context, session, obj):
+    """Make obj the only selected and active object, unless a context override provides the selection"""
+    if session.selection_override:
+        return
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+def get_cycles_margin(output_settings):
+    """Get the margin Cycles should bake with (none when padding is a post-process)"""
+    if output_settings.margin_mode == 'POSTPROCESS':
+        return 0
+    return output_settings.bake_margin
+
+def apply_margin_postprocess(session, obj, uv_name, image, output_settings):
+    """Pad UV islands of a zero-margin bake outward by the bake margin"""
+    if output_settings.margin_mode != 'POSTPROCESS' or output_settings.bake_margin <= 0:
+        return
+
+    width, height = image.size
+    fill = session.margin_fill(obj, uv_name, width, height, output_settings.bake_margin)
+    pixels = imaging.read_image_pixels(image)
+    imaging.write_image_pixels(image, imaging.apply_margin(pixels, fill))
+
+def margin_pixels(session, obj, uv_name, pixels, output_settings):
+    """Get a pass buffer with UV islands padded like apply_margin_postprocess() pads images
+
+    Read-only buffers (replayed passes) are padded on a copy.
+    """
+    if output_settings.margin_mode != 'POSTPROCESS' or output_settings.bake_margin <= 0:
+        return pixels
+
+    height, width = pixels.shape[:2]
+    fill = session.margin_fill(obj, uv_name, width, height, output_settings.bake_margin)
+    if not pixels.flags.writeable:
+        pixels = pixels.copy()
+    return imaging.apply_margin(pixels, fill)
+
+def margin_steps(session, pool, obj, uv_name, width, height, output_settings):
+    """Get the pool steps padding a width x height buffer like margin_pixels()"""
+    if output_settings.margin_mode != 'POSTPROCESS' or output_settings.bake_margin <= 0:
+        return []
+
+    targets, sources = session.margin_fill(obj, uv_name, width, height, output_settings.bake_margin)
+    return [{"op": "margin", "targets": pool.constant(targets), "sources": pool.constant(sources)}]
+
+def keep_recipe_buffer(session, obj, uv_name, image, pixels, output_settings):
+    """Get the buffer recipes read for a baked pass, padded by the margin
+
+    pixels is a replayed pass, or None to read image. With the
+    post-processing pool the buffer is copied into shared memory once and
+    padded there by a worker; recipe outputs read it in place.
+    """
+    if pixels is None:
+        pixels = imaging.read_image_pixels(image)
+    pool = session.postprocess_pool(output_settings)
+    if not pool:
+        return margin_pixels(session, obj, uv_name, pixels, output_settings)
+
+    height, width = pixels.shape[:2]
+    shared = pool.share(pixels)
+    steps = margin_steps(session, pool, obj, uv_name, width, height, output_settings)
+    if steps:
+        shared.writer = pool.submit(steps, {"pixels": shared}, description=f"{image.name} margin")
+    return shared
+
+def submit_pass_output(session, pool, obj, uv_name, image, pixels, name, suffix, bake_type, output_settings):
+    """Pad, resize and save a pass buffer through the post-processing pool
+
+    DDS and KTX2 files written straight to the output folder are padded,
+    resized and encoded by one task. Otherwise the finished buffer comes
+    back to be saved through image (PNG) or the output store before the
+    bake call returns (see BakeSession.wait_for_outputs()).
+    """
+    height, width = pixels.shape[:2]
+    output_width, output_height = output_settings.output_width, output_settings.output_height
+    steps = margin_steps(session, pool, obj, uv_name, width, height, output_settings)
+    steps.append({"op": "resample", "width": output_width, "height": output_height})
+
+    file_format = output_settings.file_format
+    if file_format != 'PNG' and output_settings.output_store == 'OFF' and not output_settings.collapse_uniform:
+        save_bake_image(session, image, name, suffix, bake_type, output_settings, pixels, steps)
+        return
+
+    def save(result):
+        finished = result["pixels"]
+        if file_format == 'PNG':
+            if tuple(image.size) != (output_width, output_height):
+                image.scale(output_width, output_height)
+            imaging.write_image_pixels(image, finished)
+        save_bake_image(session, image, name, suffix, bake_type, output_settings, finished)
+
+    steps.append({"op": "return"})
+    task = pool.submit(steps, {"pixels": pixels}, description=f"{name}_{suffix}").then(save)
+    session.output_tasks.append(task)
+
+def save_pass(session, obj, uv_name, image, pixels, name, suffix, bake_type, bake_settings, output_settings):
+    """Derive, pad, resize and save a baked pass at the output resolution
+
+    pixels is the buffer of a replayed pass (see bake_pass()), which is
+    processed and encoded without going through image; PNGs are saved
+    through Blender, so for them it is copied into image first. With the
+    post-processing pool, padding, resizing and encoding run in workers
+    (see submit_pass_output()) and image keeps the raw pass unless it is
+    saved as PNG. Returns the output pixel count.
+    """
+    output_width, output_height = output_settings.output_width, output_settings.output_height
+    pool = session.postprocess_pool(output_settings)
+    if pool:
+        if pixels is None:
+            pixels = imaging.read_image_pixels(image)
+        save_derived_maps(session, obj, uv_name, image, name, bake_type, bake_settings, output_settings, pixels)
+        submit_pass_output(session, pool, obj, uv_name, image, pixels, name, suffix, bake_type, output_settings)
+        return output_width * output_height
+
+    if pixels is not None and output_settings.file_format == 'PNG':
+        imaging.write_image_pixels(image, pixels)
+        pixels = None
+
+    # Derive extra maps from the baked buffer before it is resized
+    save_derived_maps(session, obj, uv_name, image, name, bake_type, bake_settings, output_settings, pixels)
+
+    if pixels is None:
+        apply_margin_postprocess(session, obj, uv_name, image, output_settings)
+        if tuple(image.size) != (output_width, output_height):
+            image.scale(output_width, output_height)
+    else:
+        pixels = margin_pixels(session, obj, uv_name, pixels, output_settings)
+        pixels = imaging.resample(pixels, output_width, output_height)
+
+    save_bake_image(session, image, name, suffix, bake_type, output_settings, pixels)
+    return output_width * output_height
+
+def collapse_uniform(pixels, output_settings):
+    """Shrink a uniform buffer to a tiny constant one. Returns (pixels, color or None)"""
+    if not output_settings.collapse_uniform:
+        return pixels, None
+    color = output_store.uniform_color(pixels)
+    if color is None:
+        return pixels, None
+    return output_store.uniform_pixels(color), color
+
+def write_output(session, output_settings, path, pixels, variant, write, uniform=None):
+    """Write one output file through the run's output store (directly when it is off)
+
+    write(target) may return a PendingTask from the post-processing pool, in
+    which case the file lands by the time the session closes. Returns the
+    file that ends up holding the output.
+    """
+    store = session.output_store(output_settings.output_store)
+    if store is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A link left by an earlier run with the store on must not be written through
+        output_store.unlink_output(path)
+        write(path)
+        written = path
+    else:
+        written = store.store(path, pixels, variant, write, uniform)
+    session.written.append(written)
+    return written
+
+def save_bake_image(session, image, name, suffix, bake_type, output_settings, pixels=None, steps=()):
+    """Write a finished bake to the output folder as {name}_{suffix}.{ext}
+
+    name is the baked material's name, or the atlas name for atlas bakes.
+
+    PNG goes through Blender's image saving, then the image is packed or left
+    external by the storage policy. DDS and KTX2 are block encoded straight
+    from the in-memory buffer with a codec picked per pass: pixels when
+    given (see save_pass()), otherwise the image's. steps are pool steps
+    run on pixels before encoding them (see submit_pass_output()).
+    """
+    file_format = output_settings.file_format
+    use_store = output_settings.output_store != 'OFF'
+    policy = output_settings.storage_policy
+
+    # PNGs without the store or collapsing never need the pixels on the Python side
+    if file_format == 'PNG' and not use_store and not output_settings.collapse_uniform:
+        path = session.output_path(f"{name}_{suffix}.png")
+        os.makedirs(session.output_dir, exist_ok=True)
+        output_store.unlink_output(path)
+        if policy == 'PACK':
+            image.pack()
+        image.filepath = storage.blend_relative_path(path)
+        image.save()
+        storage.finish_saved_image(image, path, policy)
+        session.written.append(path)
+        return
+
+    if pixels is None:
+        pixels = imaging.read_image_pixels(image)
+    pixels, uniform = collapse_uniform(pixels, output_settings)
+    if uniform is not None:
+        print(f"Collapsed uniform {name}_{suffix} to {output_store.UNIFORM_SIZE}x{output_store.UNIFORM_SIZE}")
+
+    if file_format == 'PNG':
+        path = session.output_path(f"{name}_{suffix}.png")
+
+        def write(target):
+            # The bake image keeps its size; only the file holds the collapsed pixels
+            if uniform is not None:
+                save_pixels(pixels, target, f"{name}_{suffix}_Uniform", 'PNG', image.colorspace_settings.name)
+                return
+            image.filepath_raw = target
+            image.file_format = 'PNG'
+            image.save()
+
+        if policy == 'PACK':
+            image.pack()
+        written = write_output(
+            session, output_settings, path, pixels,
+            ('PNG', image.colorspace_settings.name), write, uniform
+        )
+        storage.finish_saved_image(image, written, policy)
+        return
+
+    codec = block_compression.codec_for_pass(bake_type, output_settings.color_codec)
+    srgb = bake_type in block_compression.COLOR_BAKE_TYPES
+    extension = block_compression.FILE_EXTENSIONS[file_format]
+    path = session.output_path(f"{name}_{suffix}.{extension}")
+    filename = os.path.basename(path)
+    pool = session.postprocess_pool(output_settings)
+    encoded = []
+
+    def report(size):
+        print(f"Encoded {filename} as {codec} ({size // 1024} KB)")
+
+    def write(target):
+        encoded.append(target)
+        # The pool encodes in the background and reports when done
+        if pool:
+            encode = {
+                "op": "encode", "path": target, "container": file_format, "codec": codec,
+                "generate_mips": output_settings.generate_mips, "srgb": srgb,
+            }
+            return pool.submit(
+                list(steps) + [encode], {"pixels": pixels}, description=filename
+            ).then(lambda result: report(result["bytes"]))
+        report(block_compression.write_compressed(
+            target,
+            pixels,
+            file_format,
+            codec,
+            generate_mips=output_settings.generate_mips,
+            srgb=srgb
+        ))
+
+    write_output(
+        session, output_settings, path, pixels,
+        (file_format, codec, output_settings.generate_mips, srgb), write, uniform
+    )
+    if not encoded:
+        print(f"Reused stored {filename}")
+
+def save_pixels(pixels, path, name, file_format, colorspace=None):
+    """Save a (height, width, 4) buffer to path through a temporary Blender image"""
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(
+        name=name,
+        width=width,
+        height=height,
+        alpha=True,
+        float_buffer=(file_format == 'OPEN_EXR')
+    )
+    try:
+        if colorspace:
+            image.colorspace_settings.name = colorspace
+        imaging.write_image_pixels(image, pixels)
+        image.filepath_raw = path
+        image.file_format = file_format
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+# File extensions for recipe output formats
+RECIPE_FILE_EXTENSIONS = {
+    'PNG': 'png',
+    'JPEG': 'jpg',
+    'TARGA': 'tga',
+    'TIFF': 'tif',
+    'OPEN_EXR': 'exr',
+}
+
+def get_recipe_bakes(plan):
+    """Get (bake_type, suffix) pairs for every pass a recipe plan needs"""
+    suffixes = {bake_type: suffix for bake_type, suffix in get_bake_type_mapping().values()}
+    return [(bake_type, suffixes.get(bake_type, bake_type.title())) for bake_type in plan.bake_types]
+
+def save_recipe_outputs(session, plan, name, buffers, output_settings):
+    """Run a recipe plan on one material's (or atlas') pass buffers and write every output file
+
+    Each unique output is encoded once; recipes requesting the identical file
+    get a copy (or a store link) under their own folder
+    ({output folder}/{recipe}/{name}_{suffix}.ext). With the post-processing
+    pool, buffers are SharedBuffers (see keep_recipe_buffer()): workers
+    evaluate each output's nodes and hand the result back to be saved, and
+    the buffers are released once every output is submitted.
+    """
+    def encode(pixels, file_format, destinations):
+        pixels, uniform = collapse_uniform(pixels, output_settings)
+        height, width = pixels.shape[:2]
+        extension = RECIPE_FILE_EXTENSIONS.get(file_format, file_format.lower())
+        paths = [
+            session.output_path(recipe_name.lower(), f"{name}_{suffix}.{extension}")
+            for recipe_name, suffix in destinations
+        ]
+
+        def write(target):
+            save_pixels(pixels, target, f"{name}_{destinations[0][1]}_Recipe", file_format)
+
+        if output_settings.output_store == 'OFF':
+            write_output(session, output_settings, paths[0], pixels, None, write)
+            for path in paths[1:]:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                output_store.unlink_output(path)
+                shutil.copyfile(paths[0], path)
+                session.written.append(path)
+        else:
+            for path in paths:
+                write_output(session, output_settings, path, pixels, (file_format,), write, uniform)
+
+        print(f"Wrote {', '.join(os.path.basename(path) for path in paths)} ({width}x{height} {file_format})")
+
+    pool = session.postprocess_pool(output_settings)
+    if not pool:
+        return recipes.execute_plan(plan, buffers, encode)
+
+    encoded = 0
+    for key, destinations in plan.destinations.items():
+        nodes = recipes.output_nodes(plan, key)
+        passes = [node[1] for node in nodes if node[0] == 'PASS']
+        if any(bake_type not in buffers for bake_type in passes):
+            continue
+        task = pool.submit(
+            [{"op": "recipe", "nodes": nodes}, {"op": "return"}],
+            {bake_type: buffers[bake_type] for bake_type in passes},
+            description=f"{name}_{destinations[0][1]}"
+        )
+        task.then(lambda result, key=key: encode(result["pixels"], key[2], plan.destinations[key]))
+        session.output_tasks.append(task)
+        encoded += 1
+
+    for buffer in buffers.values():
+        buffer.release()
+    return encoded
+
+def get_vertex_pack_channels(output_settings):
+    """Get {channel: bake_type} for the color attribute pack, empty when packing is off"""
+    if not output_settings.vertex_color_pack:
+        return {}
+    channels = {}
+    for channel in vertex_colors.PACK_CHANNELS:
+        bake_type = getattr(output_settings, f"vertex_pack_{channel.lower()}")
+        if bake_type != 'NONE':
+            channels[channel] = bake_type
+    return channels
+
+def perform_vertex_color_baking(context, obj, bake_settings, output_settings, session,
+                                batches=planner.PASS_BATCHES, finish=True):
+    """Bake every selected pass in batches into its own color attribute on obj's mesh
+
+    Passes only needed for the channel pack are baked into temporary
+    attributes that are removed once packed, which happens on the finishing
+    call.
+    """
+    scene = context.scene
+    mesh = obj.data
+    domain = output_settings.vertex_color_domain
+
+    suffixes = {bake_type: suffix for bake_type, suffix in get_bake_type_mapping().values()}
+    selected_bakes = get_selected_bakes(bake_settings)
+    pack_channels = get_vertex_pack_channels(output_settings)
+
+    temporary = []
+    baked_types = {bake_type for bake_type, suffix in selected_bakes}
+    for bake_type in pack_channels.values():
+        if bake_type not in baked_types:
+            suffix = suffixes.get(bake_type, bake_type.title())
+            selected_bakes.append((bake_type, suffix))
+            temporary.append(vertex_colors.attribute_name(suffix))
+            baked_types.add(bake_type)
+
+    if not selected_bakes:
+        return False, f"No bake types selected for {obj.name}"
+
+    jobs = planner.order_bake_jobs([(None, bake_type, suffix) for bake_type, suffix in selected_bakes], batches)
+
+    # Select object once for all jobs
+    select_for_bake(context, session, obj)
+
+    # Earlier batches of this run already filled some attributes
+    baked = session.baked_attributes.setdefault(obj.name, {})
+    baked_count = 0
+    for material, bake_type, suffix in jobs:
+        name = vertex_colors.attribute_name(suffix)
+        vertex_colors.ensure_color_attribute(mesh, name, domain)
+        vertex_colors.set_active_color_attribute(mesh, name)
+
+        apply_bake_configuration(scene, planner.pass_configuration(bake_type, bake_settings), session.applied_config)
+
+        pruned_swaps = None
+        if bake_settings.prune_shader_graphs:
+            pruned_swaps = pruning.use_pruned_materials(obj, bake_type)
+
+        try:
+            bake_start = time.perf_counter()
+            perform_bake_operation(bake_type)
+            session.record_timing(
+                bake_type, len(mesh.color_attributes[name].data),
+                scene.cycles.samples, time.perf_counter() - bake_start
+            )
+            baked[bake_type] = name
+            baked_count += 1
+            print(f"Baked {bake_type} for {obj.name} -> color attribute {name}")
+
+        except Exception as e:
+            print(f"Failed to bake {bake_type} for {obj.name}: {str(e)}")
+            continue
+
+        finally:
+            pruning.restore_materials(pruned_swaps)
+
+    if pack_channels and finish:
+        channels = {channel: baked[bake_type] for channel, bake_type in pack_channels.items() if bake_type in baked}
+        packed_name = vertex_colors.pack_color_attributes(mesh, channels, domain)
+        vertex_colors.set_active_color_attribute(mesh, packed_name)
+        for name in temporary:
+            if name in mesh.color_attributes:
+                mesh.color_attributes.remove(mesh.color_attributes[name])
+        print(f"Packed {', '.join(f'{channel}={bake_type}' for channel, bake_type in pack_channels.items())} into {packed_name}")
+    if finish:
+        session.baked_attributes.pop(obj.name, None)
+
+    return True, f"Successfully baked {baked_count} types for {obj.name}"
+
+def save_derived_maps(session, obj, uv_name, image, name, bake_type, bake_settings, output_settings,
+                      pixels=None):
+    """Compute enabled derived maps from a freshly baked image and save them next to it
+
+    obj is the baked object, or the list of objects sharing an atlas image.
+    pixels is a pass buffer to derive from instead of the image (a replayed
+    pass, or any pass with the post-processing pool); the maps are then
+    padded, resized and encoded as buffers too, in the pool when it is on.
+    """
+    suffixes = [
+        suffix for attr_name, suffix in derived.DERIVED_MAPS.get(bake_type, [])
+        if getattr(bake_settings, attr_name, False)
+    ]
+    if not suffixes:
+        return 0
+
+    width, height = image.size
+    buffered = pixels is not None
+    if not buffered:
+        pixels = imaging.read_image_pixels(image)
+    mask = session.coverage_mask(obj, uv_name, width, height)
+    pool = session.postprocess_pool(output_settings)
+
+    for suffix in suffixes:
+        values = derived.compute_derived_map(suffix, pixels, mask, bake_settings)
+        if buffered and pool:
+            # PNGs are saved through an image, other formats straight from the buffer
+            derived_image = None
+            if output_settings.file_format == 'PNG':
+                derived_image = create_bake_image(name, suffix, resolution=width)
+            submit_pass_output(
+                session, pool, obj, uv_name, derived_image, imaging.to_rgba(values), name, suffix, suffix,
+                output_settings
+            )
+            print(f"Derived {suffix} from {bake_type} -> {name}")
+            continue
+
+        if buffered:
+            derived_pixels = margin_pixels(session, obj, uv_name, imaging.to_rgba(values), output_settings)
+            derived_pixels = imaging.resample(
+                derived_pixels, output_settings.output_width, output_settings.output_height
+            )
+            save_bake_image(session, None, name, suffix, suffix, output_settings, derived_pixels)
+            print(f"Derived {suffix} from {bake_type} -> {name}")
+            continue
+
+        derived_image = create_bake_image(name, suffix, resolution=width)
+        imaging.write_image_pixels(derived_image, imaging.to_rgba(values))
+        apply_margin_postprocess(session, obj, uv_name, derived_image, output_settings)
+
+        # Resize to output resolution like the source map
+        if (output_settings.output_width != width or
+            output_settings.output_height != height):
+            derived_image.scale(output_settings.output_width, output_settings.output_height)
+
+        save_bake_image(session, derived_image, name, suffix, suffix, output_settings)
+
+        print(f"Derived {suffix} from {bake_type} -> {name}")
+
+    return len(suffixes)
+
+# ============================================================================
+# BAKING ENGINE
+# ============================================================================
+
+def save_recipe_buffers(session, owner, output_settings):
+    """Write the recipe outputs of every buffer set kept for owner (an object or atlas name)"""
+    for key in [key for key in session.recipe_buffers if key[0] == owner]:
+        save_recipe_outputs(session, session.recipe_plan, key[1], session.recipe_buffers.pop(key), output_settings)
+
+def perform_multi_baking(context, obj, bake_settings, output_settings, session=None,
+                         batches=planner.PASS_BATCHES, finish=True):
+    """Perform baking for multiple selected bake types - REFACTORED
+
+    session carries state shared across objects (render settings already
+    written, UV coverage masks), so it is only computed once per bake run.
+    batches limits the call to passes of those configuration batches; runs
+    over many objects bake one batch across all of them before the next and
+    pass finish with the last, which writes recipe outputs and packs color
+    attributes. A session created here is closed however the bake ends.
+    """
+    if session is not None:
+        return _bake_object_passes(context, obj, bake_settings, output_settings, session, batches, finish)
+
+    session = BakeSession(context)
+    try:
+        return _bake_object_passes(context, obj, bake_settings, output_settings, session, batches, finish)
+    finally:
+        session.close()
+
+def _bake_object_passes(context, obj, bake_settings, output_settings, session, batches, finish):
+    """Bake obj's passes in batches within session, see perform_multi_baking()"""
     scene = context.scene
 
+    # Color attribute targets need neither UV maps nor images
+    apply_bake_configuration(scene, {'render.bake.target': output_settings.bake_target}, session.applied_config)
+    if output_settings.bake_target == 'VERTEX_COLORS':
+        return perform_vertex_color_baking(context, obj, bake_settings, output_settings, session, batches, finish)
+
+    # Set bake resolution from output settings
+    bake_width = output_settings.bake_width
+    bake_height = output_settings.bake_height
+
+    # Set margin settings
+    scene.render.bake.margin = get_cycles_margin(output_settings)
+    scene.render.bake.margin_type = output_settings.margin_type
+
     # Ensure UV map exists
     if bake_settings.auto_uv_bake_map:
         uv_map = ensure_uv_map(obj, "Bake")
@@ -157,56 +798,682 @@ def perform_multi_baking(context, obj, bake_settings):
         for i, uv_layer in enumerate(obj.data.uv_layers):
             uv_layer.active = (uv_layer == uv_map)
 
-    # Get bake type mapping
-    bake_mapping = get_bake_type_mapping()
-
-    # Get selected bake types
-    selected_bakes = []
-    for attr_name, (bake_type, suffix) in bake_mapping.items():
-        if getattr(bake_settings, attr_name, False):
-            selected_bakes.append((bake_type, suffix))
+    # Get selected bake types (recipes decide their own passes)
+    plan = session.recipe_plan
+    if plan:
+        selected_bakes = get_recipe_bakes(plan)
+    else:
+        selected_bakes = get_selected_bakes(bake_settings)
 
     if not selected_bakes:
         return False, f"No bake types selected for {obj.name}"
+    batch_bakes = [bake for bake in selected_bakes if planner.pass_batch(bake[0]) in batches]
+
+    # Build (material, pass) jobs batched by the scene configuration they need
+    jobs = planner.order_bake_jobs([
+        (slot.material, bake_type, suffix)
+        for slot in obj.material_slots if slot.material
+        for bake_type, suffix in selected_bakes
+    ], batches)
+
+    # Select object once for all jobs
+    select_for_bake(context, session, obj)
 
-    # Process each material
-    for slot in obj.material_slots:
-        material = slot.material
-        if not material:
+    # Cached passes are named after the object a proxy stands in for
+    entry_name = proxy.proxy_source(obj).name
+
+    for material, bake_type, suffix in jobs:
+        # Create bake image with proper suffix and resolution
+        resolution = plan.bake_resolutions[bake_type] if plan else bake_width
+        image = create_bake_image(material.name, suffix, resolution=resolution)
+
+        # Set up material for baking
+        tex_node = setup_material_for_baking(material, image)
+        if not tex_node:
             continue
 
-        # Bake each selected type using clean dictionary approach
-        for bake_type, suffix in selected_bakes:
-            # Create bake image with proper suffix
-            image = create_bake_image(material.name, suffix)
+        # Set bake settings (only written when the batch changes)
+        apply_bake_configuration(scene, planner.pass_configuration(bake_type, bake_settings), session.applied_config)
+        apply_tuning(session, scene, bake_settings, bake_type, resolution, resolution)
+
+        parts = pass_parts(session, image, bake_type, [obj], uv_map.name)
 
-            # Set up material for baking
-            tex_node = setup_material_for_baking(material, image)
-            if not tex_node:
+        # Bake from material copies with shader inputs unrelated to this pass disconnected
+        pruned_swaps = None
+        if bake_settings.prune_shader_graphs:
+            pruned_swaps = pruning.use_pruned_materials(obj, bake_type)
+
+        try:
+            # Use clean dictionary-based bake operation (or the pass cache on replays)
+            bake_start = time.perf_counter()
+            bake_seconds, pixels = bake_pass(
+                session, image, bake_type, f"{entry_name}_{material.name}_{suffix}", parts
+            )
+            width, height = image.size
+
+            # Recipes keep the raw buffer and write their outputs once all passes are in
+            if plan:
+                session.recipe_buffers.setdefault((obj.name, material.name), {})[bake_type] = keep_recipe_buffer(
+                    session, obj, uv_map.name, image, pixels, output_settings
+                )
+                session.record_timing(bake_type, width * height, scene.cycles.samples, bake_seconds)
+                print(f"Baked {bake_type} for {obj.name} -> {material.name} ({resolution}x{resolution})")
                 continue
 
-            # Select object
-            bpy.ops.object.select_all(action='DESELECT')
+            # Derive, pad, resize and save
+            first_output = len(session.written)
+            output_pixels = save_pass(
+                session, obj, uv_map.name, image, pixels, material.name, suffix, bake_type,
+                bake_settings, output_settings
+            )
+            session.record_timing(
+                bake_type, width * height, scene.cycles.samples, bake_seconds,
+                time.perf_counter() - bake_start - (bake_seconds or 0.0),
+                session.written[first_output:], output_settings.file_format, output_pixels
+            )
+
+            print(f"Baked {bake_type} for {obj.name} -> {material.name} ({bake_width}x{bake_height})")
+
+        except Exception as e:
+            print(f"Failed to bake {bake_type} for {obj.name}: {str(e)}")
+            continue
+
+        finally:
+            pruning.restore_materials(pruned_swaps)
+
+    if plan and finish:
+        save_recipe_buffers(session, obj.name, output_settings)
+    session.wait_for_outputs()
+
+    return True, f"Successfully baked {len(batch_bakes)} types for {obj.name}"
+
+def perform_atlas_baking(context, name, objects, bake_settings, output_settings, session,
+                         batches=planner.PASS_BATCHES, finish=True):
+    """Bake every selected pass once for a group of objects sharing an atlas
+
+    objects already carry the atlas UV map (see atlas.build_atlas()). Every
+    material on them gets the same pass image, so a single Cycles call fills
+    the whole atlas; outputs are saved as {name}_{suffix}. batches and
+    finish work as in perform_multi_baking().
+    """
+    scene = context.scene
+    apply_bake_configuration(scene, {'render.bake.target': 'IMAGE_TEXTURES'}, session.applied_config)
+    scene.render.bake.margin = get_cycles_margin(output_settings)
+    scene.render.bake.margin_type = output_settings.margin_type
+    atlas.use_atlas_uv(objects)
+
+    plan = session.recipe_plan
+    if plan:
+        selected_bakes = get_recipe_bakes(plan)
+    else:
+        selected_bakes = get_selected_bakes(bake_settings)
+
+    if not selected_bakes:
+        return False, f"No bake types selected for {name}"
+
+    materials = list(dict.fromkeys(
+        slot.material for obj in objects for slot in obj.material_slots if slot.material
+    ))
+
+    # Select the whole group once; Cycles bakes each selected object into its materials' active image
+    if not session.selection_override:
+        bpy.ops.object.select_all(action='DESELECT')
+        for obj in objects:
             obj.select_set(True)
-            context.view_layer.objects.active = obj
+        context.view_layer.objects.active = objects[0]
+
+    # Passes batched by the scene configuration they need, like per-material jobs
+    passes = planner.order_bake_jobs([(None, bake_type, suffix) for bake_type, suffix in selected_bakes], batches)
+
+    baked = 0
+    for _, bake_type, suffix in passes:
+        resolution = plan.bake_resolutions[bake_type] if plan else output_settings.bake_width
+        image = create_bake_image(name, suffix, resolution=resolution)
+        for material in materials:
+            setup_material_for_baking(material, image)
+
+        apply_bake_configuration(scene, planner.pass_configuration(bake_type, bake_settings), session.applied_config)
+        apply_tuning(session, scene, bake_settings, bake_type, resolution, resolution)
+
+        parts = pass_parts(session, image, bake_type, objects, atlas.ATLAS_UV_NAME)
+
+        pruned_swaps = []
+        if bake_settings.prune_shader_graphs:
+            pruned_copies = {}
+            for obj in objects:
+                pruned_swaps.extend(pruning.use_pruned_materials(obj, bake_type, pruned_copies))
+
+        try:
+            bake_start = time.perf_counter()
+            bake_seconds, pixels = bake_pass(session, image, bake_type, f"{name}_{suffix}", parts)
+            width, height = image.size
+
+            if plan:
+                session.recipe_buffers.setdefault((name, name), {})[bake_type] = keep_recipe_buffer(
+                    session, objects, atlas.ATLAS_UV_NAME, image, pixels, output_settings
+                )
+                session.record_timing(bake_type, width * height, scene.cycles.samples, bake_seconds)
+                print(f"Baked {bake_type} for atlas {name} ({resolution}x{resolution})")
+                baked += 1
+                continue
+
+            first_output = len(session.written)
+            output_pixels = save_pass(
+                session, objects, atlas.ATLAS_UV_NAME, image, pixels, name, suffix, bake_type,
+                bake_settings, output_settings
+            )
+            session.record_timing(
+                bake_type, width * height, scene.cycles.samples, bake_seconds,
+                time.perf_counter() - bake_start - (bake_seconds or 0.0),
+                session.written[first_output:], output_settings.file_format, output_pixels
+            )
+
+            print(f"Baked {bake_type} for atlas {name} ({len(objects)} objects, {width}x{height})")
+            baked += 1
+
+        except Exception as e:
+            print(f"Failed to bake {bake_type} for atlas {name}: {str(e)}")
+            continue
+
+        finally:
+            pruning.restore_materials(pruned_swaps)
+
+    if plan and finish:
+        save_recipe_buffers(session, name, output_settings)
+    session.wait_for_outputs()
+
+    if passes and not baked:
+        return False, f"No passes baked for atlas {name}"
+    return True, f"Baked {baked} types into atlas {name}"
+
+# ============================================================================
+# BAKE RUNS
+# ============================================================================
+
+class BakeRun:
+    """One run of the Bake Objects operator
+
+    Holds what the run shares between objects: the resolved bake list, the
+    bake session, the evaluated proxy cache and the status recorder.
+    """
+    def __init__(self, operator):
+        self.operator = operator
+        self.objects_filter = operator.objects_filter
+        self.replay = operator.replay
+
+    def report(self, level, message):
+        """Report through the operator that started the run"""
+        self.operator.report(level, message)
+
+    def _filtered(self, objects):
+        """Restrict objects to objects_filter when it is set"""
+        if not self.objects_filter:
+            return objects
+        names = set(self.objects_filter.split("\n"))
+        return [obj for obj in objects if obj.name in names]
+
+    def execute(self, context):
+        scene = context.scene
+        bake_objects = scene.bakingbakes_objects
+        bake_settings = scene.bakingbakes_settings
+        output_settings = scene.bakingbakes_output
+
+        if not bake_objects.objects:
+            self.report({'WARNING'}, "No objects in bake list")
+            return {'CANCELLED'}
+
+        # Resolve bake sets once for the whole run
+        resolved = bake_list.resolve_items(scene, bake_objects)
+        self._objects = [obj for obj, item in resolved]
+        self._status = bake_list.StatusRecorder(resolved)
+        if not self._objects:
+            self.report({'WARNING'}, "Bake list resolves to no mesh objects")
+            return {'CANCELLED'}
+
+        self._session = BakeSession(context)
+
+        # Keep raw pass buffers, or bake from them without Cycles on replays
+        if bake_settings.cache_raw_passes or self.replay:
+            self._session.pass_cache = pass_cache.PassCache(self._session.output_dir)
+            self._session.replay = self.replay
+
+        # Drop nodes left by a preview bake so they are not baked into
+        preview.remove_preview_nodes(
+            slot.material for obj in self._objects for slot in obj.material_slots
+        )
+
+        # Color attributes are written per mesh, so only individual bakes can target them
+        if output_settings.bake_target == 'VERTEX_COLORS':
+            if bake_objects.bake_selected_to_targets:
+                self.report({'ERROR'}, "Color attribute targets are only supported when baking objects individually")
+                return {'CANCELLED'}
+            if bake_settings.use_recipes:
+                self.report({'ERROR'}, "Recipes write image files and cannot target color attributes")
+                return {'CANCELLED'}
 
-            # Set bake settings
-            scene.cycles.samples = 1
-            scene.render.bake.use_selected_to_active = False
+        # An atlas bakes whole groups of objects at once into shared images
+        if bake_settings.use_atlas:
+            if bake_objects.bake_selected_to_targets:
+                self.report({'ERROR'}, "Atlases are only supported when baking objects individually")
+                return {'CANCELLED'}
+            if output_settings.bake_target == 'VERTEX_COLORS':
+                self.report({'ERROR'}, "Atlases are images and cannot target color attributes")
+                return {'CANCELLED'}
+            if bake_settings.use_isolated_jobs:
+                self.report({'ERROR'}, "Atlases bake their whole group at once and cannot run in isolated processes")
+                return {'CANCELLED'}
 
+        # Compile recipes into one plan so passes shared between them bake once
+        if bake_settings.use_recipes:
+            if bake_objects.bake_selected_to_targets:
+                self.report({'ERROR'}, "Recipes are only supported when baking objects individually")
+                return {'CANCELLED'}
+            if not bake_settings.recipes:
+                self.report({'WARNING'}, "No recipes selected")
+                return {'CANCELLED'}
+            self._session.recipe_plan = recipes.compile_recipes(sorted(bake_settings.recipes))
+            print(f"Recipe plan: {self._session.recipe_plan.summary()}")
+
+        # Child processes do their own isolation, proxies and session (replays need no isolation)
+        if bake_settings.use_isolated_jobs and not self.replay:
+            if bake_objects.bake_selected_to_targets:
+                self.report({'ERROR'}, "Isolated processes are only supported when baking objects individually")
+                return {'CANCELLED'}
             try:
-                # Use clean dictionary-based bake operation
-                perform_bake_operation(bake_type)
+                return self._bake_isolated(bake_settings)
+            finally:
+                self._status.finish()
+
+        # Hide everything Cycles does not need to sync for this session
+        isolation_state = None
+        if bake_settings.isolate_bake_scene:
+            session_objects = list(self._objects)
+            if bake_objects.bake_selected_to_targets:
+                session_objects.extend(obj for obj in context.selected_objects if obj.type == 'MESH')
+                if bake_objects.use_cage and bake_objects.cage_object:
+                    session_objects.append(bake_objects.cage_object)
+
+            isolation_state = isolation.isolate_bake_scene(
+                context, session_objects, self._bake_types(bake_settings), bake_settings.occluder_radius
+            )
+
+        # Evaluate heavy modifier stacks once per session instead of once per pass
+        # (color attributes must land on the original mesh, so never on proxies)
+        use_proxies = bake_settings.use_evaluated_proxies and output_settings.bake_target == 'IMAGE_TEXTURES'
+        self._proxies = proxy.ProxyCache(context) if use_proxies else None
+
+        try:
+            # Check bake mode
+            if bake_objects.bake_selected_to_targets:
+                # SELECTED-TO-ACTIVE MODE: High-poly source to low-poly targets
+                return self._bake_selected_to_active(context, bake_objects, bake_settings, output_settings)
+            elif bake_settings.use_atlas:
+                # ATLAS MODE: Groups of objects into shared texture sets
+                return self._bake_atlases(context, bake_objects, bake_settings, output_settings)
+            else:
+                # NORMAL MODE: Bake each object individually
+                return self._bake_individual_objects(context, bake_objects, bake_settings, output_settings)
+        finally:
+            self._status.finish()
+            self._session.close()
+            if self._proxies:
+                self._proxies.clear()
+            isolation.restore_bake_scene(isolation_state)
+
+    def _bake_types(self, bake_settings):
+        """Get the set of bake types this run bakes"""
+        if self._session.recipe_plan:
+            return set(self._session.recipe_plan.bake_types)
+        return {bake_type for bake_type, suffix in get_selected_bakes(bake_settings)}
+
+    def _batches(self, bake_settings, output_settings):
+        """Get the configuration batches this run bakes, in bake order"""
+        bake_types = self._bake_types(bake_settings)
+        if output_settings.bake_target == 'VERTEX_COLORS':
+            bake_types |= set(get_vertex_pack_channels(output_settings).values())
+        batches = {planner.pass_batch(bake_type) for bake_type in bake_types}
+        return [batch for batch in planner.PASS_BATCHES if batch in batches]
+
+    def _bake_object(self, obj):
+        """Get the object to bake in place of obj (its evaluated proxy when enabled)"""
+        if self._proxies:
+            return self._proxies.get(obj)
+        return obj
+
+    def _bake_selected_to_active(self, context, bake_objects, bake_settings, output_settings):
+        """Bake from selected high-poly object to target low-poly objects"""
+        scene = context.scene
+
+        # Get currently selected object (this is the SOURCE/high-poly)
+        selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not selected_objects:
+            self.report({'ERROR'}, "No source object selected. Select high-poly object and try again.")
+            return {'CANCELLED'}
+
+        source_object = selected_objects[0]  # Use first selected object as source
+
+        # Check that we have target objects in the bake list
+        target_objects = self._filtered([obj for obj in self._objects if obj != source_object])
+        if not target_objects:
+            self.report({'ERROR'}, "No target objects in bake list. Add low-poly objects to bake list.")
+            return {'CANCELLED'}
+
+        # Set up baking settings
+        scene.render.bake.margin = get_cycles_margin(output_settings)
+        scene.render.bake.margin_type = output_settings.margin_type
+
+        # Get selected bake types
+        selected_bakes = get_selected_bakes(bake_settings)
+
+        if not selected_bakes:
+            self.report({'WARNING'}, "No bake types selected")
+            return {'CANCELLED'}
+
+        success_count = 0
+        total_bakes = 0
+        session = self._session
+        bake_source = self._bake_object(source_object)
+        apply_bake_configuration(scene, {'render.bake.target': 'IMAGE_TEXTURES'}, session.applied_config)
+
+        # Bake one configuration batch into every target before the next. Auto
+        # cages are built on a target's first batch and kept until the run ends
+        auto_cages = {}
+        target_maps = dict.fromkeys(target_objects, 0)
+        try:
+            for batch in self._batches(bake_settings, output_settings):
+                for target_obj in target_objects:
+                    # Build (material, pass) jobs batched by the scene configuration they need
+                    jobs = planner.order_bake_jobs([
+                        (slot.material, bake_type, suffix)
+                        for slot in target_obj.material_slots if slot.material
+                        for bake_type, suffix in selected_bakes
+                    ], (batch,))
+                    if not jobs:
+                        continue
+
+                    bake_target = self._bake_object(target_obj)
+                    target_uv = bake_target.data.uv_layers.active if bake_target.type == 'MESH' else None
+                    target_uv_name = target_uv.name if target_uv else None
+
+                    # Build a temporary cage for this target if requested
+                    if bake_objects.use_auto_cage and target_obj not in auto_cages:
+                        auto_cages[target_obj] = cage.create_auto_cage(context, bake_target, bake_source, bake_objects)
+                    auto_cage = auto_cages.get(target_obj)
+
+                    # Select SOURCE first, then TARGET, once for all of this target's jobs
+                    bpy.ops.object.select_all(action='DESELECT')
+                    bake_source.select_set(True)
+                    bake_target.select_set(True)
+                    context.view_layer.objects.active = bake_target  # Target becomes active
+
+                    # Ray and cage settings only change between targets
+                    scene.render.bake.cage_extrusion = bake_objects.extrusion
+                    scene.render.bake.max_ray_distance = bake_objects.max_ray_distance
+
+                    if auto_cage:
+                        scene.render.bake.use_cage = True
+                        scene.render.bake.cage_object = auto_cage
+                        scene.render.bake.cage_extrusion = 0.0
+                    elif bake_objects.use_cage and bake_objects.cage_object:
+                        scene.render.bake.use_cage = True
+                        scene.render.bake.cage_object = bake_objects.cage_object
+                    else:
+                        scene.render.bake.use_cage = False
+
+                    for material, bake_type, suffix in jobs:
+                        # Create bake image
+                        image = create_bake_image(material.name, suffix, resolution=output_settings.bake_width)
+
+                        # Set up material for baking
+                        tex_node = setup_material_for_baking(material, image)
+                        if not tex_node:
+                            continue
+
+                        # Set selected-to-active baking mode (only written when the batch changes)
+                        apply_bake_configuration(
+                            scene,
+                            planner.pass_configuration(bake_type, bake_settings, selected_to_active=True),
+                            session.applied_config
+                        )
+                        apply_tuning(
+                            session, scene, bake_settings, bake_type,
+                            output_settings.bake_width, output_settings.bake_height
+                        )
+
+                        parts = pass_parts(session, image, bake_type, [bake_target, bake_source], target_uv_name)
+
+                        # Shading comes from the source, so prune the source's materials
+                        pruned_swaps = None
+                        if bake_settings.prune_shader_graphs:
+                            pruned_swaps = pruning.use_pruned_materials(bake_source, bake_type)
+
+                        try:
+                            # Perform bake operation (or replay it from the pass cache)
+                            bake_start = time.perf_counter()
+                            bake_seconds, pixels = bake_pass(
+                                session, image, bake_type, f"{target_obj.name}_{material.name}_{suffix}", parts
+                            )
+                            width, height = image.size
+
+                            # Derive, pad, resize and save
+                            first_output = len(session.written)
+                            output_pixels = save_pass(
+                                session, bake_target, target_uv_name, image, pixels, material.name, suffix,
+                                bake_type, bake_settings, output_settings
+                            )
+                            session.record_timing(
+                                bake_type, width * height, scene.cycles.samples, bake_seconds,
+                                time.perf_counter() - bake_start - (bake_seconds or 0.0),
+                                session.written[first_output:], output_settings.file_format, output_pixels
+                            )
 
-                # Save image
-                image.pack()
-                image.filepath = f"//{material.name}_{suffix}.png"
-                image.save()
+                            print(f"Baked {bake_type} from {source_object.name} to {target_obj.name}")
+                            success_count += 1
+                            target_maps[target_obj] += 1
 
-                print(f"Baked {bake_type} for {obj.name} -> {material.name}")
+                        except Exception as e:
+                            print(f"Failed to bake {bake_type} from {source_object.name} to {target_obj.name}: {str(e)}")
+                            continue
 
-            except Exception as e:
-                print(f"Failed to bake {bake_type} for {obj.name}: {str(e)}")
+                        finally:
+                            pruning.restore_materials(pruned_swaps)
+        finally:
+            for auto_cage in auto_cages.values():
+                cage.remove_auto_cage(auto_cage)
+
+        for target_obj, baked_maps in target_maps.items():
+            self._status.record(target_obj, baked_maps > 0, f"{baked_maps} maps from {source_object.name}")
+
+        self.report({'INFO'}, f"Successfully baked from {source_object.name} to {len(target_objects)} targets ({success_count} total maps)")
+        return {'FINISHED'}
+
+    def _bake_atlases(self, context, bake_objects, bake_settings, output_settings):
+        """Pack each atlas group into one UV layout and bake it as one texture set"""
+        plan = self._session.recipe_plan
+        resolution = max(plan.bake_resolutions.values()) if plan else output_settings.bake_width
+        groups = atlas.atlas_groups(
+            context.scene, bake_objects, bake_settings.atlas_grouping, self._filtered(self._objects)
+        )
+
+        layouts = []
+        for label, objects in groups:
+            name = atlas.atlas_name(bake_settings.atlas_name, label)
+            try:
+                layout = atlas.build_atlas(
+                    name, objects, bake_settings.auto_uv_bake_map, resolution, output_settings.bake_margin
+                )
+            except ValueError as e:
+                print(f"Failed to build atlas {name}: {str(e)}")
+                for obj in objects:
+                    self._status.record(obj, False, str(e))
                 continue
 
-    return True, f"Successfully baked {len(selected_bakes)} types for {obj.name}"
+            print(f"Atlas {layout.summary()}")
+            layouts.append((name, objects, layout))
+
+        # One configuration batch across every atlas before the next, like individual bakes
+        batches = self._batches(bake_settings, output_settings)
+        # Atlas name -> (success, passes baked or the failure message)
+        results = {}
+        for batch in batches:
+            for name, objects, layout in layouts:
+                success, message = perform_atlas_baking(
+                    context, name, [self._bake_object(obj) for obj in layout.objects],
+                    bake_settings, output_settings, self._session, (batch,), batch == batches[-1]
+                )
+                succeeded, baked = results.get(name, (True, 0))
+                if not succeeded:
+                    continue
+                results[name] = (True, baked + int(message.split()[1])) if success else (False, message)
+
+        baked_atlases = 0
+        for name, objects, layout in layouts:
+            success, message = results.get(name, (False, "No bake types selected"))
+            if success:
+                message = f"Baked {message} types into atlas {name}"
+            for obj in objects:
+                self._status.record(obj, success, message)
+            baked_atlases += success
+
+        if not baked_atlases:
+            self.report({'ERROR'}, "No atlases were baked successfully")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Successfully baked {baked_atlases} of {len(groups)} atlases")
+        return {'FINISHED'}
+
+    def _bake_isolated(self, bake_settings):
+        """Bake the list in batches of child Blender processes under the watchdog
+
+        Children bake a saved copy of the file next to it, so relative output
+        paths land where an in-process bake would write them. Outputs are
+        files only; the open file's materials are not touched.
+        """
+        if not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the file before baking in isolated processes")
+            return {'CANCELLED'}
+
+        objects = self._filtered(self._objects)
+        directory, filename = os.path.split(bpy.data.filepath)
+        copy_path = os.path.join(directory, f".{os.path.splitext(filename)[0]}_isolated.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=copy_path, copy=True)
+
+        policy = watchdog.WatchdogPolicy(
+            timeout=bake_settings.isolated_timeout,
+            max_rss_mb=bake_settings.isolated_memory_limit,
+            retries=bake_settings.isolated_retries,
+            backoff=bake_settings.isolated_backoff
+        )
+        addon = __package__.split(".")[0]
+        size = bake_settings.isolated_batch_size
+        by_name = {obj.name: obj for obj in objects}
+        entries = []
+
+        try:
+            for start in range(0, len(objects), size):
+                job = {"file": copy_path, "objects": [obj.name for obj in objects[start:start + size]]}
+                for names, result in watchdog.run_job(job, bpy.app.binary_path, addon, policy):
+                    object_results = result.get("objects", {})
+                    # Split batches are reported for their attempts; their objects' retries follow
+                    if result["status"] == "split":
+                        entries.append(dict(result, objects=names, results=object_results))
+                        continue
+                    for name in names:
+                        success, message = object_results.get(name, (False, result.get("error") or "Not baked"))
+                        self._status.record(by_name[name], success, message)
+                    entries.append(dict(result, objects=names, results=object_results))
+        finally:
+            os.remove(copy_path)
+
+        report_path = watchdog.write_report(directory, entries)
+        failed = sum(1 for entry in entries if entry["status"] != "split" for name in entry["objects"]
+                     if not entry["results"].get(name, (False,))[0])
+        if failed:
+            self.report({'WARNING'}, f"{len(objects) - failed} objects baked, {failed} failed (see {os.path.basename(report_path)})")
+            return {'FINISHED'} if failed < len(objects) else {'CANCELLED'}
+
+        self.report({'INFO'}, f"Successfully baked {len(objects)} objects in isolated processes")
+        return {'FINISHED'}
+
+    def _bake_individual_objects(self, context, bake_objects, bake_settings, output_settings):
+        """Bake each object individually (original mode)"""
+        success_count = 0
+        failed_objects = []
+        total_bakes = 0
+
+        # Check UV maps if required
+        if bake_settings.auto_uv_bake_map and output_settings.bake_target == 'IMAGE_TEXTURES':
+            uv_check_passed, missing_uv_objects = check_uv_maps_for_objects(self._objects, require_bake_uv=True)
+            if not uv_check_passed:
+                missing_list = ", ".join(missing_uv_objects)
+                self.report({'ERROR'}, f"Bake UV map not found in objects: {missing_list}")
+                return {'CANCELLED'}
+
+        # Group linked duplicates so each shared mesh is only baked once
+        objects = self._filtered(self._objects)
+        if bake_settings.share_linked_duplicates:
+            bake_groups = planner.group_linked_duplicates(
+                objects, bake_settings.auto_uv_bake_map, self._bake_types(bake_settings)
+            )
+        else:
+            bake_groups = [(obj, []) for obj in objects]
+
+        batches = self._batches(bake_settings, output_settings)
+        if not batches:
+            self.report({'WARNING'}, "No bake types selected")
+            return {'CANCELLED'}
+
+        # Bake one configuration batch across every object before the next, so
+        # samples and bake mode switch once per run instead of once per object
+        results = {}
+        for batch in batches:
+            for obj, duplicates in bake_groups:
+                if obj in results and not results[obj][0]:
+                    continue
+                success, message = perform_multi_baking(
+                    context, self._bake_object(obj), bake_settings, output_settings, self._session,
+                    (batch,), batch == batches[-1]
+                )
+                baked_count = results[obj][1] if obj in results else 0
+                if success:
+                    try:
+                        baked_count += int(message.split()[2])
+                    except (IndexError, ValueError):
+                        baked_count += 1
+                results[obj] = (success, baked_count, message)
+
+        shared_count = 0
+
+        for obj, duplicates in bake_groups:
+            success, baked_count, message = results[obj]
+            if success:
+                message = f"Successfully baked {baked_count} types for {obj.name}"
+            self._status.record(obj, success, message)
+            for dup in duplicates:
+                self._status.record(dup, success, f"Shared with {obj.name}" if success else message)
+
+            if success:
+                success_count += 1
+                total_bakes += baked_count
+
+                # Duplicates reuse the representative's images without another bake
+                if duplicates:
+                    success_count += len(duplicates)
+                    shared_count += len(duplicates)
+                    print(f"Reused {obj.name} bake for: {', '.join(dup.name for dup in duplicates)}")
+            else:
+                failed_objects.append(f"{obj.name}: {message}")
+                failed_objects.extend(f"{dup.name}: {message}" for dup in duplicates)
+
+        if success_count > 0:
+            if shared_count:
+                self.report({'INFO'}, f"Successfully baked {success_count} objects ({total_bakes} total maps, {shared_count} shared)")
+            else:
+                self.report({'INFO'}, f"Successfully baked {success_count} objects ({total_bakes} total maps)")
+            if failed_objects:
+                print("Failed objects:", failed_objects)
+        else:
+            self.report({'ERROR'}, "No objects were baked successfully")
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
@@ -0,0 +1,361 @@
+"""
+Block-compressed texture export for BakingBakes addon
+
+Encodes bake buffers straight into GPU formats, written as DDS or KTX2:
+    BC1  RGB color, 4 bpp
+    BC4  one channel, 4 bpp
+    BC5  two channels (normal X/Y), 8 bpp
+    BC7  RGBA color, 8 bpp (mode 6 only)
+
+Every block of the image is encoded at once with NumPy: endpoints come from
+the principal axis of each block's colors, and each texel's index from its
+projection onto the endpoint segment. This is not a best-quality offline encoder, but it keeps up
+with the bake rate and needs no external tool.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from . import imaging
+
+# Codec chosen per pass: normals keep X/Y, scalar maps keep one channel
+NORMAL_BAKE_TYPES = {'NORMAL', 'NormalFromBump'}
+SCALAR_BAKE_TYPES = {
+    'ROUGHNESS', 'METALNESS', 'SPECULAR', 'ALPHA', 'AO', 'SHADOW', 'BUMP',
+    'EMISSION_STRENGTH', 'CLEARCOAT', 'CLEARCOAT_ROUGHNESS', 'TRANSMISSION_ROUGHNESS',
+    'Curvature', 'Cavity',
+}
+# Passes holding colors rather than data, stored with an sRGB format
+COLOR_BAKE_TYPES = {'DIFFUSE', 'EMIT', 'SUBSURFACE_COLOR', 'GLOSSY', 'TRANSMISSION', 'ENVIRONMENT'}
+
+BLOCK_BYTES = {'BC1': 8, 'BC4': 8, 'BC5': 16, 'BC7': 16}
+
+FILE_EXTENSIONS = {'DDS': 'dds', 'KTX2': 'ktx2'}
+
+def codec_for_pass(bake_type, color_codec='BC7'):
+    """Pick the block codec for a bake type (or derived map suffix)"""
+    if bake_type in NORMAL_BAKE_TYPES:
+        return 'BC5'
+    if bake_type in SCALAR_BAKE_TYPES:
+        return 'BC4'
+    return color_codec
+
+# ----------------------------------------------------------------------------
+# Blocks
+# ----------------------------------------------------------------------------
+
+def to_blocks(pixels):
+    """Split a top-down (h, w, c) buffer into (blocks_y * blocks_x, 16, c), edge-padding to 4"""
+    height, width, channels = pixels.shape
+    pad_y = -height % 4
+    pad_x = -width % 4
+    if pad_y or pad_x:
+        pixels = np.pad(pixels, ((0, pad_y), (0, pad_x), (0, 0)), mode='edge')
+    blocks_y, blocks_x = pixels.shape[0] // 4, pixels.shape[1] // 4
+    blocks = pixels.reshape(blocks_y, 4, blocks_x, 4, channels).transpose(0, 2, 1, 3, 4)
+    return blocks.reshape(blocks_y * blocks_x, 16, channels)
+
+def principal_endpoints(blocks, iterations=4):
+    """Get the two ends of each block's colors along its principal axis
+
+    The axis comes from a few power iterations on each block's covariance,
+    all blocks at once. Returns (N, c) low and high endpoints in the input range.
+    """
+    mean = blocks.mean(axis=1, keepdims=True)
+    centered = blocks - mean
+    covariance = np.einsum('npi,npj->nij', centered, centered)
+
+    axis = centered.max(axis=1) - centered.min(axis=1) + 1e-6
+    for _ in range(iterations):
+        axis = np.einsum('nij,nj->ni', covariance, axis)
+        axis /= np.linalg.norm(axis, axis=1, keepdims=True) + 1e-12
+
+    projection = np.einsum('npc,nc->np', centered, axis)
+    low = mean[:, 0] + axis * projection.min(axis=1, keepdims=True)
+    high = mean[:, 0] + axis * projection.max(axis=1, keepdims=True)
+    return low, high
+
+def line_indices(blocks, e0, e1, weights):
+    """Pick each texel's palette index by projecting it onto the e0 -> e1 segment
+
+    weights[i] is how far along the segment palette entry i lies (0..1).
+    """
+    direction = e1 - e0
+    length = (direction ** 2).sum(axis=1, keepdims=True)
+    t = np.einsum('npc,nc->np', blocks - e0[:, np.newaxis], direction) / np.maximum(length, 1e-12)
+    return np.abs(t[:, :, np.newaxis] - weights).argmin(axis=2)
+
+def pack_index_bits(indices, bits):
+    """Pack (N, 16) indices of the given bit width into (N,) uint64, texel 0 lowest"""
+    packed = np.zeros(len(indices), dtype=np.uint64)
+    for texel in range(indices.shape[1]):
+        packed |= indices[:, texel].astype(np.uint64) << np.uint64(texel * bits)
+    return packed
+
+# ----------------------------------------------------------------------------
+# Encoders (input: (N, 16, c) blocks in 0..255, output: (N, block bytes) uint8)
+# ----------------------------------------------------------------------------
+
+def _rgb565(colors):
+    """Quantize (N, 3) 0..255 colors to packed 565 and back to 0..255"""
+    r = np.clip(np.rint(colors[:, 0] * 31 / 255), 0, 31).astype(np.uint16)
+    g = np.clip(np.rint(colors[:, 1] * 63 / 255), 0, 63).astype(np.uint16)
+    b = np.clip(np.rint(colors[:, 2] * 31 / 255), 0, 31).astype(np.uint16)
+    packed = (r << 11) | (g << 5) | b
+    # Decoders expand by bit replication
+    expanded = np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=1)
+    return packed, expanded.astype(np.float32)
+
+BC1_WEIGHTS = np.array([0, 1, 1 / 3, 2 / 3], dtype=np.float32)
+
+def encode_bc1(blocks):
+    """Encode (N, 16, 3) 0..255 blocks into BC1 (always the four color mode)"""
+    low, high = principal_endpoints(blocks)
+    c0, e0 = _rgb565(np.clip(high, 0, 255))
+    c1, e1 = _rgb565(np.clip(low, 0, 255))
+
+    # Four color mode needs c0 > c1
+    swap = c0 < c1
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+    e0, e1 = np.where(swap[:, np.newaxis], e1, e0), np.where(swap[:, np.newaxis], e0, e1)
+
+    indices = line_indices(blocks, e0, e1, BC1_WEIGHTS)
+    indices[c0 == c1] = 0
+
+    out = np.zeros((len(blocks), 8), dtype=np.uint8)
+    out[:, 0:2] = c0.astype('<u2')[:, np.newaxis].view(np.uint8)
+    out[:, 2:4] = c1.astype('<u2')[:, np.newaxis].view(np.uint8)
+    out[:, 4:8] = pack_index_bits(indices, 2).astype('<u4')[:, np.newaxis].view(np.uint8)
+    return out
+
+BC4_WEIGHTS = np.array([0, 7, 1, 2, 3, 4, 5, 6], dtype=np.float32) / 7
+
+def _bc4_blocks(values):
+    """Encode (N, 16) 0..255 values into (N, 8) BC4 blocks (eight value mode)"""
+    r0 = np.clip(np.rint(values.max(axis=1)), 0, 255)
+    r1 = np.clip(np.rint(values.min(axis=1)), 0, 255)
+
+    indices = line_indices(values[:, :, np.newaxis], r0[:, np.newaxis], r1[:, np.newaxis], BC4_WEIGHTS)
+    indices[r0 == r1] = 0
+
+    out = np.zeros((len(values), 8), dtype=np.uint8)
+    out[:, 0] = r0
+    out[:, 1] = r1
+    out[:, 2:8] = pack_index_bits(indices, 3).astype('<u8')[:, np.newaxis].view(np.uint8)[:, :6]
+    return out
+
+def encode_bc4(blocks):
+    """Encode the first channel of (N, 16, c) 0..255 blocks into BC4"""
+    return _bc4_blocks(blocks[:, :, 0])
+
+def encode_bc5(blocks):
+    """Encode the first two channels into BC5 (a BC4 block for each)"""
+    return np.concatenate([_bc4_blocks(blocks[:, :, 0]), _bc4_blocks(blocks[:, :, 1])], axis=1)
+
+BC7_WEIGHTS = np.array([0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64], dtype=np.float32) / 64
+
+def _bc7_quantize(endpoints):
+    """Quantize (N, 4) 0..255 endpoints to 7 bits plus a shared p-bit, picking the closer p-bit"""
+    best_q, best_p, best_error = None, None, None
+    for p in (0, 1):
+        q = np.clip(np.rint((endpoints - p) / 2), 0, 127)
+        error = ((q * 2 + p - endpoints) ** 2).sum(axis=1)
+        if best_error is None:
+            best_q, best_p, best_error = q, np.zeros(len(endpoints)), error
+        else:
+            better = error < best_error
+            best_q = np.where(better[:, np.newaxis], q, best_q)
+            best_p = np.where(better, 1, best_p)
+            best_error = np.minimum(error, best_error)
+    return best_q.astype(np.uint64), best_p.astype(np.uint64)
+
+def encode_bc7(blocks):
+    """Encode (N, 16, 4) 0..255 blocks into BC7 mode 6 (one subset, 7.7.7.7 endpoints with p-bits, 4-bit indices)"""
+    low, high = principal_endpoints(blocks)
+    q0, p0 = _bc7_quantize(np.clip(low, 0, 255))
+    q1, p1 = _bc7_quantize(np.clip(high, 0, 255))
+
+    e0 = (q0 * 2 + p0[:, np.newaxis]).astype(np.float32)
+    e1 = (q1 * 2 + p1[:, np.newaxis]).astype(np.float32)
+    indices = line_indices(blocks, e0, e1, BC7_WEIGHTS)
+
+    # The anchor (texel 0) index is stored without its top bit, so it must be below 8
+    flip = indices[:, 0] >= 8
+    q0, q1 = np.where(flip[:, np.newaxis], q1, q0), np.where(flip[:, np.newaxis], q0, q1)
+    p0, p1 = np.where(flip, p1, p0), np.where(flip, p0, p1)
+    indices = np.where(flip[:, np.newaxis], 15 - indices, indices)
+
+    lo = np.zeros(len(blocks), dtype=np.uint64)
+    hi = np.zeros(len(blocks), dtype=np.uint64)
+    position = 0
+
+    def put(values, bits):
+        nonlocal lo, hi, position
+        values = values.astype(np.uint64)
+        if position < 64:
+            lo |= (values << np.uint64(position)) & np.uint64(0xFFFFFFFFFFFFFFFF)
+            if position + bits > 64:
+                hi |= values >> np.uint64(64 - position)
+        else:
+            hi |= values << np.uint64(position - 64)
+        position += bits
+
+    put(np.full(len(blocks), 1 << 6), 7)
+    for channel in range(4):
+        put(q0[:, channel], 7)
+        put(q1[:, channel], 7)
+    put(p0, 1)
+    put(p1, 1)
+    put(indices[:, 0], 3)
+    for texel in range(1, 16):
+        put(indices[:, texel], 4)
+
+    return np.stack([lo.astype('<u8'), hi.astype('<u8')], axis=1).view(np.uint8)
+
+# Encoder and the channels it reads
+ENCODERS = {
+    'BC1': (encode_bc1, 3),
+    'BC4': (encode_bc4, 1),
+    'BC5': (encode_bc5, 2),
+    'BC7': (encode_bc7, 4),
+}
+
+# Blocks encoded per NumPy pass, bounding temporary memory at large sizes
+CHUNK_BLOCKS = 65536
+
+def encode_level(pixels, codec):
+    """Encode one top-down (h, w, 4) 0..1 level into raw block bytes"""
+    encoder, channels = ENCODERS[codec]
+    blocks = to_blocks(pixels[:, :, :channels] * np.float32(255))
+    return b''.join(
+        encoder(blocks[start:start + CHUNK_BLOCKS]).tobytes()
+        for start in range(0, len(blocks), CHUNK_BLOCKS)
+    )
+
+def mip_chain(pixels, generate_mips):
+    """Get [level 0, level 1, ...] buffers halving down to 1x1"""
+    levels = [pixels]
+    while generate_mips and max(levels[-1].shape[:2]) > 1:
+        height, width = levels[-1].shape[:2]
+        levels.append(imaging.resample(levels[-1], max(1, width // 2), max(1, height // 2)))
+    return levels
+
+def encode_levels(pixels, codec, generate_mips=False):
+    """Encode a bottom-up Blender buffer into compressed mip levels (top-down rows)"""
+    rgba = imaging.to_rgba(pixels) if pixels.shape[2] < 4 else pixels
+    top_down = np.ascontiguousarray(np.clip(rgba[::-1], 0.0, 1.0), dtype=np.float32)
+    return [encode_level(level, codec) for level in mip_chain(top_down, generate_mips)]
+
+# ----------------------------------------------------------------------------
+# Containers
+# ----------------------------------------------------------------------------
+
+DXGI_FORMATS = {
+    ('BC1', False): 71, ('BC1', True): 72,
+    ('BC4', False): 80,
+    ('BC5', False): 83,
+    ('BC7', False): 98, ('BC7', True): 99,
+}
+
+def write_dds(path, levels, width, height, codec, srgb=False):
+    """Write encoded levels as a DDS file (DX10 header except for plain BC1)"""
+    srgb = srgb and (codec, True) in DXGI_FORMATS
+    use_dx10 = codec != 'BC1' or srgb
+
+    flags = 0x1 | 0x2 | 0x4 | 0x1000 | 0x80000  # CAPS, HEIGHT, WIDTH, PIXELFORMAT, LINEARSIZE
+    caps = 0x1000  # TEXTURE
+    if len(levels) > 1:
+        flags |= 0x20000  # MIPMAPCOUNT
+        caps |= 0x8 | 0x400000  # COMPLEX, MIPMAP
+
+    pixel_format = struct.pack('<II4sIIIII', 32, 0x4, b'DX10' if use_dx10 else b'DXT1', 0, 0, 0, 0, 0)
+    header = struct.pack('<7I', 124, flags, height, width, len(levels[0]), 0, len(levels))
+    header += b'\0' * 44 + pixel_format + struct.pack('<5I', caps, 0, 0, 0, 0)
+
+    with open(path, 'wb') as handle:
+        handle.write(b'DDS ' + header)
+        if use_dx10:
+            handle.write(struct.pack('<5I', DXGI_FORMATS[(codec, srgb)], 3, 0, 1, 0))
+        for level in levels:
+            handle.write(level)
+
+# Vulkan formats and Khronos data format descriptor models for KTX2
+VK_FORMATS = {
+    ('BC1', False): 131, ('BC1', True): 132,
+    ('BC4', False): 139,
+    ('BC5', False): 141,
+    ('BC7', False): 145, ('BC7', True): 146,
+}
+DFD_COLOR_MODELS = {'BC1': 128, 'BC4': 131, 'BC5': 132, 'BC7': 134}
+KTX2_IDENTIFIER = b'\xabKTX 20\xbb\r\n\x1a\n'
+
+def _ktx2_dfd(codec, srgb):
+    """Build the basic data format descriptor for a block-compressed format"""
+    block_bytes = BLOCK_BYTES[codec]
+    # One sample per stored channel block: BC5 holds red then green
+    samples = [(0, 0), (64, 1)] if codec == 'BC5' else [(0, 0)]
+    sample_bits = 64 if codec != 'BC7' else 128
+
+    block = struct.pack(
+        '<IIBBBBBBBBII',
+        0,  # vendor 0 (Khronos), descriptor type 0 (basic)
+        2 | ((24 + 16 * len(samples)) << 16),  # version 2, block size
+        DFD_COLOR_MODELS[codec], 1, 2 if srgb else 1, 0,  # model, BT.709 primaries, transfer, flags
+        3, 3, 0, 0,  # 4x4x1x1 texel block
+        block_bytes, 0,
+    )
+    for offset, channel in samples:
+        block += struct.pack('<IIII', offset | ((sample_bits - 1) << 16) | (channel << 24), 0, 0, 0xFFFFFFFF)
+    return struct.pack('<I', 4 + len(block)) + block
+
+def write_ktx2(path, levels, width, height, codec, srgb=False):
+    """Write encoded levels as a KTX2 file (no supercompression)"""
+    srgb = srgb and (codec, True) in VK_FORMATS
+    dfd = _ktx2_dfd(codec, srgb)
+    alignment = BLOCK_BYTES[codec]
+
+    header_size = 80 + 24 * len(levels)
+    dfd_offset = header_size
+    offset = dfd_offset + len(dfd)
+
+    # Level data goes smallest mip first, each aligned to the block size
+    level_offsets = [0] * len(levels)
+    for index in reversed(range(len(levels))):
+        offset += -offset % alignment
+        level_offsets[index] = offset
+        offset += len(levels[index])
+
+    header = KTX2_IDENTIFIER + struct.pack(
+        '<9I', VK_FORMATS[(codec, srgb)], 1, width, height, 0, 0, 1, len(levels), 0
+    )
+    header += struct.pack('<4I2Q', dfd_offset, len(dfd), 0, 0, 0, 0)
+    for level_offset, level in zip(level_offsets, levels):
+        header += struct.pack('<3Q', level_offset, len(level), len(level))
+
+    with open(path, 'wb') as handle:
+        handle.write(header + dfd)
+        position = handle.tell()
+        for index in reversed(range(len(levels))):
+            handle.write(b'\0' * (level_offsets[index] - position))
+            handle.write(levels[index])
+            position = level_offsets[index] + len(levels[index])
+
+WRITERS = {
+    'DDS': write_dds,
+    'KTX2': write_ktx2,
+}
+
+def write_compressed(path, pixels, container, codec, generate_mips=False, srgb=False):
+    """Encode a bottom-up (h, w, c) buffer and write it as a DDS or KTX2 file
+
+    The file is written beside path and moved over it, so an existing output
+    that is a link into the output store is replaced rather than written through.
+    """
+    height, width = pixels.shape[:2]
+    levels = encode_levels(pixels, codec, generate_mips)
+    temp_path = path + ".tmp"
+    WRITERS[container](temp_path, levels, width, height, codec, srgb)
+    os.replace(temp_path, path)
+    return sum(len(level) for level in levels)
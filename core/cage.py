@@ -0,0 +1,198 @@
+"""
+Automatic cage generation for selected-to-active baking
+"""
+
+import bpy
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+CAGE_SUFFIX = "_BB_AutoCage"
+
+# How far past the extrusion distance SOURCE fitting looks for the source surface.
+# Sources rarely sit more than a few extrusions out; looking much further lets the
+# nearest-point fallback snap to unrelated parts of the source
+SOURCE_SEARCH_EXTRUSIONS = 4.0
+# Floor on that search distance as a fraction of the target's bounding box
+# diagonal, for zero or tiny extrusions. One percent of the object's size still
+# reaches details sculpted proud of the surface without crossing thin parts
+MIN_SOURCE_SEARCH_FRACTION = 0.01
+
+CAGE_HIDDEN_RAY_TYPES = (
+    'visible_camera',
+    'visible_diffuse',
+    'visible_glossy',
+    'visible_transmission',
+    'visible_volume_scatter',
+    'visible_shadow',
+)
+
+def read_vertex_positions(mesh):
+    """Read all vertex positions of a mesh into an (N, 3) array"""
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+def smoothed_vertex_normals(mesh, weld_distance=1e-5):
+    """Get per-vertex normals averaged across split (coincident) vertices
+
+    Blender vertex normals are already smooth within connected geometry, but
+    edge-split or disconnected shells would tear the cage apart at hard edges.
+    Vertices sharing a position are welded so they extrude in the same direction.
+    """
+    count = len(mesh.vertices)
+    normals = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", normals)
+    normals = normals.reshape(-1, 3)
+
+    coords = read_vertex_positions(mesh)
+    keys = np.round(coords / max(weld_distance, 1e-9)).astype(np.int64)
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    welded = np.zeros((inverse.max() + 1 if count else 0, 3), dtype=np.float32)
+    np.add.at(welded, inverse, normals)
+    normals = welded[inverse]
+
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(lengths, 1e-8)
+
+def vertex_group_weights(obj, mesh, group_name):
+    """Get per-vertex weights of one of obj's vertex groups on mesh (0.0 where unassigned)
+
+    mesh is the evaluated copy the cage is built from, so the weights line up
+    with its vertices even when modifiers change the topology. Deform weights
+    have no foreach_get accessor, so the group's entries are gathered in one
+    pass and scattered into the array with NumPy. Returns None when obj has
+    no such group or no vertex of mesh carries it.
+    """
+    group = obj.vertex_groups.get(group_name)
+    if not group:
+        return None
+
+    group_index = group.index
+    entries = [
+        (vertex.index, element.weight)
+        for vertex in mesh.vertices
+        for element in vertex.groups
+        if element.group == group_index
+    ]
+    if not entries:
+        return None
+
+    indices, values = np.array(entries, dtype=np.float64).T
+    weights = np.zeros(len(mesh.vertices), dtype=np.float32)
+    weights[indices.astype(np.int64)] = values
+    return weights
+
+def source_distances(target_obj, coords, normals, source_obj, depsgraph, max_distance):
+    """Get per-vertex distance from the target surface out to the source surface
+
+    Rays are cast outwards along the cage normal; vertices that miss fall back
+    to the nearest point on the source so concave regions still get covered.
+    mathutils has no batched ray cast, so the casts stay a loop over one BVH
+    built up front; coincident vertices share a normal after welding and are
+    cast once, and positions go in as plain tuples to skip NumPy scalar
+    conversion per call.
+    """
+    source_eval = source_obj.evaluated_get(depsgraph)
+    tree = BVHTree.FromObject(source_eval, depsgraph)
+
+    # Work in source local space so the BVH does not need transforming
+    to_source = source_obj.matrix_world.inverted() @ target_obj.matrix_world
+    rotation = np.array(to_source.to_3x3(), dtype=np.float32)
+    local_coords = coords @ rotation.T + np.array(to_source.translation, dtype=np.float32)
+    local_normals = normals @ rotation.T
+    lengths = np.linalg.norm(local_normals, axis=1, keepdims=True)
+    local_normals /= np.maximum(lengths, 1e-8)
+
+    # Distances are measured in source space; convert back to target space
+    scale = float(np.linalg.norm(rotation, axis=0).mean())
+    scale = scale if scale > 0.0 else 1.0
+    search = max_distance * scale
+
+    rays, inverse = np.unique(np.hstack((local_coords, local_normals)), axis=0, return_inverse=True)
+    ray_cast = tree.ray_cast
+    find_nearest = tree.find_nearest
+
+    unique_distances = np.zeros(len(rays), dtype=np.float32)
+    for i, (x, y, z, nx, ny, nz) in enumerate(rays.tolist()):
+        hit, _, _, distance = ray_cast((x, y, z), (nx, ny, nz), search)
+        if hit is None:
+            nearest, _, _, distance = find_nearest((x, y, z), search)
+            if nearest is None:
+                continue
+        unique_distances[i] = distance / scale
+
+    return unique_distances[inverse.reshape(-1)]
+
+def compute_cage_offsets(target_obj, source_obj, bake_objects, depsgraph, mesh):
+    """Compute per-vertex extrusion distances for the cage"""
+    count = len(mesh.vertices)
+    extrusion = bake_objects.extrusion
+    mode = bake_objects.auto_cage_distance_mode
+
+    if mode == 'VERTEX_GROUP':
+        weights = vertex_group_weights(target_obj, mesh, bake_objects.auto_cage_vertex_group)
+        if weights is not None:
+            return weights * extrusion
+        print(f"Vertex group '{bake_objects.auto_cage_vertex_group}' not usable on {target_obj.name}, using uniform extrusion")
+
+    elif mode == 'SOURCE' and source_obj:
+        coords = read_vertex_positions(mesh)
+        normals = smoothed_vertex_normals(mesh)
+        size = float(np.linalg.norm(np.ptp(coords, axis=0))) if len(coords) else 0.0
+        search_distance = max(extrusion * SOURCE_SEARCH_EXTRUSIONS, size * MIN_SOURCE_SEARCH_FRACTION)
+        distances = source_distances(target_obj, coords, normals, source_obj, depsgraph, search_distance)
+        distances *= 1.0 + bake_objects.auto_cage_margin
+        return np.maximum(distances, extrusion * bake_objects.auto_cage_margin)
+
+    return np.full(count, extrusion, dtype=np.float32)
+
+def create_auto_cage(context, target_obj, source_obj, bake_objects):
+    """Build a temporary cage object for target_obj by extruding along smoothed normals
+
+    The cage is built from the evaluated target mesh so its topology matches what
+    Cycles bakes. Call remove_auto_cage() when the bake is finished.
+    """
+    if target_obj.type != 'MESH':
+        return None
+
+    depsgraph = context.evaluated_depsgraph_get()
+    target_eval = target_obj.evaluated_get(depsgraph)
+    mesh = bpy.data.meshes.new_from_object(target_eval, preserve_all_data_layers=True, depsgraph=depsgraph)
+    mesh.name = f"{target_obj.name}{CAGE_SUFFIX}"
+
+    if not mesh.vertices:
+        bpy.data.meshes.remove(mesh)
+        return None
+
+    coords = read_vertex_positions(mesh)
+    normals = smoothed_vertex_normals(mesh)
+    offsets = compute_cage_offsets(target_obj, source_obj, bake_objects, depsgraph, mesh)
+
+    coords += normals * offsets[:, np.newaxis]
+    mesh.vertices.foreach_set("co", coords.ravel())
+    mesh.update()
+
+    cage = bpy.data.objects.new(mesh.name, mesh)
+    cage.matrix_world = target_obj.matrix_world.copy()
+    cage.display_type = 'WIRE'
+
+    # Cycles must still find the cage in the render depsgraph, so keep it
+    # renderable but invisible to every ray type instead of hiding it
+    for ray_type in CAGE_HIDDEN_RAY_TYPES:
+        setattr(cage, ray_type, False)
+
+    context.scene.collection.objects.link(cage)
+
+    return cage
+
+def remove_auto_cage(cage):
+    """Free a cage created by create_auto_cage()"""
+    if not cage:
+        return
+
+    mesh = cage.data
+    bpy.data.objects.remove(cage, do_unlink=True)
+    if mesh and mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
@@ -0,0 +1,120 @@
+"""
+Derived map generators for BakingBakes addon
+
+Curvature, cavity and normal-from-bump maps are computed from already baked
+buffers instead of extra Cycles bakes. Every filter is masked by UV coverage,
+so texels outside the islands never bleed across seams.
+"""
+
+import numpy as np
+
+# Derived maps each bake type can feed: bake type -> [(settings attribute, suffix)]
+DERIVED_MAPS = {
+    'NORMAL': [('derive_curvature', 'Curvature'), ('derive_cavity', 'Cavity')],
+    'BUMP': [('derive_normal_from_bump', 'NormalFromBump')],
+}
+
+def decode_normals(pixels, directx=False):
+    """Decode tangent-space normal map pixels into (h, w, 3) vectors in [-1, 1]"""
+    normals = pixels[:, :, :3] * 2.0 - 1.0
+    if directx:
+        normals[:, :, 1] *= -1.0
+    return normals
+
+def encode_normals(normals, directx=False):
+    """Encode (h, w, 3) unit vectors as normal map colors"""
+    normals = normals.copy()
+    if directx:
+        normals[:, :, 1] *= -1.0
+    return normals * 0.5 + 0.5
+
+def _masked_neighbors(values, mask, axis):
+    """Get backward/forward neighbors along axis, falling back to the center outside the mask"""
+    previous = np.roll(values, 1, axis=axis)
+    following = np.roll(values, -1, axis=axis)
+    previous_mask = np.roll(mask, 1, axis=axis)
+    following_mask = np.roll(mask, -1, axis=axis)
+
+    # Image borders do not wrap
+    edge = [slice(None)] * mask.ndim
+    edge[axis] = 0
+    previous_mask[tuple(edge)] = False
+    edge[axis] = -1
+    following_mask[tuple(edge)] = False
+
+    expand = (Ellipsis,) + (np.newaxis,) * (values.ndim - mask.ndim)
+    previous = np.where(previous_mask[expand], previous, values)
+    following = np.where(following_mask[expand], following, values)
+    return previous, following
+
+def masked_gradient(values, mask):
+    """Central-difference gradients (d/dx, d/dy) that ignore uncovered neighbors"""
+    left, right = _masked_neighbors(values, mask, axis=1)
+    down, up = _masked_neighbors(values, mask, axis=0)
+    return (right - left) * 0.5, (up - down) * 0.5
+
+def _box_sum(values, radius, axis):
+    """Sum values over a (2 * radius + 1) window along axis using cumulative sums"""
+    size = values.shape[axis]
+    padded = np.cumsum(values, axis=axis, dtype=np.float64)
+    zero = np.zeros_like(np.take(padded, [0], axis=axis))
+    padded = np.concatenate([zero, padded], axis=axis)
+
+    upper = np.minimum(np.arange(size) + radius + 1, size)
+    lower = np.maximum(np.arange(size) - radius, 0)
+    return np.take(padded, upper, axis=axis) - np.take(padded, lower, axis=axis)
+
+def masked_blur(values, mask, radius):
+    """Box blur of a (h, w) array that only averages covered texels"""
+    if radius <= 0:
+        return values
+
+    weights = mask.astype(np.float64)
+    total = _box_sum(_box_sum(values * weights, radius, 0), radius, 1)
+    count = _box_sum(_box_sum(weights, radius, 0), radius, 1)
+    return (total / np.maximum(count, 1e-8)).astype(np.float32)
+
+def curvature_from_normal(pixels, mask, strength=1.0, directx=False):
+    """Curvature from a tangent-space normal map: convex > 0.5, concave < 0.5"""
+    normals = decode_normals(pixels, directx)
+    dx, _ = masked_gradient(normals[:, :, 0], mask)
+    _, dy = masked_gradient(normals[:, :, 1], mask)
+
+    curvature = np.clip(0.5 + (dx + dy) * strength * 0.5, 0.0, 1.0)
+    return np.where(mask, curvature, 0.5).astype(np.float32)
+
+def cavity_from_normal(pixels, mask, radius=4, strength=1.0, directx=False):
+    """Cavity from a tangent-space normal map: white on flat/convex areas, dark in crevices"""
+    normals = decode_normals(pixels, directx)
+    dx, _ = masked_gradient(normals[:, :, 0], mask)
+    _, dy = masked_gradient(normals[:, :, 1], mask)
+
+    # Large-scale divergence picks up crevices wider than a single texel
+    divergence = masked_blur(dx + dy, mask, radius)
+    cavity = 1.0 - np.clip(-divergence * strength * radius, 0.0, 1.0)
+    return np.where(mask, cavity, 1.0).astype(np.float32)
+
+def normal_from_height(pixels, mask, strength=1.0, directx=False):
+    """Tangent-space normal map from a height/bump buffer"""
+    height = pixels[:, :, :3].mean(axis=2)
+    dx, dy = masked_gradient(height, mask)
+
+    normals = np.stack([-dx * strength, -dy * strength, np.ones_like(height)], axis=2)
+    normals /= np.linalg.norm(normals, axis=2, keepdims=True)
+
+    flat = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+    normals = np.where(mask[:, :, np.newaxis], normals, flat)
+    return encode_normals(normals, directx).astype(np.float32)
+
+def compute_derived_map(suffix, pixels, mask, bake_settings):
+    """Compute the derived map named suffix from baked pixels"""
+    directx = bake_settings.normal_mode == 'DIRECTX'
+    strength = bake_settings.derived_strength
+
+    if suffix == 'Curvature':
+        return curvature_from_normal(pixels, mask, strength, directx)
+    if suffix == 'Cavity':
+        return cavity_from_normal(pixels, mask, bake_settings.cavity_radius, strength, directx)
+    if suffix == 'NormalFromBump':
+        return normal_from_height(pixels, mask, strength, directx)
+    raise ValueError(f"Unsupported derived map: {suffix}")
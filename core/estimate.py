@@ -0,0 +1,277 @@
+"""
+Bake plan estimates for BakingBakes addon
+
+Expands the bake list into the jobs a bake would run, without baking, and
+estimates each job's pixels, peak buffer memory, Cycles time and output
+size. Cycles time and PNG sizes come from a cost model calibrated on the
+per-stage timings every bake records (bakingbakes_timings.json in Blender's
+user config folder, so each machine has its own); pass types without
+history fall back to fixed defaults. Jobs whose memory estimate does not fit
+the machine (or the isolated process limit) are flagged.
+"""
+
+import json
+import os
+import statistics
+
+import bpy
+
+from . import atlas, bake_list, planner, recipes
+from .block_compression import codec_for_pass
+from .watchdog import process_rss_mb
+
+HISTORY_FILENAME = "bakingbakes_timings.json"
+# Records kept in the history file, newest last
+HISTORY_LIMIT = 2000
+PLAN_FILENAME = ".bakingbakes_plan.json"
+
+# Per pixel: Cycles' bake pixel records plus its float RGBA result, the byte
+# image, and the float32 RGBA copies NumPy post-processing holds at once
+CYCLES_BYTES_PER_PIXEL = 28 + 16
+IMAGE_BYTES_PER_PIXEL = 4
+POSTPROCESS_BYTES_PER_PIXEL = 32
+
+# Cycles seconds per megapixel per sample before any history exists
+DEFAULT_SECONDS_PER_MEGAPIXEL = {'SURFACE': 0.4, 'DATA': 0.3, 'LIT': 0.6}
+DEFAULT_PNG_BYTES_PER_PIXEL = 1.5
+COMPRESSED_BYTES_PER_PIXEL = {'BC1': 0.5, 'BC4': 0.5, 'BC5': 1.0, 'BC7': 1.0}
+
+def history_path():
+    """Get the timing history file in Blender's user config folder"""
+    return os.path.join(bpy.utils.user_resource('CONFIG', path="bakingbakes", create=True), HISTORY_FILENAME)
+
+def load_history(path=None):
+    """Load recorded per-stage timings"""
+    path = path or history_path()
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable timing history {path}: {e}")
+        return []
+
+def record_history(records, path=None):
+    """Append timing records, keeping the newest HISTORY_LIMIT, atomically"""
+    path = path or history_path()
+    history = (load_history(path) + list(records))[-HISTORY_LIMIT:]
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(history, handle)
+    os.replace(temp_path, path)
+
+def machine_memory_bytes():
+    """Get the machine's physical memory, or None where it cannot be read"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+class CostModel:
+    """Per-pass rates fitted from timing history
+
+    Cycles time is the median seconds per megapixel-sample of a pass type
+    (falling back to its configuration batch, then DEFAULT_SECONDS_PER_MEGAPIXEL);
+    PNG size is the median bytes per pixel of recorded PNG outputs.
+    """
+    def __init__(self, records):
+        rates = {}
+        png_sizes = {}
+        for record in records:
+            megapixel_samples = record["pixels"] / 1e6 * max(record.get("samples", 1), 1)
+            if megapixel_samples <= 0:
+                continue
+            # Passes replayed from the pass cache never ran Cycles
+            if not record.get("replayed"):
+                rate = record["bake_seconds"] / megapixel_samples
+                rates.setdefault(record["bake_type"], []).append(rate)
+                rates.setdefault(planner.pass_batch(record["bake_type"]), []).append(rate)
+            if record.get("format") == 'PNG' and record.get("output_bytes") and record.get("output_pixels"):
+                png_sizes.setdefault(record["bake_type"], []).append(record["output_bytes"] / record["output_pixels"])
+
+        self.rates = {key: statistics.median(values) for key, values in rates.items()}
+        self.png_sizes = {key: statistics.median(values) for key, values in png_sizes.items()}
+        self.samples = len(records)
+
+    def bake_seconds(self, bake_type, pixels, samples):
+        """Estimate Cycles time for one pass"""
+        batch = planner.pass_batch(bake_type)
+        rate = self.rates.get(bake_type, self.rates.get(batch, DEFAULT_SECONDS_PER_MEGAPIXEL[batch]))
+        return rate * pixels / 1e6 * max(samples, 1)
+
+    def output_bytes(self, bake_type, pixels, file_format, codec=None, mips=False):
+        """Estimate the file size of one output"""
+        if file_format in {'DDS', 'KTX2'}:
+            size = pixels * COMPRESSED_BYTES_PER_PIXEL[codec]
+            return size * 4 / 3 if mips else size
+        return pixels * self.png_sizes.get(bake_type, DEFAULT_PNG_BYTES_PER_PIXEL)
+
+class PlannedJob:
+    """One pass of one material the bake would run, with its estimates"""
+    def __init__(self, object_name, material_name, bake_type, suffix, width, height, samples):
+        self.object_name = object_name
+        self.material_name = material_name
+        self.bake_type = bake_type
+        self.suffix = suffix
+        self.width = width
+        self.height = height
+        self.samples = samples
+        self.memory_bytes = 0
+        self.seconds = 0.0
+        self.disk_bytes = 0
+        self.over_memory = False
+
+    @property
+    def pixels(self):
+        """Pixels Cycles bakes for the job"""
+        return self.width * self.height
+
+    def as_dict(self):
+        """Get the job as plain data"""
+        return {
+            "object": self.object_name,
+            "material": self.material_name,
+            "bake_type": self.bake_type,
+            "size": [self.width, self.height],
+            "samples": self.samples,
+            "memory_mb": round(self.memory_bytes / 2**20, 1),
+            "seconds": round(self.seconds, 2),
+            "disk_mb": round(self.disk_bytes / 2**20, 2),
+            "over_memory": self.over_memory,
+        }
+
+def expand_jobs(scene, source=None):
+    """Expand the bake list into PlannedJobs in bake order, without baking
+
+    source is the selected-to-active high poly, excluded from the targets.
+    """
+    # Imported here: the engine imports the bake session, which records into this module
+    from .baking import get_recipe_bakes, get_selected_bakes
+
+    bake_objects = scene.bakingbakes_objects
+    bake_settings = scene.bakingbakes_settings
+    output_settings = scene.bakingbakes_output
+
+    plan = None
+    if bake_settings.use_recipes and bake_settings.recipes:
+        plan = recipes.compile_recipes(sorted(bake_settings.recipes))
+        passes = get_recipe_bakes(plan)
+    else:
+        passes = get_selected_bakes(bake_settings)
+
+    objects = [obj for obj in bake_list.resolve_objects(scene, bake_objects) if obj != source]
+    if bake_settings.share_linked_duplicates and not bake_objects.bake_selected_to_targets:
+        bake_types = {bake_type for bake_type, suffix in passes}
+        groups = planner.group_linked_duplicates(objects, bake_settings.auto_uv_bake_map, bake_types)
+        objects = [obj for obj, duplicates in groups]
+
+    vertex_colors = output_settings.bake_target == 'VERTEX_COLORS'
+    jobs = []
+
+    # An atlas bakes each pass once for its whole group, one batch across every group at a time
+    if bake_settings.use_atlas and not vertex_colors and not bake_objects.bake_selected_to_targets:
+        groups = atlas.atlas_groups(scene, bake_objects, bake_settings.atlas_grouping, objects)
+        for batch in planner.PASS_BATCHES:
+            for label, group in groups:
+                name = atlas.atlas_name(bake_settings.atlas_name, label)
+                for material, bake_type, suffix in planner.order_bake_jobs([(None, *bake) for bake in passes], (batch,)):
+                    size = plan.bake_resolutions[bake_type] if plan else output_settings.bake_width
+                    samples = planner.pass_configuration(bake_type, bake_settings)['cycles.samples']
+                    jobs.append(PlannedJob(name, "", bake_type, suffix, size, size, samples))
+        return jobs
+
+    for obj in objects:
+        # Color attributes bake each pass once per mesh, images once per material
+        if vertex_colors:
+            mesh = obj.data
+            elements = len(mesh.loops) if output_settings.vertex_color_domain == 'CORNER' else len(mesh.vertices)
+            materials = [None]
+        else:
+            materials = [slot.material for slot in obj.material_slots if slot.material]
+
+        ordered = planner.order_bake_jobs([
+            (material, bake_type, suffix)
+            for material in materials
+            for bake_type, suffix in passes
+        ])
+        for material, bake_type, suffix in ordered:
+            if vertex_colors:
+                width, height = elements, 1
+            elif plan:
+                width = height = plan.bake_resolutions[bake_type]
+            else:
+                width, height = output_settings.bake_width, output_settings.bake_height
+            samples = planner.pass_configuration(bake_type, bake_settings)['cycles.samples']
+            jobs.append(PlannedJob(obj.name, material.name if material else "", bake_type, suffix, width, height, samples))
+
+    # Runs bake one configuration batch across every object before the next
+    jobs.sort(key=lambda job: planner.PASS_BATCHES.index(planner.pass_batch(job.bake_type)))
+    return jobs
+
+def estimate_jobs(jobs, output_settings, model, memory_limit=None):
+    """Fill in each job's estimates, flagging those over memory_limit bytes"""
+    baseline = (process_rss_mb(os.getpid()) or 0) * 2**20
+    output_pixels = output_settings.output_width * output_settings.output_height
+
+    for job in jobs:
+        job.seconds = model.bake_seconds(job.bake_type, job.pixels, job.samples)
+        if output_settings.bake_target == 'VERTEX_COLORS':
+            job.memory_bytes = job.pixels * CYCLES_BYTES_PER_PIXEL
+            job.disk_bytes = 0
+        else:
+            job.memory_bytes = job.pixels * (CYCLES_BYTES_PER_PIXEL + IMAGE_BYTES_PER_PIXEL + POSTPROCESS_BYTES_PER_PIXEL)
+            codec = codec_for_pass(job.bake_type, output_settings.color_codec)
+            job.disk_bytes = model.output_bytes(
+                job.bake_type, output_pixels, output_settings.file_format, codec, output_settings.generate_mips
+            )
+        job.over_memory = bool(memory_limit) and baseline + job.memory_bytes > memory_limit
+    return jobs
+
+def plan_scene(scene, source=None):
+    """Expand and estimate the scene's bake list. Returns the plan as plain data"""
+    bake_settings = scene.bakingbakes_settings
+    if bake_settings.use_isolated_jobs and bake_settings.isolated_memory_limit:
+        memory_limit = bake_settings.isolated_memory_limit * 2**20
+    else:
+        memory_limit = machine_memory_bytes()
+
+    model = CostModel(load_history())
+    jobs = estimate_jobs(expand_jobs(scene, source), scene.bakingbakes_output, model, memory_limit)
+
+    return {
+        "jobs": [job.as_dict() for job in jobs],
+        "objects": len({job.object_name for job in jobs}),
+        "pixels": sum(job.pixels for job in jobs),
+        "seconds": round(sum(job.seconds for job in jobs), 1),
+        "peak_memory_mb": round(max((job.memory_bytes for job in jobs), default=0) / 2**20, 1),
+        "disk_mb": round(sum(job.disk_bytes for job in jobs) / 2**20, 1),
+        "memory_limit_mb": round(memory_limit / 2**20) if memory_limit else None,
+        "over_memory": sum(1 for job in jobs if job.over_memory),
+        "calibration_records": model.samples,
+    }
+
+def format_plan(plan):
+    """Render a plan as a console table with a totals line"""
+    lines = [f"{'Object':<24} {'Material':<20} {'Pass':<20} {'Size':>11} {'Memory':>9} {'Time':>8} {'Disk':>8}"]
+    for job in plan["jobs"]:
+        size = f"{job['size'][0]}x{job['size'][1]}"
+        flag = "  OVER MEMORY" if job["over_memory"] else ""
+        lines.append(
+            f"{job['object'][:24]:<24} {job['material'][:20]:<20} {job['bake_type']:<20} {size:>11} "
+            f"{job['memory_mb']:>7.0f}MB {job['seconds']:>7.1f}s {job['disk_mb']:>6.1f}MB{flag}"
+        )
+    lines.append(
+        f"{len(plan['jobs'])} jobs on {plan['objects']} objects: ~{plan['seconds'] / 60:.1f} min Cycles time, "
+        f"peak {plan['peak_memory_mb']:.0f} MB, {plan['disk_mb']:.1f} MB on disk"
+        + (f", {plan['over_memory']} over the {plan['memory_limit_mb']} MB limit" if plan["over_memory"] else "")
+        + f" (calibrated on {plan['calibration_records']} recorded passes)"
+    )
+    return "\n".join(lines)
+
+def write_plan(directory, plan):
+    """Write a plan next to the .blend as JSON"""
+    path = os.path.join(directory, PLAN_FILENAME)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(plan, handle, indent=1)
+    return path
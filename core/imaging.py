@@ -0,0 +1,231 @@
+"""
+Image buffer helpers for BakingBakes addon
+"""
+
+import numpy as np
+
+# Triangles whose pixel bounds fit in this many pixels are rasterized in bulk
+SMALL_TRIANGLE_PIXELS = 8
+
+def read_image_pixels(image):
+    """Read image pixels into a (height, width, channels) float32 array"""
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+def write_image_pixels(image, pixels):
+    """Write a (height, width, channels) array back into image"""
+    image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+    image.update()
+
+def to_rgba(values):
+    """Expand a (h, w) or (h, w, 3) array to (h, w, 4) with opaque alpha"""
+    if values.ndim == 2:
+        values = np.repeat(values[:, :, np.newaxis], 3, axis=2)
+    alpha = np.ones(values.shape[:2] + (1,), dtype=np.float32)
+    return np.concatenate([values[:, :, :3].astype(np.float32), alpha], axis=2)
+
+def _edge_functions(px, py, tri):
+    """Evaluate the three edge functions of tri at pixel coordinates"""
+    x0, y0 = tri[..., 0, 0], tri[..., 0, 1]
+    x1, y1 = tri[..., 1, 0], tri[..., 1, 1]
+    x2, y2 = tri[..., 2, 0], tri[..., 2, 1]
+    e0 = (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+    e1 = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+    e2 = (x0 - x2) * (py - y2) - (y0 - y2) * (px - x2)
+    return e0, e1, e2
+
+def _inside(e0, e1, e2, eps=1e-6):
+    """Pixel-center coverage test accepting either triangle winding"""
+    return (((e0 >= -eps) & (e1 >= -eps) & (e2 >= -eps)) |
+            ((e0 <= eps) & (e1 <= eps) & (e2 <= eps)))
+
+def rasterize_uv_triangles(triangles, width, height):
+    """Rasterize (N, 3, 2) UV triangles into a (height, width) coverage mask
+
+    Pixels are covered when their center falls inside a triangle. Small
+    triangles, the vast majority on dense meshes, are tested in vectorized
+    chunks; only large ones are visited one at a time.
+    """
+    mask = np.zeros((height, width), dtype=bool)
+    if not len(triangles):
+        return mask
+
+    # Pixel centers sit at integer coordinates in this space
+    points = triangles.astype(np.float64) * (width, height) - 0.5
+    lower = np.clip(np.floor(points.min(axis=1)).astype(np.int64), 0, (width - 1, height - 1))
+    upper = np.clip(np.ceil(points.max(axis=1)).astype(np.int64), 0, (width - 1, height - 1))
+    extent = upper - lower + 1
+
+    # Skip degenerate triangles
+    edges_a = points[:, 1] - points[:, 0]
+    edges_b = points[:, 2] - points[:, 0]
+    area = edges_a[:, 0] * edges_b[:, 1] - edges_a[:, 1] * edges_b[:, 0]
+    valid = np.abs(area) > 1e-12
+
+    size = SMALL_TRIANGLE_PIXELS
+    small = valid & np.all(extent <= size, axis=1)
+    offsets = np.arange(size)
+
+    small_indices = np.flatnonzero(small)
+    for start in range(0, len(small_indices), 16384):
+        chunk = small_indices[start:start + 16384]
+        tri = points[chunk]
+        xs = lower[chunk, 0, np.newaxis] + offsets
+        ys = lower[chunk, 1, np.newaxis] + offsets
+        px = np.broadcast_to(xs[:, np.newaxis, :], (len(chunk), size, size)).astype(np.float64)
+        py = np.broadcast_to(ys[:, :, np.newaxis], (len(chunk), size, size)).astype(np.float64)
+
+        e0, e1, e2 = _edge_functions(px, py, tri[:, np.newaxis, np.newaxis])
+        hit = _inside(e0, e1, e2)
+        hit &= (px <= upper[chunk, 0, np.newaxis, np.newaxis]) & (py <= upper[chunk, 1, np.newaxis, np.newaxis])
+
+        mask[py[hit].astype(np.int64), px[hit].astype(np.int64)] = True
+
+    for index in np.flatnonzero(valid & ~small):
+        (x0, y0), (x1, y1) = lower[index], upper[index]
+        py, px = np.mgrid[y0:y1 + 1, x0:x1 + 1].astype(np.float64)
+        e0, e1, e2 = _edge_functions(px, py, points[index])
+        mask[y0:y1 + 1, x0:x1 + 1] |= _inside(e0, e1, e2)
+
+    return mask
+
+def uv_coverage_mask(context, obj, uv_name, width, height):
+    """Get a (height, width) mask of texels covered by obj's UV islands
+
+    Uses the evaluated mesh, since that is what Cycles bakes.
+    """
+    depsgraph = context.evaluated_depsgraph_get()
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        uv_layer = mesh.uv_layers.get(uv_name) if uv_name else None
+        uv_layer = uv_layer or mesh.uv_layers.active
+        if not uv_layer:
+            return np.zeros((height, width), dtype=bool)
+
+        mesh.calc_loop_triangles()
+        loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("loops", loops)
+
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+    finally:
+        obj_eval.to_mesh_clear()
+
+    triangles = uvs.reshape(-1, 2)[loops.reshape(-1, 3)]
+    return rasterize_uv_triangles(triangles, width, height)
+
+def _shift(values, dy, dx, fill):
+    """Get values[y + dy, x + dx] for every texel, using fill outside the image"""
+    height, width = values.shape
+    shifted = np.full_like(values, fill)
+    src_y = slice(max(dy, 0), height + min(dy, 0))
+    src_x = slice(max(dx, 0), width + min(dx, 0))
+    dst_y = slice(max(-dy, 0), height + min(-dy, 0))
+    dst_x = slice(max(-dx, 0), width + min(-dx, 0))
+    shifted[dst_y, dst_x] = values[src_y, src_x]
+    return shifted
+
+NEIGHBOR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+
+def nearest_covered_texels(mask, max_distance):
+    """Find the nearest covered texel for every texel within max_distance
+
+    Seeds are propagated outward from the island borders one ring at a time,
+    touching only the active front instead of the whole image, so cost follows
+    the island perimeter times the margin rather than the texture size.
+    Returns (seed_y, seed_x) int32 arrays, -1 where nothing is in range.
+    """
+    height, width = mask.shape
+    seed = np.where(mask.ravel(), np.arange(height * width), -1)
+    best = np.where(mask.ravel(), 0, np.iinfo(np.int64).max)
+    limit = max_distance ** 2
+
+    # Start from covered texels that touch at least one uncovered neighbor
+    border = np.zeros_like(mask)
+    for dy, dx in NEIGHBOR_OFFSETS:
+        border |= ~_shift(mask, dy, dx, True)
+    front = np.flatnonzero(mask & border)
+
+    while len(front):
+        front_y, front_x = np.divmod(front, width)
+        source = seed[front]
+        source_y, source_x = np.divmod(source, width)
+
+        targets, sources, dists = [], [], []
+        for dy, dx in NEIGHBOR_OFFSETS:
+            ny = front_y + dy
+            nx = front_x + dx
+            inside = (ny >= 0) & (ny < height) & (nx >= 0) & (nx < width)
+            ny, nx = ny[inside], nx[inside]
+            d = (ny - source_y[inside]) ** 2 + (nx - source_x[inside]) ** 2
+            target = ny * width + nx
+            better = (d < best[target]) & (d <= limit)
+            targets.append(target[better])
+            sources.append(source[inside][better])
+            dists.append(d[better])
+
+        targets = np.concatenate(targets)
+        if not len(targets):
+            break
+        sources = np.concatenate(sources)
+        dists = np.concatenate(dists)
+
+        # Write farthest first so the nearest candidate wins for duplicate targets
+        order = np.argsort(-dists, kind='stable')
+        seed[targets[order]] = sources[order]
+        best[targets[order]] = dists[order]
+        front = np.unique(targets)
+
+    seed_y, seed_x = np.divmod(seed, width)
+    seed_y = np.where(seed >= 0, seed_y, -1).reshape(height, width).astype(np.int32)
+    seed_x = np.where(seed >= 0, seed_x, -1).reshape(height, width).astype(np.int32)
+    return seed_y, seed_x
+
+def margin_fill_indices(mask, margin):
+    """Get (target, source) flat texel indices that pad UV islands by margin pixels"""
+    seed_y, seed_x = nearest_covered_texels(mask, margin)
+    fill = (~mask) & (seed_y >= 0)
+    width = mask.shape[1]
+    targets = np.flatnonzero(fill)
+    sources = seed_y[fill].astype(np.int64) * width + seed_x[fill]
+    return targets, sources
+
+def apply_margin(pixels, fill_indices):
+    """Copy island texels outward using indices from margin_fill_indices()"""
+    targets, sources = fill_indices
+    height, width, channels = pixels.shape
+    flat = pixels.reshape(height * width, channels)
+    flat[targets] = flat[sources]
+    return pixels
+
+def resample(pixels, width, height):
+    """Resize a (h, w, c) buffer to (height, width, c)
+
+    Integer reductions average whole texel blocks; other sizes use bilinear
+    filtering.
+    """
+    src_height, src_width = pixels.shape[:2]
+    if (src_width, src_height) == (width, height):
+        return pixels
+
+    if src_width % width == 0 and src_height % height == 0:
+        fy, fx = src_height // height, src_width // width
+        blocks = pixels.reshape(height, fy, width, fx, pixels.shape[2])
+        return blocks.mean(axis=(1, 3)).astype(np.float32)
+
+    def axis_weights(src_size, dst_size):
+        coords = (np.arange(dst_size) + 0.5) * src_size / dst_size - 0.5
+        coords = np.clip(coords, 0, src_size - 1)
+        lower = np.floor(coords).astype(np.int64)
+        upper = np.minimum(lower + 1, src_size - 1)
+        return lower, upper, (coords - lower).astype(np.float32)
+
+    y0, y1, wy = axis_weights(src_height, height)
+    x0, x1, wx = axis_weights(src_width, width)
+
+    rows = pixels[y0] * (1.0 - wy)[:, np.newaxis, np.newaxis] + pixels[y1] * wy[:, np.newaxis, np.newaxis]
+    return (rows[:, x0] * (1.0 - wx)[np.newaxis, :, np.newaxis] +
+            rows[:, x1] * wx[np.newaxis, :, np.newaxis]).astype(np.float32)
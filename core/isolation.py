@@ -0,0 +1,134 @@
+"""
+Bake scene isolation for BakingBakes addon
+
+Cycles syncs every renderable object into its BVH for each bake call. These
+helpers temporarily exclude collections and hide objects that cannot affect the
+bake, so scene sync cost follows what is actually being baked.
+"""
+
+import numpy as np
+
+# Bake types whose result depends on surrounding geometry
+OCCLUSION_BAKE_TYPES = {'AO', 'SHADOW', 'ENVIRONMENT'}
+
+class IsolationState:
+    """Record of everything changed by isolate_bake_scene()"""
+    def __init__(self, view_layer):
+        self.view_layer = view_layer
+        self.excluded_collections = []
+        self.hidden_objects = []
+
+def world_bounding_boxes(objects):
+    """Get world-space axis aligned bounding boxes as an (N, 2, 3) array of min/max corners"""
+    boxes = np.empty((len(objects), 2, 3), dtype=np.float32)
+    for i, obj in enumerate(objects):
+        corners = np.array([corner[:] for corner in obj.bound_box], dtype=np.float32)
+        matrix = np.array(obj.matrix_world, dtype=np.float32)
+        world = corners @ matrix[:3, :3].T + matrix[:3, 3]
+        boxes[i, 0] = world.min(axis=0)
+        boxes[i, 1] = world.max(axis=0)
+    return boxes
+
+def find_occluders(context, bake_objects, radius):
+    """Find renderable objects whose bounds come within radius of any bake object"""
+    candidates = [
+        obj for obj in context.view_layer.objects
+        if obj not in bake_objects and obj.type in {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}
+    ]
+    if not candidates or not bake_objects:
+        return set()
+
+    bake_boxes = world_bounding_boxes(list(bake_objects))
+    bake_boxes[:, 0] -= radius
+    bake_boxes[:, 1] += radius
+    candidate_boxes = world_bounding_boxes(candidates)
+
+    # Candidate (M) x bake object (K) overlap test on all three axes at once
+    overlaps = np.all(
+        (candidate_boxes[:, np.newaxis, 0] <= bake_boxes[np.newaxis, :, 1]) &
+        (candidate_boxes[:, np.newaxis, 1] >= bake_boxes[np.newaxis, :, 0]),
+        axis=2
+    ).any(axis=1)
+
+    return {obj for obj, overlap in zip(candidates, overlaps) if overlap}
+
+def _find_layer_collection(layer_collection, collection):
+    """Find the layer collection wrapping collection in a view layer tree"""
+    if layer_collection.collection == collection:
+        return layer_collection
+
+    for child in layer_collection.children:
+        found = _find_layer_collection(child, collection)
+        if found:
+            return found
+
+    return None
+
+def _isolate_layer_collection(layer_collection, keep, state):
+    """Exclude child collections without relevant objects and hide the rest"""
+    for obj in layer_collection.collection.objects:
+        if obj not in keep and not obj.hide_render:
+            obj.hide_render = True
+            state.hidden_objects.append(obj)
+
+    for child in layer_collection.children:
+        if child.exclude:
+            continue
+
+        if any(obj in keep for obj in child.collection.all_objects):
+            _isolate_layer_collection(child, keep, state)
+        else:
+            child.exclude = True
+            state.excluded_collections.append(child.collection)
+
+def isolate_bake_scene(context, bake_objects, bake_types, occluder_radius=0.0):
+    """Restrict the view layer to bake objects, lights and nearby occluders
+
+    Occluders are only gathered when one of bake_types depends on surrounding
+    geometry. Returns an IsolationState for restore_bake_scene().
+    """
+    state = IsolationState(context.view_layer)
+    bake_objects = {obj for obj in bake_objects if obj}
+
+    keep = set(bake_objects)
+    keep.update(obj for obj in context.view_layer.objects if obj.type == 'LIGHT')
+
+    if OCCLUSION_BAKE_TYPES.intersection(bake_types):
+        keep.update(find_occluders(context, bake_objects, occluder_radius))
+
+    # Parents drive world transforms of the objects we bake
+    for obj in list(keep):
+        parent = obj.parent
+        while parent and parent not in keep:
+            keep.add(parent)
+            parent = parent.parent
+
+    _isolate_layer_collection(context.view_layer.layer_collection, keep, state)
+
+    print(f"Bake scene isolated: {len(keep)} objects kept, "
+          f"{len(state.excluded_collections)} collections excluded, "
+          f"{len(state.hidden_objects)} objects hidden")
+
+    return state
+
+def restore_bake_scene(state):
+    """Undo the changes made by isolate_bake_scene()"""
+    if not state:
+        return
+
+    # Layer collections are re-synced when exclusion changes, so look them up again
+    root = state.view_layer.layer_collection
+    for collection in reversed(state.excluded_collections):
+        layer_collection = _find_layer_collection(root, collection)
+        if layer_collection:
+            layer_collection.exclude = False
+
+    for obj in state.hidden_objects:
+        try:
+            obj.hide_render = False
+        except ReferenceError:
+            # Object was removed during the bake session
+            continue
+
+    state.excluded_collections.clear()
+    state.hidden_objects.clear()
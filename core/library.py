@@ -0,0 +1,279 @@
+"""
+Asset library batch baking for BakingBakes addon
+
+Walks a directory tree of .blend files and bakes each one inside a pool of
+long-lived background Blender processes (see library_worker.py), so Blender
+only starts once per worker rather than once per file. Progress is kept in a
+status index at the library root, and reruns skip files already baked (or
+found to have nothing to bake). A file that keeps a worker busy past the job
+timeout fails and its worker is killed and respawned for the next file.
+
+Runs without bpy, either from the Bake Library operator or from a shell:
+    python library.py --blender /path/to/blender --root /library --preset GAME_ASSETS
+
+Add --plan to only estimate the run (see estimate.py) without baking.
+"""
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+INDEX_FILENAME = ".bakingbakes_index.json"
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "library_worker.py")
+RESULT_PREFIX = "BAKINGBAKES_RESULT "
+# Index statuses a rerun skips while the file is unchanged
+FINISHED_STATUSES = ("done", "skipped")
+# Seconds one file may take, including opening it, before its worker is killed
+DEFAULT_JOB_TIMEOUT = 1800.0
+
+def find_blend_files(root):
+    """Find .blend files under root, skipping hidden directories and backups"""
+    blend_files = []
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.endswith(".blend"):
+                blend_files.append(os.path.join(directory, filename))
+    return blend_files
+
+def load_index(root):
+    """Load the per-file status index, keyed by path relative to root"""
+    path = os.path.join(root, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable library index {path}: {e}")
+        return {}
+
+def save_index(root, index):
+    """Write the status index atomically so an interrupted run never corrupts it"""
+    path = os.path.join(root, INDEX_FILENAME)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(index, handle, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def is_up_to_date(entry, filepath, preset, collection):
+    """Check whether an index entry records a finished bake (or skip) of the current file"""
+    return (
+        entry is not None
+        and entry.get("status") in FINISHED_STATUSES
+        and entry.get("preset") == preset
+        and entry.get("collection") == collection
+        and entry.get("mtime") == os.path.getmtime(filepath)
+    )
+
+class LibraryWorker:
+    """One background Blender process serving bake jobs over stdin/stdout
+
+    timeout is the seconds one job may take; 0 waits forever.
+    """
+    def __init__(self, blender, addon, timeout=DEFAULT_JOB_TIMEOUT):
+        self.blender = blender
+        self.addon = addon
+        self.timeout = timeout
+        self.process = None
+        self.results = None
+
+    def start(self):
+        """Start (or restart) the Blender process"""
+        self.process = subprocess.Popen(
+            [self.blender, "-b", "--python", WORKER_SCRIPT, "--", "--addon", self.addon],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        # Output is read on a thread so a silent, hung Blender can be timed out
+        self.results = queue.Queue()
+        reader = threading.Thread(target=self._read_output, args=(self.process, self.results), daemon=True)
+        reader.start()
+
+    @staticmethod
+    def _read_output(process, results):
+        """Queue each result line of a process, then None once its stdout closes"""
+        for line in process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                try:
+                    results.put(json.loads(line[len(RESULT_PREFIX):]))
+                except ValueError as e:
+                    results.put({"status": "failed", "error": f"Worker error: {e}"})
+        results.put(None)
+
+    def run(self, job):
+        """Send a job and wait for its result, restarting Blender if it died or hung"""
+        if not self.process or self.process.poll() is not None:
+            self.start()
+
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            return {"file": job["file"], "status": "failed", "error": f"Worker error: {e}"}
+
+        try:
+            result = self.results.get(timeout=self.timeout or None)
+        except queue.Empty:
+            # Killed here, respawned by the worker's next job
+            self.process.kill()
+            self.process.wait()
+            return {"file": job["file"], "status": "failed", "error": f"Timed out after {self.timeout:g}s"}
+        if result is not None:
+            return result
+
+        # stdout closed without a result: Blender crashed on this file
+        self.process.wait()
+        return {
+            "file": job["file"],
+            "status": "failed",
+            "error": f"Blender exited with code {self.process.returncode}",
+        }
+
+    def stop(self):
+        """Close stdin so the worker finishes its loop and exits"""
+        if self.process and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+def run_pool(jobs, blender, addon, workers, handle_result, timeout=DEFAULT_JOB_TIMEOUT):
+    """Run jobs on a pool of Blender workers, calling handle_result(job, result) under a lock"""
+    lock = threading.Lock()
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+
+    def serve(worker):
+        while True:
+            try:
+                job = pending.get_nowait()
+            except queue.Empty:
+                break
+
+            result = worker.run(job)
+            with lock:
+                handle_result(job, result)
+
+        worker.stop()
+
+    pool = [LibraryWorker(blender, addon, timeout) for _ in range(max(1, min(workers, len(jobs))))]
+    threads = [threading.Thread(target=serve, args=(worker,), daemon=True) for worker in pool]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def library_jobs(root, index, preset, collection, force, **extra):
+    """Get a job for every .blend under root that is not up to date"""
+    jobs = []
+    for filepath in find_blend_files(root):
+        key = os.path.relpath(filepath, root)
+        if not force and is_up_to_date(index.get(key), filepath, preset, collection):
+            continue
+        jobs.append(dict({"file": filepath, "preset": preset, "collection": collection}, **extra))
+    return jobs
+
+def bake_library(root, blender, preset, workers=2, collection="", addon="BakingBakes", force=False,
+                 timeout=DEFAULT_JOB_TIMEOUT):
+    """Bake every .blend under root with a preset using a pool of Blender workers
+
+    Outputs are written next to each .blend. timeout limits each file (0 for
+    none). Returns the updated status index.
+    """
+    root = os.path.abspath(root)
+    index = load_index(root)
+    jobs = library_jobs(root, index, preset, collection, force)
+
+    print(f"Library bake: {len(jobs)} files to bake with {preset}, {workers} workers")
+
+    def handle_result(job, result):
+        key = os.path.relpath(job["file"], root)
+        entry = {
+            "status": result.get("status", "failed"),
+            "preset": preset,
+            "collection": collection,
+            "mtime": os.path.getmtime(job["file"]),
+            "seconds": result.get("seconds"),
+            "error": result.get("error"),
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        index[key] = entry
+        save_index(root, index)
+        print(f"[{entry['status']}] {key}" + (f": {entry['error']}" if entry["error"] else ""))
+
+    run_pool(jobs, blender, addon, workers, handle_result, timeout)
+    return index
+
+def plan_library(root, blender, preset, workers=2, collection="", addon="BakingBakes", force=False,
+                 timeout=DEFAULT_JOB_TIMEOUT):
+    """Estimate what bake_library would do, without baking or touching the index
+
+    Returns {relative path: plan} (see estimate.plan_scene); files whose
+    plan failed map to None.
+    """
+    root = os.path.abspath(root)
+    jobs = library_jobs(root, load_index(root), preset, collection, force, plan=True)
+    plans = {}
+
+    print(f"Library plan: {len(jobs)} files with {preset}")
+
+    def handle_result(job, result):
+        key = os.path.relpath(job["file"], root)
+        plan = result.get("plan")
+        plans[key] = plan
+        if plan:
+            print(f"[plan] {key}: {len(plan['jobs'])} jobs, ~{plan['seconds'] / 60:.1f} min, "
+                  f"peak {plan['peak_memory_mb']:.0f} MB, {plan['disk_mb']:.1f} MB"
+                  + (f", {plan['over_memory']} over memory" if plan["over_memory"] else ""))
+        else:
+            print(f"[{result.get('status', 'failed')}] {key}: {result.get('error')}")
+
+    run_pool(jobs, blender, addon, workers, handle_result, timeout)
+
+    planned = [plan for plan in plans.values() if plan]
+    print(
+        f"Library plan: {sum(len(plan['jobs']) for plan in planned)} jobs in {len(planned)} files, "
+        f"~{sum(plan['seconds'] for plan in planned) / 3600:.2f} h Cycles time, "
+        f"peak {max((plan['peak_memory_mb'] for plan in planned), default=0):.0f} MB, "
+        f"{sum(plan['disk_mb'] for plan in planned):.1f} MB on disk, "
+        f"{sum(plan['over_memory'] for plan in planned)} jobs over memory"
+    )
+    return plans
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Bake every .blend in an asset library")
+    parser.add_argument("--blender", required=True, help="Path to the Blender executable")
+    parser.add_argument("--root", required=True, help="Library root directory")
+    parser.add_argument("--preset", required=True, help="Preset name from presets/defaults.py")
+    parser.add_argument("--workers", type=int, default=2, help="Number of Blender processes")
+    parser.add_argument("--collection", default="", help="Only bake meshes in this collection")
+    parser.add_argument("--addon", default="BakingBakes", help="Module name of the installed addon")
+    parser.add_argument("--force", action="store_true", help="Rebake files already marked done")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_JOB_TIMEOUT,
+                        help="Seconds one file may take before its worker is killed (0 for no limit)")
+    parser.add_argument("--plan", action="store_true", help="Estimate time, memory and disk use without baking")
+    args = parser.parse_args(argv)
+
+    if args.plan:
+        plans = plan_library(
+            args.root, args.blender, args.preset, args.workers, args.collection, args.addon, args.force, args.timeout
+        )
+        return 1 if any(plan is None or plan["over_memory"] for plan in plans.values()) else 0
+
+    index = bake_library(
+        args.root, args.blender, args.preset, args.workers, args.collection, args.addon, args.force, args.timeout
+    )
+    failed = [key for key, entry in index.items() if entry.get("status") == "failed"]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Background Blender worker for BakingBakes library batches
+
+Run by core/library.py as:
+    blender -b --python library_worker.py -- --addon BakingBakes
+
+The worker stays alive between files. It reads one JSON job per line on stdin,
+opens the .blend, bakes it and answers with one RESULT_PREFIX line on stdout.
+
+Jobs with an "objects" list come from the isolated bake mode (watchdog.py):
+they bake only those bake-list objects of the file with its own settings.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+import traceback
+
+import addon_utils
+import bpy
+
+RESULT_PREFIX = "BAKINGBAKES_RESULT "
+
+def parse_args():
+    """Parse arguments given after Blender's '--' separator"""
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="BakingBakes library worker")
+    parser.add_argument("--addon", default="BakingBakes", help="Module name of the installed addon")
+    return parser.parse_args(argv)
+
+def send_result(result):
+    """Write a result line the controller can pick out of Blender's own output"""
+    sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+    sys.stdout.flush()
+
+def collect_bake_objects(scene, collection_name):
+    """Get mesh objects to bake: a tagged collection if given, else every mesh in the scene"""
+    if collection_name:
+        collection = bpy.data.collections.get(collection_name)
+        if not collection:
+            return []
+        objects = collection.all_objects
+    else:
+        objects = scene.objects
+
+    return [obj for obj in objects if obj.type == 'MESH']
+
+def bake_file(job, addon):
+    """Open one .blend and bake it with the requested preset"""
+    defaults = importlib.import_module(f"{addon}.presets.defaults")
+
+    bpy.ops.wm.open_mainfile(filepath=job["file"], load_ui=False)
+    scene = bpy.context.scene
+
+    objects = collect_bake_objects(scene, job.get("collection"))
+    if not objects:
+        return {"status": "skipped", "error": "No mesh objects to bake"}
+
+    defaults.apply_preset(scene.bakingbakes_settings, job["preset"])
+
+    bake_objects = scene.bakingbakes_objects
+    bake_objects.objects.clear()
+    bake_objects.bake_selected_to_targets = False
+    for obj in objects:
+        bake_objects.objects.add().object = obj
+
+    scene.render.engine = 'CYCLES'
+
+    # Plan jobs expand and estimate the bake without running it
+    if job.get("plan"):
+        estimate = importlib.import_module(f"{addon}.core.estimate")
+        return {"status": "planned", "objects": len(objects), "plan": estimate.plan_scene(scene)}
+
+    result = bpy.ops.bakingbakes.bake_objects()
+
+    if 'FINISHED' not in result:
+        return {"status": "failed", "error": "Bake operator cancelled", "objects": len(objects)}
+    return {"status": "done", "objects": len(objects)}
+
+def bake_objects(job, addon):
+    """Open one .blend and bake the named bake-list objects with the file's settings"""
+    bake_list = importlib.import_module(f"{addon}.core.bake_list")
+
+    bpy.ops.wm.open_mainfile(filepath=job["file"], load_ui=False)
+    scene = bpy.context.scene
+
+    # Clear statuses saved with the file so only this bake's outcome is read back
+    items = dict(bake_list.resolve_items(scene, scene.bakingbakes_objects))
+    for name in job["objects"]:
+        item = items.get(bpy.data.objects.get(name))
+        if item is not None:
+            item.last_result = 'NONE'
+
+    # The parent is already the isolated run; bake in this process
+    scene.bakingbakes_settings.use_isolated_jobs = False
+    result = bpy.ops.bakingbakes.bake_objects(objects_filter="\n".join(job["objects"]))
+
+    # Read each object's outcome off the bake list item it was baked through
+    objects = {}
+    for name in job["objects"]:
+        item = items.get(bpy.data.objects.get(name))
+        if item is not None and item.last_result != 'NONE':
+            objects[name] = [item.last_result == 'DONE', item.last_message]
+        else:
+            objects[name] = [False, "Not baked"]
+
+    succeeded = 'FINISHED' in result and all(success for success, message in objects.values())
+    return {"status": "done" if succeeded else "failed", "objects": objects}
+
+def main():
+    """Serve bake jobs until stdin closes"""
+    args = parse_args()
+    addon_utils.enable(args.addon, default_set=False)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job = json.loads(line)
+        start = time.time()
+        try:
+            if job.get("objects") is not None:
+                result = bake_objects(job, args.addon)
+            else:
+                result = bake_file(job, args.addon)
+        except Exception as e:
+            traceback.print_exc()
+            result = {"status": "failed", "error": str(e)}
+
+        result["file"] = job["file"]
+        result["seconds"] = round(time.time() - start, 3)
+        send_result(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Content-addressed output store for BakingBakes addon
+
+Many bake outputs are byte-identical: black emission, flat normal maps,
+passes shared by materials. Each output is hashed from its pixel buffer and
+encoding settings before it is written; every unique blob is written once
+into a store folder next to the .blend, and output files become hardlinks or
+symlinks to it (or only manifest entries). Images that are uniform are found
+with a min/max reduction and collapsed to a tiny constant texture first.
+
+The manifest (.bakingbakes_outputs.json) maps each output, relative to the
+store root, to its hash and blob, so reruns that produce the same pixels
+skip writing entirely.
+
+A linked output shares its blob's contents, so anything writing an output
+path in place would change every identical output at once. The bake engine
+unlinks an output path before writing it (see unlink_output()) and block
+compressed files are written to a temporary file and moved into place. The
+manifest also records each blob's size and modification time, and a blob
+changed behind the store's back (say, a texture painted and saved through
+its link) is written again instead of being reused.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+MANIFEST_FILENAME = ".bakingbakes_outputs.json"
+STORE_DIRNAME = ".bakingbakes_store"
+
+# Uniform images are written at this size (a multiple of the 4x4 BC block)
+UNIFORM_SIZE = 4
+# Largest channel spread still treated as uniform, well under one 8-bit step
+UNIFORM_TOLERANCE = 1.0 / 1024
+# Prime stride for the quick sample, so samples do not line up in one column
+UNIFORM_SAMPLE_STRIDE = 4099
+
+def uniform_color(pixels, tolerance=UNIFORM_TOLERANCE):
+    """Get the color of an image whose pixels are all equal within tolerance, or None"""
+    flat = pixels.reshape(-1, pixels.shape[-1])
+
+    # A strided sample rejects almost every real bake without reading the whole buffer
+    if np.any(np.ptp(flat[::UNIFORM_SAMPLE_STRIDE], axis=0) > tolerance):
+        return None
+
+    low = flat.min(axis=0)
+    high = flat.max(axis=0)
+    if np.any(high - low > tolerance):
+        return None
+    return tuple(float(value) for value in (low + high) * 0.5)
+
+def uniform_pixels(color):
+    """Build the UNIFORM_SIZE square buffer a uniform image collapses to"""
+    return np.full((UNIFORM_SIZE, UNIFORM_SIZE, len(color)), color, dtype=np.float32)
+
+def unlink_output(path):
+    """Remove whatever is at an output path, so writing it cannot go through a link into a store blob"""
+    if os.path.lexists(path):
+        os.remove(path)
+
+def content_hash(pixels, variant=()):
+    """Hash a pixel buffer together with the settings it is encoded with"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((pixels.shape, str(pixels.dtype), variant)).encode("utf-8"))
+    digest.update(memoryview(np.ascontiguousarray(pixels)).cast('B'))
+    return digest.hexdigest()
+
+class OutputStore:
+    """Writes each unique output once and links duplicates to it
+
+    mode is 'HARDLINK' or 'SYMLINK' (every output path exists and points at
+    its blob) or 'MANIFEST' (only blobs are written; outputs are looked up
+    through the manifest). Call close() at the end of a run to write the
+    manifest and delete blobs no output refers to anymore.
+    """
+    def __init__(self, root, mode='HARDLINK'):
+        self.root = root
+        self.mode = mode
+        self.store_dir = os.path.join(root, STORE_DIRNAME)
+        self.manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self.outputs = self._load_manifest()
+        # Blob path relative to the root -> [size, mtime_ns] it was written with
+        self.blob_stats = {
+            entry["blob"]: entry["blob_stat"] for entry in self.outputs.values() if entry.get("blob_stat")
+        }
+        # Blobs still being written by the post-processing pool -> their PendingTask
+        self.pending = {}
+        self.written = 0
+        self.reused = 0
+        self.bytes_saved = 0
+
+    def _load_manifest(self):
+        """Load output entries keyed by path relative to the root"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("outputs", {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable output manifest {self.manifest_path}: {e}")
+            return {}
+
+    def store(self, path, pixels, variant, write, uniform=None):
+        """Store one output, calling write(path) only for content not stored yet
+
+        write may hand the file to the post-processing pool and return its
+        PendingTask; the output is then placed once the task finishes.
+        Returns the file that will hold the output: path itself, or its blob
+        in MANIFEST mode.
+        """
+        digest = content_hash(pixels, variant)
+        blob = os.path.join(self.store_dir, digest + os.path.splitext(path)[1])
+        if os.path.exists(blob) and blob not in self.pending and not self._intact(blob):
+            print(f"Rewriting {os.path.basename(blob)}, which was modified after it was stored")
+            os.remove(blob)
+
+        writing = self.pending.get(blob)
+        if writing is not None and writing.result is None:
+            # Identical content is still being written for an earlier output
+            self.reused += 1
+            writing.then(lambda result: self._place(path, digest, blob, uniform))
+            return blob if self.mode == 'MANIFEST' else path
+
+        if os.path.exists(blob):
+            self.reused += 1
+            self.bytes_saved += os.path.getsize(blob)
+            return self._place(path, digest, blob, uniform)
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = blob + ".tmp"
+        pending = write(temp_path)
+        if pending is None:
+            self._commit(temp_path, blob)
+            return self._place(path, digest, blob, uniform)
+
+        self.pending[blob] = pending
+        pending.then(lambda result: self._commit(temp_path, blob))
+        pending.then(lambda result: self._place(path, digest, blob, uniform))
+        return blob if self.mode == 'MANIFEST' else path
+
+    def _blob_stat(self, blob):
+        """Get the size and modification time a blob is recorded with"""
+        stat = os.stat(blob)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _intact(self, blob):
+        """Check that a stored blob still has the size and time it was written with"""
+        recorded = self.blob_stats.get(os.path.relpath(blob, self.root))
+        return recorded is None or recorded == self._blob_stat(blob)
+
+    def _commit(self, temp_path, blob):
+        """Move a freshly written blob into place"""
+        os.replace(temp_path, blob)
+        self.blob_stats[os.path.relpath(blob, self.root)] = self._blob_stat(blob)
+        self.pending.pop(blob, None)
+        self.written += 1
+
+    def _place(self, path, digest, blob, uniform):
+        """Record an output in the manifest and point its path at the blob"""
+        relative_blob = os.path.relpath(blob, self.root)
+        if relative_blob not in self.blob_stats:
+            # Blobs from manifests without stats are trusted once and recorded
+            self.blob_stats[relative_blob] = self._blob_stat(blob)
+        entry = {"hash": digest, "blob": relative_blob, "blob_stat": self.blob_stats[relative_blob]}
+        if uniform is not None:
+            entry["uniform"] = list(uniform)
+        self.outputs[os.path.relpath(path, self.root)] = entry
+
+        if self.mode == 'MANIFEST':
+            # A file left by another mode would shadow the manifest entry
+            if os.path.lexists(path):
+                os.remove(path)
+            return blob
+        self._link(blob, path)
+        return path
+
+    def _link(self, blob, path):
+        """Point path at blob, replacing whatever was there"""
+        if os.path.lexists(path):
+            if os.path.exists(path) and os.path.samefile(path, blob):
+                return
+            os.remove(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        try:
+            if self.mode == 'SYMLINK':
+                os.symlink(os.path.relpath(blob, os.path.dirname(path)), path)
+            else:
+                os.link(blob, path)
+        except OSError:
+            # Filesystems without link support get a plain copy
+            shutil.copyfile(blob, path)
+
+    def resolve(self, relative_path):
+        """Get the file holding an output listed in the manifest, or None"""
+        entry = self.outputs.get(relative_path)
+        return os.path.join(self.root, entry["blob"]) if entry else None
+
+    def prune(self):
+        """Delete blobs no manifest entry refers to. Returns the count deleted"""
+        if not os.path.isdir(self.store_dir):
+            return 0
+        referenced = {os.path.basename(entry["blob"]) for entry in self.outputs.values()}
+        removed = 0
+        for filename in os.listdir(self.store_dir):
+            if filename not in referenced:
+                os.remove(os.path.join(self.store_dir, filename))
+                removed += 1
+        return removed
+
+    def close(self):
+        """Prune unreferenced blobs and write the manifest atomically"""
+        self.prune()
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": 1, "outputs": self.outputs}, handle, indent=1, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def summary(self):
+        """Describe what the store wrote and reused this run"""
+        return f"{self.written} written, {self.reused} reused ({self.bytes_saved // 1024} KB not written)"
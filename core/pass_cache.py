@@ -0,0 +1,228 @@
+"""
+Raw pass cache for BakingBakes addon
+
+Keeps the float buffer of every baked pass as an .npy file in the output
+folder, keyed by a hash of what the bake read: the objects' mesh data,
+modifiers, transforms, bake UVs and materials, the pass, its resolution and
+the render bake settings. Bake image nodes the engine adds are left out of
+the material part, so an unchanged scene keys the same on every run. A
+replay run memory-maps a matching file instead of calling Cycles and hands
+the mapped array straight to post-processing: recipes, margin filling,
+resizing and DDS/KTX2 encoding read it in place, so changing output
+resolution, recipes or file format takes seconds and never decodes a PNG.
+Only PNG output, saved through Blender, copies it into the bake image.
+
+Passes baked through an evaluated mesh proxy are keyed and named after the
+object the proxy stands in for, so turning proxies on or off replays the
+same entries.
+
+Lit passes also depend on their surroundings, which the key does not cover;
+replays are explicit for that reason. When a replay misses, the entry's
+sidecar file names the parts of the key that changed.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+import bpy
+import numpy as np
+
+from .bake_list import bake_input_hash
+from .preview import PREVIEW_NODE_NAMES
+from .proxy import proxy_source
+from .storage import BAKE_NODE_LABEL_PREFIX
+
+CACHE_DIRNAME = ".bakingbakes_passes"
+KEY_LENGTH = 16
+# Characters replaced when an object or material name becomes part of a cache file name
+UNSAFE_NAME_CHARACTERS = re.compile(r"[^\w.-]")
+
+# Render settings a bake result depends on, keyed by path from the scene
+BAKE_SETTING_PATHS = (
+    'cycles.samples',
+    'render.bake.margin',
+    'render.bake.margin_type',
+    'render.bake.use_selected_to_active',
+    'render.bake.cage_extrusion',
+    'render.bake.max_ray_distance',
+    'render.bake.use_cage',
+)
+
+def _value_signature(value):
+    """Get a hashable form of a socket or node setting value"""
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    if hasattr(value, '__len__') and not isinstance(value, str):
+        return tuple(round(part, 6) for part in value)
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+def _node_settings(node):
+    """Get the values of a node's own settings (Math operation, image interpolation, ...)"""
+    base = bpy.types.ShaderNode.bl_rna.properties
+    return tuple(
+        (prop.identifier, _value_signature(getattr(node, prop.identifier)))
+        for prop in node.bl_rna.properties
+        if prop.identifier not in base and prop.type in {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}
+    )
+
+def _is_engine_node(node):
+    """Check whether a node was added by the bake engine or a preview rather than the artist"""
+    if node.name in PREVIEW_NODE_NAMES:
+        return True
+    return node.type == 'TEX_IMAGE' and node.label.startswith(BAKE_NODE_LABEL_PREFIX)
+
+def material_signature(material):
+    """Summarize a material's node tree: nodes, unlinked input values, images and links
+
+    Bake and preview image nodes are left out; they are bake targets, not inputs.
+    """
+    if not material or not material.node_tree:
+        return (material.name if material else "",)
+
+    nodes = []
+    engine_nodes = set()
+    for node in material.node_tree.nodes:
+        if _is_engine_node(node):
+            engine_nodes.add(node.name)
+            continue
+        inputs = tuple(
+            (socket.identifier, _value_signature(socket.default_value))
+            for socket in node.inputs
+            if not socket.is_linked and hasattr(socket, 'default_value')
+        )
+        image = getattr(node, 'image', None)
+        group = getattr(node, 'node_tree', None)
+        nodes.append((
+            node.bl_idname,
+            node.name,
+            node.mute,
+            _node_settings(node),
+            inputs,
+            (image.name, image.filepath) if image else None,
+            group.name if group else None,
+        ))
+
+    links = tuple(sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in material.node_tree.links
+        if link.from_node.name not in engine_nodes and link.to_node.name not in engine_nodes
+    ))
+    return (material.name, tuple(sorted(nodes, key=lambda node: node[1])), links)
+
+def uv_digest(obj, uv_name):
+    """Hash the UV map a bake reads
+
+    A missing map is hashed as the active one, which it is created as a copy of.
+    """
+    uv_layers = obj.data.uv_layers
+    uv_layer = (uv_layers.get(uv_name) if uv_name else None) or uv_layers.active
+    if not uv_layer:
+        return ""
+    uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    return hashlib.blake2b(uvs.tobytes(), digest_size=8).hexdigest()
+
+def _digest(value):
+    """Short hash of a signature"""
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+def job_parts(scene, objects, uv_name, bake_type, width, height):
+    """Hash each part of what a pass bake of objects reads (the source object too for selected-to-active)
+
+    Proxies are hashed as the objects they stand in for. Returns part name ->
+    digest; job_key() combines them.
+    """
+    objects = [proxy_source(obj) for obj in objects]
+    return {
+        "pass": f"{bake_type} {width}x{height}",
+        "settings": _digest((
+            tuple(_value_signature(_read_setting(scene, path)) for path in BAKE_SETTING_PATHS),
+            scene.render.bake.cage_object.name if scene.render.bake.cage_object else "",
+        )),
+        "geometry": _digest(tuple(bake_input_hash(obj) for obj in objects)),
+        "uvs": _digest(tuple(uv_digest(obj, uv_name) for obj in objects)),
+        "materials": _digest(tuple(
+            tuple(material_signature(slot.material) for slot in obj.material_slots) for obj in objects
+        )),
+    }
+
+def job_key(parts):
+    """Combine job_parts() into the key a pass is cached under"""
+    return _digest(sorted(parts.items()))
+
+def _read_setting(scene, path):
+    """Read one setting by path from the scene"""
+    owner_path, attr_name = path.rsplit('.', 1)
+    return getattr(scene.path_resolve(owner_path), attr_name)
+
+class PassCache:
+    """Raw pass buffers of one output folder
+
+    Each entry (object, material or atlas, and pass) keeps only its newest
+    key, so reruns replace stale buffers instead of piling them up.
+    """
+    def __init__(self, root):
+        self.directory = os.path.join(root, CACHE_DIRNAME)
+        self.replayed = 0
+        self.stored = 0
+
+    def _path(self, entry, key):
+        """Get the file of an entry at a key"""
+        return os.path.join(self.directory, f"{UNSAFE_NAME_CHARACTERS.sub('_', entry)}_{key}.npy")
+
+    def _parts_path(self, entry):
+        """Get the sidecar holding the key parts of an entry's newest buffer"""
+        return os.path.join(self.directory, f"{UNSAFE_NAME_CHARACTERS.sub('_', entry)}.json")
+
+    def load(self, entry, parts):
+        """Get the cached (height, width, channels) buffer memory-mapped read-only, or None"""
+        path = self._path(entry, job_key(parts))
+        if not os.path.exists(path):
+            self._report_miss(entry, parts)
+            return None
+        try:
+            pixels = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cached pass {path}: {e}")
+            return None
+        self.replayed += 1
+        return pixels
+
+    def _report_miss(self, entry, parts):
+        """Say which parts of the key changed since the entry was stored"""
+        try:
+            with open(self._parts_path(entry), "r", encoding="utf-8") as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError):
+            print(f"No cached pass for {entry}")
+            return
+        changed = sorted(name for name, digest in parts.items() if stored.get(name) != digest)
+        print(f"Cached pass for {entry} is stale: {', '.join(changed) or 'key format'} changed")
+
+    def store(self, entry, parts, pixels):
+        """Write a raw pass buffer atomically and drop the entry's older keys"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(entry, job_key(parts))
+        temp_path = path + ".tmp"
+        buffer = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32, shape=pixels.shape)
+        buffer[...] = pixels
+        buffer.flush()
+        del buffer
+        os.replace(temp_path, path)
+        with open(self._parts_path(entry), "w", encoding="utf-8") as handle:
+            json.dump(parts, handle, indent=1, sort_keys=True)
+        self.stored += 1
+
+        pattern = glob.escape(self._path(entry, "")[:-len(".npy")]) + "?" * KEY_LENGTH + ".npy"
+        for stale in glob.glob(pattern):
+            if stale != path:
+                os.remove(stale)
+
+    def summary(self):
+        """Describe what the run replayed and stored"""
+        return f"{self.replayed} passes replayed, {self.stored} stored in {CACHE_DIRNAME}"
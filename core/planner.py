@@ -0,0 +1,145 @@
+"""
+Bake planning for BakingBakes addon
+"""
+
+def bake_uv_map_name(obj, use_bake_uv_map):
+    """Get the name of the UV map a bake of obj will use"""
+    if use_bake_uv_map:
+        return "Bake"
+    if obj.data.uv_layers:
+        return obj.data.uv_layers[0].name
+    return None
+
+def shared_bake_key(obj, use_bake_uv_map, bake_types=()):
+    """Get the key identifying objects whose bakes are interchangeable
+
+    Objects match when they share the mesh datablock, the effective material in
+    every slot, the bake UV map and mirroring. Objects with geometry nodes keep
+    their own key, since node inputs can differ per instance. Lit passes see
+    each object's surroundings, so when bake_types has any, objects only match
+    at the same world placement.
+    """
+    if obj.type != 'MESH':
+        return (obj,)
+
+    modifiers = []
+    for modifier in obj.modifiers:
+        if not modifier.show_render:
+            continue
+        if modifier.type == 'NODES':
+            return (obj,)
+        modifiers.append(modifier_signature(modifier))
+
+    return (
+        obj.data,
+        tuple(slot.material for slot in obj.material_slots),
+        bake_uv_map_name(obj, use_bake_uv_map),
+        obj.matrix_world.is_negative,
+        tuple(modifiers),
+        _placement(obj) if any(pass_batch(bake_type) == 'LIT' for bake_type in bake_types) else None,
+    )
+
+def _placement(obj):
+    """Get a hashable form of obj's world matrix"""
+    return tuple(tuple(round(value, 6) for value in row) for row in obj.matrix_world)
+
+# Modifier properties that only affect the interface or are rewritten by evaluation
+MODIFIER_IGNORED_PROPERTIES = {
+    'rna_type', 'name', 'show_expanded', 'is_active', 'show_viewport', 'show_in_editmode',
+    'show_on_cage', 'execution_time', 'is_override_data', 'persistent_uid',
+}
+
+def modifier_signature(modifier):
+    """Get a hashable summary of a modifier's settings that is stable across sessions
+
+    Datablock settings (target objects, textures) count by name; simulation
+    settings structs and interface state are left out. Geometry nodes
+    modifiers also count their input values.
+    """
+    values = [modifier.type]
+    for prop in modifier.bl_rna.properties:
+        if prop.identifier in MODIFIER_IGNORED_PROPERTIES or prop.type == 'COLLECTION':
+            continue
+        value = getattr(modifier, prop.identifier, None)
+        if prop.type == 'POINTER':
+            value = getattr(value, 'name_full', None)
+        elif isinstance(value, set):
+            value = tuple(sorted(value))
+        elif hasattr(value, '__len__') and not isinstance(value, str):
+            value = tuple(value)
+        values.append((prop.identifier, value))
+
+    # Geometry nodes inputs are ID properties on the modifier, not RNA properties
+    if modifier.type == 'NODES':
+        values.extend((key, _id_property_value(modifier[key])) for key in sorted(modifier.keys()))
+    return tuple(values)
+
+def _id_property_value(value):
+    """Get a hashable, session-stable form of an ID property value"""
+    if hasattr(value, 'name_full'):
+        return value.name_full
+    if hasattr(value, 'to_list'):
+        return tuple(value.to_list())
+    if hasattr(value, 'to_dict'):
+        return tuple(sorted((key, repr(item)) for key, item in value.to_dict().items()))
+    return value
+
+def group_linked_duplicates(objects, use_bake_uv_map, bake_types=()):
+    """Group objects that would produce identical bakes of bake_types
+
+    Returns (representative, duplicates) pairs in the original list order. Only
+    the representative needs a Cycles run; outputs are named after materials, so
+    duplicates already share the representative's images.
+    """
+    groups = {}
+    order = []
+
+    for obj in objects:
+        if not obj:
+            continue
+
+        key = shared_bake_key(obj, use_bake_uv_map, bake_types)
+        if key not in groups:
+            groups[key] = (obj, [])
+            order.append(key)
+        else:
+            groups[key][1].append(obj)
+
+    return [groups[key] for key in order]
+
+# Scene configuration batches, in the order they are baked
+PASS_BATCHES = ('SURFACE', 'DATA', 'LIT')
+
+# Bake types outside these sets read material channels only ('SURFACE')
+PASS_BATCH_TYPES = {
+    'DATA': {'NORMAL', 'UV', 'BUMP'},
+    'LIT': {'AO', 'SHADOW', 'ENVIRONMENT'},
+}
+
+def pass_batch(bake_type):
+    """Get the configuration batch a bake type belongs to"""
+    for batch, bake_types in PASS_BATCH_TYPES.items():
+        if bake_type in bake_types:
+            return batch
+    return 'SURFACE'
+
+def pass_configuration(bake_type, bake_settings, selected_to_active=False):
+    """Get the render settings a bake type needs, keyed by path from the scene"""
+    samples = bake_settings.lit_samples if pass_batch(bake_type) == 'LIT' else 1
+    return {
+        'cycles.samples': samples,
+        'render.bake.use_selected_to_active': selected_to_active,
+    }
+
+def order_bake_jobs(jobs, batches=PASS_BATCHES):
+    """Sort (material, bake_type, suffix) jobs so passes sharing a configuration are adjacent
+
+    Only jobs in batches are kept. Runs over several objects call this once
+    per batch for every object, so each configuration is applied once per
+    run rather than once per object. The sort is stable, so materials and
+    passes keep their order within a batch.
+    """
+    return sorted(
+        (job for job in jobs if pass_batch(job[1]) in batches),
+        key=lambda job: PASS_BATCHES.index(pass_batch(job[1]))
+    )
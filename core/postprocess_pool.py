@@ -0,0 +1,276 @@
+"""
+Post-processing pool for BakingBakes addon
+
+Padding, resizing, packing, inverting and encoding hundreds of 4K maps with
+NumPy keeps Blender's main thread busy long after Cycles has finished. The
+pool runs that work in background Python processes (postprocess_worker.py),
+one per core by default, so the main thread only bakes, copies pixels and
+writes files that have to go through Blender images.
+
+The main thread copies a pass buffer into a shared memory block once
+(SharedBuffer) and submits tasks reading it: a list of steps (margin,
+resample, recipe nodes, encode) the worker runs on the mapped block without
+copying it. A task ending in a 'return' step hands its finished buffer back
+through another block, which its callbacks read in place. Completion
+callbacks run on the main thread whenever it submits more work or waits, so
+bookkeeping such as the output store never runs concurrently.
+
+Steps that read bpy cannot run here: coverage masks and margin indices are
+computed on the main thread and shared as constants, and PNG and the recipe
+formats are saved from returned buffers through Blender images.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "postprocess_worker.py")
+RESULT_PREFIX = "BAKINGBAKES_POSTPROCESS "
+
+def default_workers():
+    """Get the worker count for 'automatic': one per core, leaving one for Blender"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+class SharedBuffer:
+    """An array copied into shared memory once, for any number of tasks to read
+
+    The owner calls release() once it submitted every task reading it; the
+    block is freed when the last of those tasks finishes. writer is the task
+    changing the buffer in place, if any; tasks reading the buffer are only
+    handed out after it.
+    """
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self.block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self.block.buf)
+        self.array[...] = array
+        self.users = 1
+        self.writer = None
+
+    @property
+    def shape(self):
+        """Shape of the shared array"""
+        return self.array.shape
+
+    def describe(self):
+        """Get what a worker needs to map the buffer: [block name, shape, dtype]"""
+        return [self.block.name, list(self.array.shape), self.array.dtype.str]
+
+    def acquire(self):
+        """Keep the buffer for one more reader"""
+        self.users += 1
+
+    def release(self):
+        """Drop one reader, freeing the block after the last"""
+        self.users -= 1
+        if self.users == 0:
+            # The view must let go of the mapping before it can be closed
+            self.array = None
+            self.block.close()
+            self.block.unlink()
+
+class PendingTask:
+    """A task handed to the pool, finished by its callbacks on the main thread"""
+    def __init__(self, task_id, description):
+        self.id = task_id
+        self.description = description
+        self.callbacks = []
+        self.result = None
+
+    def then(self, callback):
+        """Call callback(result) once the task succeeds. Returns the task
+
+        result["pixels"] holds the buffer of a 'return' step, readable only
+        while the callbacks run.
+        """
+        self.callbacks.append(callback)
+        return self
+
+class PostProcessPool:
+    """Background worker processes fed through shared memory
+
+    workers of 0 uses default_workers(). Every worker holds at most one task,
+    so submitting to a busy pool waits for a worker to finish.
+    """
+    def __init__(self, workers=0, python=None):
+        self.worker_count = workers or default_workers()
+        # Blender's bundled Python, which has NumPy
+        self.python = python or sys.executable
+        self.processes = []
+        self.idle = []
+        # Task id -> (PendingTask, SharedBuffers it reads, worker)
+        self.running = {}
+        self.results = queue.Queue()
+        # id() of a constant array -> (array, SharedBuffer), see constant()
+        self.constants = {}
+        self.next_id = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _start(self):
+        """Start the worker processes"""
+        for _ in range(self.worker_count):
+            process = subprocess.Popen(
+                [self.python, WORKER_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            threading.Thread(target=self._read_results, args=(process,), daemon=True).start()
+            self.processes.append(process)
+            self.idle.append(process)
+        print(f"Started {self.worker_count} post-processing workers")
+
+    def _read_results(self, process):
+        """Forward a worker's result lines to the main thread, then a None when it exits"""
+        for line in process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                self.results.put((process, json.loads(line[len(RESULT_PREFIX):])))
+        self.results.put((process, None))
+
+    def share(self, array):
+        """Copy an array into shared memory for tasks to read. Returns its SharedBuffer"""
+        return SharedBuffer(array)
+
+    def constant(self, array):
+        """Share an array that stays unchanged until the pool closes, once per array
+
+        Returns its description for a step (see SharedBuffer.describe()).
+        """
+        entry = self.constants.get(id(array))
+        if entry is None:
+            # Holding the array keeps its id() from being reused
+            entry = self.constants[id(array)] = (array, SharedBuffer(array))
+        return entry[1].describe()
+
+    def submit(self, steps, inputs, description=""):
+        """Run steps in a worker on inputs ({name: SharedBuffer or array})
+
+        Arrays are copied into shared memory for this task alone; the
+        'pixels' input is what the steps start from. Waits for the writers
+        of shared inputs first. Returns the PendingTask.
+        """
+        if not self.processes:
+            self._start()
+
+        shared = {}
+        for name, buffer in inputs.items():
+            if isinstance(buffer, SharedBuffer):
+                buffer.acquire()
+            else:
+                buffer = SharedBuffer(np.asarray(buffer, dtype=np.float32))
+            shared[name] = buffer
+
+        self.wait([buffer.writer for buffer in shared.values() if buffer.writer])
+        self.collect()
+        while not self.idle:
+            self._collect(block=True)
+
+        pending = PendingTask(self.next_id, description)
+        self.next_id += 1
+        task = {
+            "id": pending.id,
+            "inputs": {name: buffer.describe() for name, buffer in shared.items()},
+            "steps": steps,
+        }
+
+        process = self.idle.pop()
+        self.running[pending.id] = (pending, list(shared.values()), process)
+        process.stdin.write(json.dumps(task) + "\n")
+        process.stdin.flush()
+        return pending
+
+    def wait(self, tasks):
+        """Finish tasks, running their callbacks, before returning"""
+        while any(task.id in self.running for task in tasks):
+            self._collect(block=True)
+
+    def collect(self):
+        """Finish every task that is done, without waiting"""
+        while self._collect(block=False):
+            pass
+
+    def _collect(self, block):
+        """Finish the next result. Returns False when none was waiting"""
+        if block and not self.processes:
+            raise RuntimeError("All post-processing workers exited")
+        try:
+            process, result = self.results.get(block=block)
+        except queue.Empty:
+            return False
+
+        if result is None:
+            # The worker died; fail whatever it was running and carry on without it
+            for task_id, (pending, buffers, worker) in list(self.running.items()):
+                if worker is process:
+                    self._finish(task_id, {"error": f"worker exited with code {process.wait()}"})
+            self.processes.remove(process)
+            if process in self.idle:
+                self.idle.remove(process)
+            return True
+
+        self.idle.append(process)
+        self._finish(result["id"], result)
+        return True
+
+    def _finish(self, task_id, result):
+        """Release a task's buffers and run its callbacks if it succeeded"""
+        pending, buffers, process = self.running.pop(task_id)
+        for buffer in buffers:
+            buffer.release()
+        pending.result = result
+
+        output = None
+        if result.get("output"):
+            name, shape, dtype = result["output"]
+            output = shared_memory.SharedMemory(name=name)
+            result["pixels"] = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=output.buf)
+
+        try:
+            if result.get("error"):
+                self.failed += 1
+                print(f"Post-processing {pending.description} failed: {result['error']}")
+                return
+
+            self.completed += 1
+            for callback in pending.callbacks:
+                try:
+                    callback(result)
+                except Exception as e:
+                    self.failed += 1
+                    print(f"Finishing {pending.description} failed: {str(e)}")
+        finally:
+            if output is not None:
+                result.pop("pixels")
+                try:
+                    output.close()
+                except BufferError:
+                    # A callback kept a view; the mapping goes once that is collected
+                    pass
+                output.unlink()
+
+    def close(self):
+        """Wait for every task, run its callbacks and stop the workers"""
+        while self.running:
+            self._collect(block=True)
+        for process in self.processes:
+            process.stdin.close()
+        for process in self.processes:
+            process.wait()
+        self.processes = []
+        self.idle = []
+        for array, buffer in self.constants.values():
+            buffer.release()
+        self.constants = {}
+
+    def summary(self):
+        """Describe what the pool did"""
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"{self.completed} tasks on {self.worker_count} workers{failed}"
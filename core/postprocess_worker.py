@@ -0,0 +1,129 @@
+"""
+Post-processing worker for BakingBakes addon
+
+Run by core/postprocess_pool.py with Blender's bundled Python (no bpy):
+    python postprocess_worker.py
+
+The worker stays alive for the whole bake session. It reads one JSON task
+per line on stdin, maps the task's input buffers from shared memory without
+copying them, runs the task's steps and answers with one RESULT_PREFIX line
+on stdout. Steps only use NumPy modules of the addon, imported from the
+addon folder as a plain package so the addon itself (and bpy) is never
+loaded.
+
+Each step takes the current buffer (the 'pixels' input to start with) and
+returns the next one:
+    margin      pad UV islands in place using shared fill indices
+    resample    resize to width x height
+    recipe      evaluate recipe nodes on the inputs (keyed by bake type)
+    encode      block compress into a DDS or KTX2 file
+    return      copy the buffer into a new block for the main thread
+"""
+
+import json
+import os
+import sys
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import block_compression, imaging, recipes
+
+RESULT_PREFIX = "BAKINGBAKES_POSTPROCESS "
+
+def untrack(block):
+    """Keep the resource tracker from unlinking a block the pool owns when the worker exits"""
+    if os.name == 'posix':
+        resource_tracker.unregister(block._name, "shared_memory")
+
+def attach(description, blocks):
+    """Map a shared array from its [block name, shape, dtype] description"""
+    name, shape, dtype = description
+    block = shared_memory.SharedMemory(name=name)
+    untrack(block)
+    blocks.append(block)
+    return np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=block.buf)
+
+def as_key(value):
+    """Turn a recipe node key read from JSON back into nested tuples"""
+    if isinstance(value, list):
+        return tuple(as_key(part) for part in value)
+    return value
+
+def run_margin(step, pixels, inputs, blocks, result):
+    """Pad UV islands outward, see imaging.margin_fill_indices()"""
+    fill = (attach(step["targets"], blocks), attach(step["sources"], blocks))
+    return imaging.apply_margin(pixels, fill)
+
+def run_resample(step, pixels, inputs, blocks, result):
+    """Resize the buffer"""
+    return imaging.resample(pixels, step["width"], step["height"])
+
+def run_recipe(step, pixels, inputs, blocks, result):
+    """Evaluate recipe nodes in order and continue with the last one's buffer"""
+    nodes = [as_key(node) for node in step["nodes"]]
+    return recipes.evaluate_nodes(nodes, inputs)[nodes[-1]]
+
+def run_encode(step, pixels, inputs, blocks, result):
+    """Block compress the buffer into a DDS or KTX2 file"""
+    result["bytes"] = block_compression.write_compressed(
+        step["path"],
+        pixels,
+        step["container"],
+        step["codec"],
+        generate_mips=step["generate_mips"],
+        srgb=step["srgb"]
+    )
+    return pixels
+
+def run_return(step, pixels, inputs, blocks, result):
+    """Hand the buffer back in a new block, which the pool frees after its callbacks"""
+    pixels = np.ascontiguousarray(pixels, dtype=np.float32)
+    block = shared_memory.SharedMemory(create=True, size=max(pixels.nbytes, 1))
+    untrack(block)
+    blocks.append(block)
+    np.ndarray(pixels.shape, dtype=np.float32, buffer=block.buf)[...] = pixels
+    result["output"] = [block.name, list(pixels.shape), np.dtype(np.float32).str]
+    return pixels
+
+# Step "op" -> function(step, pixels, inputs, blocks, result) returning the next buffer
+STEPS = {
+    'margin': run_margin,
+    'resample': run_resample,
+    'recipe': run_recipe,
+    'encode': run_encode,
+    'return': run_return,
+}
+
+def send_result(result):
+    """Write a result line for the pool"""
+    sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+    sys.stdout.flush()
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        task = json.loads(line)
+        blocks = []
+        try:
+            inputs = {name: attach(description, blocks) for name, description in task["inputs"].items()}
+            pixels = inputs.get("pixels")
+            result = {}
+            for step in task["steps"]:
+                pixels = STEPS[step["op"]](step, pixels, inputs, blocks, result)
+            send_result(dict(result, id=task["id"]))
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            send_result({"id": task["id"], "error": str(e)})
+        finally:
+            # Arrays must let go of the mappings before they can be closed
+            inputs = pixels = None
+            for block in blocks:
+                block.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Progressive preview bakes for BakingBakes addon
+
+Bakes one pass at a few tiny resolutions (128, then 512, then the full bake
+resolution) with a single sample, so cage and ray distance changes can be
+judged in seconds. Each material gets one reused preview image node, wired
+through an emission shader into its own material output targeting EEVEE.
+Material Preview renders from that output while Cycles bakes keep reading
+the material's own output, so results appear in the material preview as
+soon as each step finishes without feeding back into the next step.
+"""
+
+import bpy
+
+from . import bake_list
+
+PREVIEW_NODE_NAME = "BakingBakes Preview"
+PREVIEW_EMISSION_NAME = "BakingBakes Preview Emission"
+PREVIEW_OUTPUT_NAME = "BakingBakes Preview Output"
+# Nodes a preview adds to a material, removed together
+PREVIEW_NODE_NAMES = (PREVIEW_NODE_NAME, PREVIEW_EMISSION_NAME, PREVIEW_OUTPUT_NAME)
+PREVIEW_IMAGE_PREFIX = "BBPreview_"
+PREVIEW_STAGES = (128, 512)
+
+def preview_resolutions(full_resolution):
+    """Get the resolutions a preview steps through, ending at full_resolution"""
+    return [resolution for resolution in PREVIEW_STAGES if resolution < full_resolution] + [full_resolution]
+
+def preview_margin(bake_margin, resolution, full_resolution):
+    """Scale the bake margin down to a preview resolution, keeping at least one pixel"""
+    return max(1, round(bake_margin * resolution / full_resolution))
+
+def settings_signature(scene, objects):
+    """Snapshot everything that invalidates a running preview
+
+    Includes the bake settings, the selected-to-active ray and cage settings
+    and the transforms of the objects involved.
+    """
+    bake_objects = scene.bakingbakes_objects
+    bake_settings = scene.bakingbakes_settings
+    output_settings = scene.bakingbakes_output
+
+    return (
+        bake_settings.preview_pass,
+        bake_settings.auto_uv_bake_map,
+        output_settings.bake_width,
+        output_settings.bake_margin,
+        bake_objects.bake_selected_to_targets,
+        bake_objects.extrusion,
+        bake_objects.max_ray_distance,
+        bake_objects.use_cage,
+        bake_objects.cage_object.name if bake_objects.cage_object else "",
+        bake_objects.use_auto_cage,
+        bake_objects.auto_cage_distance_mode,
+        bake_objects.auto_cage_vertex_group,
+        bake_objects.auto_cage_margin,
+        tuple(obj.name for obj in bake_list.resolve_objects(scene, bake_objects)),
+        tuple(tuple(map(tuple, obj.matrix_world)) for obj in objects if obj),
+    )
+
+def ensure_preview_image(material, resolution):
+    """Get the preview image for material at resolution, reusing it between steps"""
+    name = f"{PREVIEW_IMAGE_PREFIX}{material.name}"
+    image = bpy.data.images.get(name)
+    if image and tuple(image.size) != (resolution, resolution):
+        image.scale(resolution, resolution)
+    if not image:
+        image = bpy.data.images.new(name=name, width=resolution, height=resolution)
+    return image
+
+def _ensure_node(nodes, name, node_type, location):
+    """Get a named preview node, creating it when missing"""
+    node = nodes.get(name)
+    if not node:
+        node = nodes.new(type=node_type)
+        node.name = name
+        node.label = "Bake Preview"
+        node.location = location
+    return node
+
+def ensure_preview_node(material, image):
+    """Make material's preview image node the active bake target and show it in Material Preview"""
+    node_tree = material.node_tree
+    nodes = node_tree.nodes
+    node = _ensure_node(nodes, PREVIEW_NODE_NAME, 'ShaderNodeTexImage', (-600, 0))
+    node.image = image
+
+    emission = _ensure_node(nodes, PREVIEW_EMISSION_NAME, 'ShaderNodeEmission', (-300, -300))
+    output = _ensure_node(nodes, PREVIEW_OUTPUT_NAME, 'ShaderNodeOutputMaterial', (0, -300))
+    # An EEVEE output wins over the material's own in Material Preview; Cycles never reads it
+    output.target = 'EEVEE'
+    output.is_active_output = True
+    if not emission.inputs['Color'].is_linked:
+        node_tree.links.new(node.outputs['Color'], emission.inputs['Color'])
+    if not output.inputs['Surface'].is_linked:
+        node_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])
+
+    nodes.active = node
+    return node
+
+def remove_preview_nodes(materials):
+    """Remove preview nodes left in materials"""
+    for material in materials:
+        if material and material.node_tree:
+            nodes = material.node_tree.nodes
+            for name in PREVIEW_NODE_NAMES:
+                node = nodes.get(name)
+                if node:
+                    nodes.remove(node)
+
+def show_preview(context):
+    """Switch Solid 3D views to Material Preview and redraw them"""
+    for area in context.screen.areas if context.screen else []:
+        if area.type != 'VIEW_3D':
+            continue
+        for space in area.spaces:
+            if space.type == 'VIEW_3D' and space.shading.type == 'SOLID':
+                space.shading.type = 'MATERIAL'
+        area.tag_redraw()
@@ -1,20 +1,60 @@
 """
 Property definitions for BakingBakes addon
+
+Only bpy is imported here: these classes are registered at startup, so the
+bake engine and its NumPy helpers must not be pulled in from this module.
 """
 
 import bpy
+from bpy.props import CollectionProperty, PointerProperty
+from bpy.types import PropertyGroup
+
+from ..presets.defaults import PRESETS
 
-class BakeObjectItem(bpy.types.PropertyGroup):
-    """Individual bake object item"""
-    object: bpy.props.PointerProperty(
+class BakeObjectItem(PropertyGroup):
+    """Individual bake object item, or a bake set resolved at bake time"""
+    source_type: bpy.props.EnumProperty(
+        name="Source",
+        items=[
+            ('OBJECT', 'Object', 'A single object'),
+            ('COLLECTION', 'Collection', 'Every mesh in a collection, resolved at bake time'),
+            ('PATTERN', 'Name Pattern', 'Every mesh whose name matches a pattern, resolved at bake time'),
+        ],
+        default='OBJECT'
+    )
+    object: PointerProperty(
         name="Object",
         type=bpy.types.Object,
         description="Object to include in baking"
     )
+    collection: PointerProperty(
+        name="Collection",
+        type=bpy.types.Collection,
+        description="Collection whose meshes are baked"
+    )
+    pattern: bpy.props.StringProperty(
+        name="Pattern",
+        description="Object name pattern, e.g. 'SM_*_LOD0'",
+        default=""
+    )
 
-class BakeObjectsList(bpy.types.PropertyGroup):
+    # Cached status of the last bake, drawn without re-querying the objects
+    last_result: bpy.props.EnumProperty(
+        name="Last Result",
+        items=[
+            ('NONE', 'Not Baked', 'Not baked yet'),
+            ('DONE', 'Baked', 'Last bake succeeded'),
+            ('FAILED', 'Failed', 'Last bake failed'),
+        ],
+        default='NONE'
+    )
+    last_message: bpy.props.StringProperty(name="Last Message", default="")
+    last_bake_time: bpy.props.StringProperty(name="Last Bake Time", default="")
+    last_hash: bpy.props.StringProperty(name="Last Hash", description="Hash of the bake inputs at the last bake", default="")
+
+class BakeObjectsList(PropertyGroup):
     """Collection of bake objects"""
-    objects: bpy.props.CollectionProperty(type=BakeObjectItem)
+    objects: CollectionProperty(type=BakeObjectItem)
     active_index: bpy.props.IntProperty(default=0)
     bake_selected_to_targets: bpy.props.BoolProperty(
         name="Bake Selected Object to Target Objects",
@@ -22,7 +62,61 @@ class BakeObjectsList(bpy.types.PropertyGroup):
         default=False
     )
 
-class BakeSettings(bpy.types.PropertyGroup):
+    # Selected to Active settings
+    use_cage: bpy.props.BoolProperty(
+        name="Use Cage",
+        description="Use cage object for baking",
+        default=False
+    )
+    cage_object: PointerProperty(
+        name="Cage Object",
+        type=bpy.types.Object,
+        description="Cage object for baking"
+    )
+    extrusion: bpy.props.FloatProperty(
+        name="Extrusion",
+        description="Extrusion distance for rays",
+        default=0.5,
+        min=0.0,
+        max=10.0
+    )
+    max_ray_distance: bpy.props.FloatProperty(
+        name="Max Ray Distance",
+        description="Maximum ray distance for baking",
+        default=0.1,
+        min=0.0,
+        max=1.0
+    )
+
+    # Auto cage settings
+    use_auto_cage: bpy.props.BoolProperty(
+        name="Auto Cage",
+        description="Generate a temporary cage per target by extruding along smoothed normals",
+        default=False
+    )
+    auto_cage_distance_mode: bpy.props.EnumProperty(
+        name="Cage Distance",
+        items=[
+            ('UNIFORM', 'Uniform', 'Extrude every vertex by the extrusion distance'),
+            ('VERTEX_GROUP', 'Vertex Group', 'Scale the extrusion distance by vertex group weights'),
+            ('SOURCE', 'Distance to Source', 'Extrude each vertex until it clears the source object'),
+        ],
+        default='UNIFORM'
+    )
+    auto_cage_vertex_group: bpy.props.StringProperty(
+        name="Vertex Group",
+        description="Vertex group on the target objects holding per-vertex extrusion weights",
+        default=""
+    )
+    auto_cage_margin: bpy.props.FloatProperty(
+        name="Cage Margin",
+        description="Extra fraction added on top of the measured distance to the source",
+        default=0.1,
+        min=0.0,
+        max=1.0
+    )
+
+class BakeSettings(PropertyGroup):
     """Bake settings with comprehensive PBR bake type toggles"""
     # Left Column
     bake_diffuse: bpy.props.BoolProperty(name="Diffuse", default=True)
@@ -69,29 +163,357 @@ class BakeSettings(bpy.types.PropertyGroup):
         default=False
     )
 
-def register_props():
-    """Register scene properties"""
-    bpy.types.Scene.bb_show_bake_objects = bpy.props.BoolProperty(
-        name="Bake Objects",
-        description="Show Bake Objects settings",
-        default=False,
+    lit_samples: bpy.props.IntProperty(
+        name="Lit Samples",
+        description="Cycles samples for AO, Shadow and Environment bakes (material channel bakes use 1)",
+        default=1,
+        min=1,
+        max=4096
+    )
+    # Derived maps
+    derive_curvature: bpy.props.BoolProperty(
+        name="Curvature",
+        description="Compute a curvature map from the baked normal map",
+        default=False
+    )
+    derive_cavity: bpy.props.BoolProperty(
+        name="Cavity",
+        description="Compute a cavity map from the baked normal map",
+        default=False
+    )
+    derive_normal_from_bump: bpy.props.BoolProperty(
+        name="Normal from Bump",
+        description="Compute a tangent-space normal map from the baked bump map",
+        default=False
+    )
+    derived_strength: bpy.props.FloatProperty(
+        name="Derived Strength",
+        description="Strength multiplier for derived maps",
+        default=1.0,
+        min=0.0,
+        soft_max=100.0
+    )
+    cavity_radius: bpy.props.IntProperty(
+        name="Cavity Radius",
+        description="Radius in pixels over which cavity is gathered",
+        default=4,
+        min=1,
+        max=64
+    )
+
+    # Recipes
+    use_recipes: bpy.props.BoolProperty(
+        name="Bake Recipes",
+        description="Bake the outputs declared by the chosen presets, sharing passes between them",
+        default=False
+    )
+    recipes: bpy.props.EnumProperty(
+        name="Recipes",
+        description="Presets whose outputs to produce",
+        items=[(key, preset['name'], preset['description']) for key, preset in PRESETS.items()],
+        options={'ENUM_FLAG'},
+        default={'GAME_ASSETS'}
+    )
+
+    # Preview
+    preview_pass: bpy.props.EnumProperty(
+        name="Preview Pass",
+        description="Pass the progressive preview bakes",
+        items=[
+            ('NORMAL', 'Normal', 'Preview the normal pass (best for judging cages)'),
+            ('DIFFUSE', 'Diffuse', 'Preview the diffuse color pass'),
+            ('ROUGHNESS', 'Roughness', 'Preview the roughness pass'),
+            ('AO', 'Ambient Occlusion', 'Preview ambient occlusion'),
+            ('EMIT', 'Emission', 'Preview the emission pass'),
+        ],
+        default='NORMAL'
+    )
+
+    # Watch mode
+    watch_debounce: bpy.props.FloatProperty(
+        name="Watch Delay",
+        description="Seconds without changes before watch mode rebakes changed objects",
+        default=1.5,
+        min=0.1,
+        max=60.0,
+        subtype='TIME'
+    )
+
+    prune_shader_graphs: bpy.props.BoolProperty(
+        name="Prune Shader Graphs",
+        description="Bake from temporary material copies with shader inputs unrelated to the current pass disconnected",
+        default=False
     )
-    bpy.types.Scene.bb_show_bake_settings = bpy.props.BoolProperty(
-        name="Bake Settings",
-        description="Show Bake Settings",
-        default=False,
+    use_evaluated_proxies: bpy.props.BoolProperty(
+        name="Cache Evaluated Meshes",
+        description="Evaluate modifier stacks once per bake session and bake from a temporary proxy mesh",
+        default=False
     )
-    bpy.types.Scene.bb_show_bake_panel = bpy.props.BoolProperty(
-        name="Bake",
-        description="Show Bake panel",
-        default=False,
+    share_linked_duplicates: bpy.props.BoolProperty(
+        name="Share Linked Duplicates",
+        description="Bake objects sharing mesh data, materials and UV map once and reuse the result. AO, shadow and environment passes are only shared at the same placement",
+        default=True
     )
 
-def unregister_props():
-    """Unregister scene properties"""
-    if hasattr(bpy.types.Scene, "bb_show_bake_objects"):
-        del bpy.types.Scene.bb_show_bake_objects
-    if hasattr(bpy.types.Scene, "bb_show_bake_settings"):
-        del bpy.types.Scene.bb_show_bake_settings
-    if hasattr(bpy.types.Scene, "bb_show_bake_panel"):
-        del bpy.types.Scene.bb_show_bake_panel
+    # Texture atlases
+    use_atlas: bpy.props.BoolProperty(
+        name="Bake Atlas",
+        description="Pack the bake UV islands of the listed objects into one shared UV layout and bake each pass once into a single texture set",
+        default=False
+    )
+    atlas_grouping: bpy.props.EnumProperty(
+        name="Atlas Grouping",
+        description="Which objects share an atlas",
+        items=[
+            ('LIST', "Whole List", "One atlas for every object in the bake list"),
+            ('ITEM', "Per List Entry", "One atlas per bake list entry, e.g. per collection"),
+        ],
+        default='LIST'
+    )
+    atlas_name: bpy.props.StringProperty(
+        name="Atlas Name",
+        description="Name atlas texture sets are saved under, followed by the list entry when grouping per entry",
+        default="Atlas"
+    )
+
+    # Scene isolation
+    isolate_bake_scene: bpy.props.BoolProperty(
+        name="Isolate Bake Scene",
+        description="Temporarily exclude objects that cannot affect the bake so Cycles only syncs relevant geometry",
+        default=False
+    )
+    occluder_radius: bpy.props.FloatProperty(
+        name="Occluder Radius",
+        description="Keep objects within this distance of the bake objects for AO, Shadow and Environment bakes",
+        default=1.0,
+        min=0.0,
+        soft_max=100.0,
+        unit='LENGTH'
+    )
+
+    cache_raw_passes: bpy.props.BoolProperty(
+        name="Cache Raw Passes",
+        description="Keep every baked pass as a raw .npy buffer in the output folder so Replay can re-export without Cycles",
+        default=False
+    )
+    use_tuning_profile: bpy.props.BoolProperty(
+        name="Use Tuning Profile",
+        description="Apply this machine's calibrated Cycles device, thread and tile settings to each pass",
+        default=True
+    )
+
+    # Isolated bake processes
+    use_isolated_jobs: bpy.props.BoolProperty(
+        name="Isolated Processes",
+        description="Bake objects in child Blender processes with a timeout and memory limit, so a crash only fails that job",
+        default=False
+    )
+    isolated_batch_size: bpy.props.IntProperty(
+        name="Batch Size",
+        description="Objects baked per child process",
+        default=4,
+        min=1,
+        max=256
+    )
+    isolated_timeout: bpy.props.FloatProperty(
+        name="Timeout",
+        description="Seconds a child process may run, including Blender startup",
+        default=1800.0,
+        min=10.0,
+        subtype='TIME'
+    )
+    isolated_memory_limit: bpy.props.IntProperty(
+        name="Memory Limit (MB)",
+        description="Kill a child process whose resident memory exceeds this (0 for no limit)",
+        default=0,
+        min=0
+    )
+    isolated_retries: bpy.props.IntProperty(
+        name="Retries",
+        description="Retries for a job whose process crashed, timed out or ran out of memory",
+        default=1,
+        min=0,
+        max=10
+    )
+    isolated_backoff: bpy.props.FloatProperty(
+        name="Backoff",
+        description="Seconds to wait before the first retry, doubling with each further retry",
+        default=5.0,
+        min=0.0,
+        subtype='TIME'
+    )
+
+# Single-channel passes that make sense in a packed color attribute
+PACKABLE_BAKE_TYPES = [
+    ('AO', 'Ambient Occlusion'),
+    ('ROUGHNESS', 'Roughness'),
+    ('METALNESS', 'Metalness'),
+    ('SPECULAR', 'Specular'),
+    ('ALPHA', 'Alpha'),
+    ('SHADOW', 'Shadow'),
+    ('EMISSION_STRENGTH', 'Emission Strength'),
+    ('CLEARCOAT', 'Clearcoat'),
+    ('CLEARCOAT_ROUGHNESS', 'Clearcoat Roughness'),
+    ('TRANSMISSION_ROUGHNESS', 'Transmission Roughness'),
+    ('BUMP', 'Bump'),
+]
+
+# Pack channel choices for color attribute bakes
+VERTEX_PACK_ITEMS = [('NONE', 'None', 'Leave this channel empty')] + [
+    (bake_type, label, f"Pack the {label} pass into this channel")
+    for bake_type, label in PACKABLE_BAKE_TYPES
+]
+
+class OutputSettings(PropertyGroup):
+    """Output settings for baking resolution and format"""
+    bake_target: bpy.props.EnumProperty(
+        name="Bake Target",
+        items=[
+            ('IMAGE_TEXTURES', 'Image Textures', 'Bake into images saved next to the .blend'),
+            ('VERTEX_COLORS', 'Color Attributes', 'Bake into mesh color attributes, one per pass, writing no files'),
+        ],
+        default='IMAGE_TEXTURES'
+    )
+
+    # Color attribute target
+    vertex_color_domain: bpy.props.EnumProperty(
+        name="Domain",
+        items=[
+            ('CORNER', 'Face Corner', 'Store a color per face corner (keeps hard seams)'),
+            ('POINT', 'Vertex', 'Store a color per vertex (smaller, blends across seams)'),
+        ],
+        default='CORNER'
+    )
+    vertex_color_pack: bpy.props.BoolProperty(
+        name="Pack Channels",
+        description="Also pack grayscale passes into one color attribute, one pass per channel",
+        default=False
+    )
+    vertex_pack_r: bpy.props.EnumProperty(name="R", items=VERTEX_PACK_ITEMS, default='AO')
+    vertex_pack_g: bpy.props.EnumProperty(name="G", items=VERTEX_PACK_ITEMS, default='ROUGHNESS')
+    vertex_pack_b: bpy.props.EnumProperty(name="B", items=VERTEX_PACK_ITEMS, default='METALNESS')
+    vertex_pack_a: bpy.props.EnumProperty(name="A", items=VERTEX_PACK_ITEMS, default='NONE')
+
+    # Bake resolution (high-res for baking)
+    bake_width: bpy.props.IntProperty(
+        name="Bake Width",
+        description="Width for baking resolution",
+        default=1024,
+        min=256,
+        max=8192
+    )
+    bake_height: bpy.props.IntProperty(
+        name="Bake Height",
+        description="Height for baking resolution",
+        default=1024,
+        min=256,
+        max=8192
+    )
+
+    # Output resolution (final texture size)
+    output_width: bpy.props.IntProperty(
+        name="Output Width",
+        description="Final output texture width",
+        default=1024,
+        min=256,
+        max=8192
+    )
+    output_height: bpy.props.IntProperty(
+        name="Output Height",
+        description="Final output texture height",
+        default=1024,
+        min=256,
+        max=8192
+    )
+
+    # File format
+    file_format: bpy.props.EnumProperty(
+        name="File Format",
+        items=[
+            ('PNG', 'PNG', 'Uncompressed PNG saved by Blender'),
+            ('DDS', 'DDS', 'Block-compressed DDS, codec chosen per pass'),
+            ('KTX2', 'KTX2', 'Block-compressed KTX2, codec chosen per pass'),
+        ],
+        default='PNG'
+    )
+    color_codec: bpy.props.EnumProperty(
+        name="Color Codec",
+        description="Codec for color passes (normals always use BC5, grayscale passes BC4)",
+        items=[
+            ('BC7', 'BC7', 'Higher quality color with alpha, 8 bits per pixel'),
+            ('BC1', 'BC1', 'Smaller color without alpha, 4 bits per pixel'),
+        ],
+        default='BC7'
+    )
+    generate_mips: bpy.props.BoolProperty(
+        name="Mipmaps",
+        description="Store a full mip chain in compressed files",
+        default=True
+    )
+    use_postprocess_pool: bpy.props.BoolProperty(
+        name="Background Post-Processing",
+        description="Pad, resize, pack and encode outputs in background processes fed through shared memory, so Blender only bakes and saves files meanwhile. Bake images then keep the raw pass unless saved as PNG",
+        default=False
+    )
+    postprocess_workers: bpy.props.IntProperty(
+        name="Processes",
+        description="Background post-processing processes (0 uses one per core, leaving one for Blender)",
+        default=0,
+        min=0,
+        max=64
+    )
+
+    # Where saved bake images live
+    storage_policy: bpy.props.EnumProperty(
+        name="Image Storage",
+        items=[
+            ('EXTERNAL', 'External Files', 'Reference saved bakes by relative path and reload them from disk on demand'),
+            ('PACK', 'Pack into .blend', 'Embed every saved bake in the .blend file'),
+        ],
+        default='EXTERNAL'
+    )
+
+    # Output store
+    output_store: bpy.props.EnumProperty(
+        name="Output Store",
+        description="Write each unique output once and point identical outputs at it",
+        items=[
+            ('OFF', 'Off', 'Write every output as its own file'),
+            ('HARDLINK', 'Hardlinks', 'Identical outputs are hardlinks to one stored file'),
+            ('SYMLINK', 'Symlinks', 'Identical outputs are symlinks to one stored file'),
+            ('MANIFEST', 'Manifest Only', 'Only stored files are written; outputs are listed in the manifest'),
+        ],
+        default='OFF'
+    )
+    collapse_uniform: bpy.props.BoolProperty(
+        name="Collapse Uniform Images",
+        description="Write images with a single color as tiny 4x4 texture files (the bake image in Blender keeps its size)",
+        default=False
+    )
+
+    # Margin settings
+    bake_margin: bpy.props.IntProperty(
+        name="Bake Margin",
+        description="Margin in pixels for baking",
+        default=16,
+        min=0,
+        max=64
+    )
+
+    margin_type: bpy.props.EnumProperty(
+        name="Margin Type",
+        items=[
+            ('ADJACENT_FACES', 'Adjacent Faces', 'Extend bake margin over adjacent faces'),
+            ('EXTEND', 'Extend', 'Extend bake beyond object bounds'),
+        ],
+        default='ADJACENT_FACES'
+    )
+
+    margin_mode: bpy.props.EnumProperty(
+        name="Margin Mode",
+        items=[
+            ('CYCLES', 'Cycles', 'Let Cycles generate the margin during every bake'),
+            ('POSTPROCESS', 'Post-process', 'Bake with no margin and pad UV islands afterwards (faster at high resolutions)'),
+        ],
+        default='CYCLES'
+    )
@@ -0,0 +1,122 @@
+"""
+Evaluated mesh proxies for BakingBakes addon
+
+Every bake call builds a fresh render depsgraph, so Subdivision, Multires and
+Geometry Nodes stacks are re-evaluated for every pass. A proxy holds the
+render-evaluated mesh of an object once, and bakes run against the proxy.
+"""
+
+import bpy
+
+PROXY_SUFFIX = "_BB_Proxy"
+# Custom property on a proxy naming the object it stands in for
+SOURCE_PROPERTY = "bakingbakes_proxy_source"
+
+def needs_proxy(obj):
+    """Check whether obj has a modifier stack worth caching"""
+    return obj.type == 'MESH' and any(modifier.show_render for modifier in obj.modifiers)
+
+def proxy_source(obj):
+    """Get the object a proxy stands in for, or obj itself when it is not a proxy"""
+    name = obj.get(SOURCE_PROPERTY)
+    return bpy.data.objects.get(name, obj) if name else obj
+
+def _use_render_modifier_settings(obj):
+    """Switch viewport modifier settings to their render values
+
+    The Python depsgraph evaluates with viewport settings, while Cycles bakes
+    with render settings. Returns the values needed to switch back.
+    """
+    previous = []
+    for modifier in obj.modifiers:
+        values = {'show_viewport': modifier.show_viewport}
+        modifier.show_viewport = modifier.show_render
+
+        if modifier.type == 'SUBSURF':
+            values['levels'] = modifier.levels
+            modifier.levels = modifier.render_levels
+        elif modifier.type == 'MULTIRES':
+            values['levels'] = modifier.levels
+            modifier.levels = modifier.render_levels
+
+        previous.append((modifier, values))
+
+    return previous
+
+def _restore_modifier_settings(previous):
+    """Undo _use_render_modifier_settings()"""
+    for modifier, values in previous:
+        for attr_name, value in values.items():
+            setattr(modifier, attr_name, value)
+
+def create_evaluated_proxy(context, obj):
+    """Create a modifier-free object holding obj's render-evaluated mesh"""
+    previous = _use_render_modifier_settings(obj)
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        mesh = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph
+        )
+    finally:
+        _restore_modifier_settings(previous)
+
+    mesh.name = f"{obj.name}{PROXY_SUFFIX}"
+    proxy = bpy.data.objects.new(mesh.name, mesh)
+    proxy.matrix_world = obj.matrix_world.copy()
+    proxy[SOURCE_PROPERTY] = obj.name
+
+    # Object-linked materials live on the object rather than the mesh
+    for source_slot, proxy_slot in zip(obj.material_slots, proxy.material_slots):
+        if proxy_slot.material != source_slot.material:
+            proxy_slot.link = 'OBJECT'
+            proxy_slot.material = source_slot.material
+
+    context.scene.collection.objects.link(proxy)
+    return proxy
+
+class ProxyCache:
+    """Evaluated proxies created during one bake session
+
+    The original object is hidden from render while its proxy stands in for it,
+    so lit and occlusion passes do not see the geometry twice.
+    """
+    def __init__(self, context):
+        self.context = context
+        self.proxies = {}
+        self.hidden_objects = []
+
+    def get(self, obj):
+        """Get the object to bake in place of obj, creating a proxy on first use"""
+        if not obj or not needs_proxy(obj):
+            return obj
+
+        proxy = self.proxies.get(obj.name)
+        if proxy:
+            return proxy
+
+        proxy = create_evaluated_proxy(self.context, obj)
+        self.proxies[obj.name] = proxy
+        print(f"Cached evaluated mesh of {obj.name} ({len(proxy.data.polygons)} faces)")
+
+        if not obj.hide_render:
+            obj.hide_render = True
+            self.hidden_objects.append(obj)
+
+        return proxy
+
+    def clear(self):
+        """Remove all proxies and unhide their originals"""
+        for proxy in self.proxies.values():
+            mesh = proxy.data
+            bpy.data.objects.remove(proxy, do_unlink=True)
+            if mesh and mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+        for obj in self.hidden_objects:
+            obj.hide_render = False
+
+        self.proxies.clear()
+        self.hidden_objects.clear()
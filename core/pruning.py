@@ -0,0 +1,207 @@
+"""
+Shader graph pruning for BakingBakes addon
+
+Cycles compiles every node reachable from the material output, even when a
+bake only reads one channel. These helpers bake from a temporary material copy
+whose shader inputs unrelated to the current pass are disconnected.
+"""
+
+import bpy
+
+# Inputs that weigh diffuse, glossy, transmission and coat layers against each
+# other (Blender 3.x and 4.x Principled names plus the single BSDF nodes).
+# Color passes and the roughness pass (a closure weighted average) read all of them
+SURFACE_LAYER_INPUTS = {
+    'Base Color', 'Color', 'Metallic', 'Roughness', 'IOR', 'Normal', 'Tangent',
+    'Specular', 'Specular IOR Level', 'Specular Tint', 'Anisotropic', 'Anisotropic Rotation',
+    'Anisotropy', 'Rotation',
+    'Transmission', 'Transmission Weight', 'Transmission Roughness',
+    'Subsurface', 'Subsurface Weight', 'Subsurface Color', 'Subsurface Radius', 'Subsurface Scale',
+    'Radius', 'Scale',
+    'Sheen', 'Sheen Weight', 'Sheen Tint', 'Sheen Roughness',
+    'Clearcoat', 'Clearcoat Roughness', 'Clearcoat Normal',
+    'Coat Weight', 'Coat Roughness', 'Coat IOR', 'Coat Tint', 'Coat Normal',
+    'Thin Film Thickness', 'Thin Film IOR',
+}
+
+# Layers above the base attenuate its emission on Blender 4.x
+COAT_INPUTS = {
+    'Coat Weight', 'Coat Roughness', 'Coat IOR', 'Coat Tint', 'Coat Normal',
+    'Sheen Weight', 'Sheen Tint', 'Sheen Roughness',
+}
+
+# Inputs every pass reads: they scale or hide whole closures
+CLOSURE_INPUTS = {'Alpha', 'Weight', 'Fac'}
+
+# Shader node inputs each bake type reads besides CLOSURE_INPUTS; types missing
+# here are never pruned
+PASS_SHADER_INPUTS = {
+    'DIFFUSE': SURFACE_LAYER_INPUTS,
+    'GLOSSY': SURFACE_LAYER_INPUTS,
+    'TRANSMISSION': SURFACE_LAYER_INPUTS,
+    'ROUGHNESS': SURFACE_LAYER_INPUTS,
+    'NORMAL': {'Normal', 'Clearcoat Normal', 'Coat Normal', 'Tangent'},
+    'BUMP': {'Normal', 'Clearcoat Normal', 'Coat Normal', 'Tangent'},
+    'AO': {'Normal'},
+    'EMIT': {'Emission', 'Emission Color', 'Emission Strength', 'Color', 'Strength'} | COAT_INPUTS,
+    'EMISSION_STRENGTH': {'Emission Strength', 'Strength'},
+    'METALNESS': {'Metallic'},
+    'SPECULAR': {'Specular', 'Specular IOR Level'},
+    'ALPHA': set(),
+    'CLEARCOAT': {'Clearcoat', 'Coat Weight'},
+    'CLEARCOAT_ROUGHNESS': {'Clearcoat Roughness', 'Coat Roughness'},
+    'TRANSMISSION_ROUGHNESS': {'Transmission Roughness'},
+    'SUBSURFACE': {'Subsurface', 'Subsurface Weight'},
+    'SUBSURFACE_COLOR': {'Subsurface Color'},
+    'UV': set(),
+}
+
+# Every shader input name the table accounts for. A shader node with a linked
+# input outside this set (a newer Blender, a volume or hair shader) is left
+# whole, since disconnecting an input of unknown role could change the bake
+KNOWN_SHADER_INPUTS = set(CLOSURE_INPUTS).union(*PASS_SHADER_INPUTS.values())
+
+# Bake types affected by the material output's displacement (bump) input
+DISPLACEMENT_BAKE_TYPES = {'NORMAL', 'BUMP', 'AO'}
+
+# Bake types reading the closure weighted average normal. A node with a separate
+# coat normal weighs it against its base by every layer input, so it is left whole
+AVERAGE_NORMAL_BAKE_TYPES = {'NORMAL', 'BUMP', 'AO'}
+SPLIT_NORMAL_INPUTS = {'Clearcoat Normal', 'Coat Normal'}
+
+PRUNED_SUFFIX = "_BB_Pruned"
+
+def find_active_output(node_tree):
+    """Find the material output node Cycles renders from"""
+    fallback = None
+    for node in node_tree.nodes:
+        if node.type != 'OUTPUT_MATERIAL':
+            continue
+        if node.is_active_output and node.target in {'ALL', 'CYCLES'}:
+            return node
+        if fallback is None and node.target in {'ALL', 'CYCLES'}:
+            fallback = node
+    return fallback
+
+def _is_shader_node(node):
+    """Check whether a node outputs a closure (and so has per-channel inputs)"""
+    return node.type != 'GROUP' and any(output.type == 'SHADER' for output in node.outputs)
+
+def _inputs_known(node):
+    """Check whether the table knows the role of every linked input of a node"""
+    return all(
+        socket.type == 'SHADER' or socket.name in KNOWN_SHADER_INPUTS
+        for socket in node.inputs
+        if socket.is_linked
+    )
+
+def find_prunable_inputs(node_tree, bake_type):
+    """Find (node name, input index) pairs whose links do not affect bake_type
+
+    Returns None when the bake type or node tree cannot be pruned safely.
+    """
+    relevant = PASS_SHADER_INPUTS.get(bake_type)
+    if relevant is None:
+        return None
+    relevant = relevant | CLOSURE_INPUTS
+
+    output = find_active_output(node_tree)
+    if not output:
+        return None
+
+    prunable = []
+    pending = []
+
+    for index, socket in enumerate(output.inputs):
+        if not socket.is_linked:
+            continue
+        if socket.name == 'Surface' or (socket.name == 'Displacement' and bake_type in DISPLACEMENT_BAKE_TYPES):
+            pending.extend(link.from_node for link in socket.links)
+        else:
+            prunable.append((output.name, index))
+
+    visited = set()
+    while pending:
+        node = pending.pop()
+        if node.name in visited:
+            continue
+        visited.add(node.name)
+
+        shader_node = _is_shader_node(node) and _inputs_known(node)
+        if shader_node and bake_type in AVERAGE_NORMAL_BAKE_TYPES:
+            shader_node = not any(
+                socket.is_linked and socket.name in SPLIT_NORMAL_INPUTS for socket in node.inputs
+            )
+        for index, socket in enumerate(node.inputs):
+            if not socket.is_linked:
+                continue
+
+            keep = not shader_node or socket.type == 'SHADER' or socket.name in relevant
+            if keep:
+                pending.extend(link.from_node for link in socket.links)
+            else:
+                prunable.append((node.name, index))
+
+    return prunable
+
+def create_pruned_material(material, bake_type):
+    """Create a copy of material with links irrelevant to bake_type removed
+
+    Returns None when nothing would be pruned, so callers can bake the original.
+    """
+    if not material or not material.use_nodes or not material.node_tree:
+        return None
+
+    prunable = find_prunable_inputs(material.node_tree, bake_type)
+    if not prunable:
+        return None
+
+    pruned = material.copy()
+    pruned.name = f"{material.name}{PRUNED_SUFFIX}"
+    nodes = pruned.node_tree.nodes
+    links = pruned.node_tree.links
+
+    for node_name, index in prunable:
+        for link in list(nodes[node_name].inputs[index].links):
+            links.remove(link)
+
+    return pruned
+
+def use_pruned_materials(obj, bake_type, pruned_copies=None):
+    """Swap every material on obj for a copy pruned for bake_type
+
+    Returns the swaps for restore_materials(); slots that cannot be pruned keep
+    their original material. Objects baked together pass one pruned_copies
+    dict so a shared material is only copied once.
+    """
+    swaps = []
+    if pruned_copies is None:
+        pruned_copies = {}
+
+    for slot in obj.material_slots:
+        material = slot.material
+        if not material:
+            continue
+
+        if material.name not in pruned_copies:
+            pruned_copies[material.name] = create_pruned_material(material, bake_type)
+
+        pruned = pruned_copies[material.name]
+        if pruned:
+            slot.material = pruned
+            swaps.append((slot, material, pruned))
+
+    return swaps
+
+def restore_materials(swaps):
+    """Put original materials back and free the pruned copies"""
+    if not swaps:
+        return
+
+    copies = {}
+    for slot, original, pruned in swaps:
+        slot.material = original
+        copies[pruned.name] = pruned
+
+    for pruned in copies.values():
+        bpy.data.materials.remove(pruned)
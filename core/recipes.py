@@ -0,0 +1,169 @@
+"""
+Recipe planning for BakingBakes addon
+
+A recipe is a preset from presets/defaults.py that declares the texture files
+it wants ('outputs'). Several recipes are compiled into one graph of nodes,
+keyed by what they compute, so shared work collapses into a single node: each
+Cycles pass is baked once (at the largest resolution any output needs) and
+fans out to every resample, inversion, pack and encode that uses it.
+
+Node keys:
+    ('PASS', bake_type)
+    ('RESAMPLE', input, resolution)
+    ('INVERT', input)
+    ('FLIP_GREEN', input)
+    ('PACK', ((channel, input), ...))
+    ('ENCODE', input, file_format)
+"""
+
+import numpy as np
+
+from . import imaging
+
+PACK_CHANNELS = ('R', 'G', 'B', 'A')
+
+class RecipePlan:
+    """Compiled graph for a set of recipes"""
+    def __init__(self, recipe_names):
+        self.recipe_names = list(recipe_names)
+        # Node keys in dependency order (inputs always come first)
+        self.nodes = {}
+        # Largest resolution each pass is needed at
+        self.bake_resolutions = {}
+        # Encode node -> [(recipe name, output suffix)]
+        self.destinations = {}
+
+    @property
+    def bake_types(self):
+        """Bake types the plan needs from Cycles"""
+        return list(self.bake_resolutions)
+
+    def add(self, key):
+        """Add a node, sharing it if an identical node already exists"""
+        self.nodes.setdefault(key, None)
+        return key
+
+    def source(self, bake_type, resolution):
+        """Get the node providing bake_type at resolution"""
+        self.bake_resolutions[bake_type] = max(self.bake_resolutions.get(bake_type, 0), resolution)
+        return self.add(('RESAMPLE', self.add(('PASS', bake_type)), resolution))
+
+    def summary(self):
+        """Describe how much work the recipes share"""
+        requested = sum(len(destinations) for destinations in self.destinations.values())
+        return (f"{len(self.recipe_names)} recipes: {len(self.bake_resolutions)} passes, "
+                f"{len(self.destinations)} unique outputs for {requested} requested files")
+
+def compile_recipes(recipe_names):
+    """Compile recipes (preset names) into a single deduplicated RecipePlan"""
+    # Imported here so post-processing workers can load this module outside the addon
+    from ..presets.defaults import PRESETS
+
+    plan = RecipePlan(recipe_names)
+
+    for recipe_name in recipe_names:
+        if recipe_name not in PRESETS:
+            raise ValueError(f"Unknown recipe: {recipe_name}")
+
+        recipe = PRESETS[recipe_name]
+        for output in recipe.get('outputs', []):
+            resolution = output.get('resolution', recipe.get('resolution', 1024))
+            file_format = output.get('format', recipe.get('format', 'PNG'))
+
+            if 'pack' in output:
+                inputs = tuple(
+                    (channel, plan.source(output['pack'][channel], resolution))
+                    for channel in PACK_CHANNELS if channel in output['pack']
+                )
+                key = plan.add(('PACK', inputs))
+            else:
+                key = plan.source(output['source'], resolution)
+
+            if output.get('invert'):
+                key = plan.add(('INVERT', key))
+            if output.get('flip_green'):
+                key = plan.add(('FLIP_GREEN', key))
+
+            encode = plan.add(('ENCODE', key, file_format))
+            plan.destinations.setdefault(encode, []).append((recipe_name, output['suffix']))
+
+    return plan
+
+def _evaluate(key, values, buffers):
+    """Compute one node from its already evaluated inputs"""
+    op = key[0]
+
+    if op == 'PASS':
+        return buffers.get(key[1])
+
+    if op == 'PACK':
+        inputs = [(channel, values.get(input_key)) for channel, input_key in key[1]]
+        if any(pixels is None for channel, pixels in inputs):
+            return None
+        height, width = inputs[0][1].shape[:2]
+        packed = np.zeros((height, width, 4), dtype=np.float32)
+        packed[:, :, 3] = 1.0
+        for channel, pixels in inputs:
+            packed[:, :, PACK_CHANNELS.index(channel)] = pixels[:, :, 0]
+        return packed
+
+    pixels = values.get(key[1])
+    if pixels is None:
+        return None
+
+    if op == 'RESAMPLE':
+        return imaging.resample(pixels, key[2], key[2])
+    if op == 'INVERT':
+        inverted = pixels.copy()
+        inverted[:, :, :3] = 1.0 - inverted[:, :, :3]
+        return inverted
+    if op == 'FLIP_GREEN':
+        flipped = pixels.copy()
+        flipped[:, :, 1] = 1.0 - flipped[:, :, 1]
+        return flipped
+    if op == 'ENCODE':
+        return pixels
+
+    raise ValueError(f"Unsupported recipe node: {op}")
+
+def node_inputs(key):
+    """Get the node keys a node reads"""
+    if key[0] == 'PASS':
+        return []
+    if key[0] == 'PACK':
+        return [input_key for channel, input_key in key[1]]
+    return [key[1]]
+
+def output_nodes(plan, encode_key):
+    """Get the nodes an encode node needs, in dependency order and ending with it"""
+    needed = set()
+    pending = [encode_key]
+    while pending:
+        key = pending.pop()
+        if key not in needed:
+            needed.add(key)
+            pending.extend(node_inputs(key))
+    return [key for key in plan.nodes if key in needed]
+
+def evaluate_nodes(keys, buffers):
+    """Evaluate nodes given in dependency order on pass buffers. Returns {key: array or None}"""
+    values = {}
+    for key in keys:
+        values[key] = _evaluate(key, values, buffers)
+    return values
+
+def execute_plan(plan, buffers, encode):
+    """Run the plan on baked pass buffers ({bake_type: (h, w, 4) array})
+
+    encode(pixels, file_format, destinations) is called once per unique output.
+    Outputs whose passes are missing are skipped. Returns the number encoded.
+    """
+    values = evaluate_nodes(plan.nodes, buffers)
+    encoded = 0
+
+    for key in plan.nodes:
+        if key[0] == 'ENCODE' and values[key] is not None:
+            encode(values[key], key[2], plan.destinations[key])
+            encoded += 1
+
+    return encoded
@@ -0,0 +1,162 @@
+"""
+Bake session state for BakingBakes addon
+"""
+
+import os
+
+import bpy
+import numpy as np
+
+from . import estimate, imaging, tuning
+from .output_store import OutputStore
+from .postprocess_pool import PostProcessPool, SharedBuffer
+
+class BakeSession:
+    """State shared by every bake job in one bake run"""
+    def __init__(self, context, output_dir=None):
+        self.context = context
+        # Absolute folder outputs are written to; next to the .blend by default
+        # (unsaved files write relative to the working directory, like image.save())
+        self.output_dir = bpy.path.abspath(output_dir or "//") or os.getcwd()
+        # Files written this run, in order
+        self.written = []
+        # Set when selection comes from a context override (see api.py), so bakes
+        # leave the scene's selection and active object alone
+        self.selection_override = False
+        # Render settings already written, see apply_bake_configuration()
+        self.applied_config = {}
+        # UV coverage masks keyed by (object or shared mesh, UV map, width, height)
+        self.coverage_masks = {}
+        # Margin padding indices keyed like coverage masks, plus margin size
+        self.margin_fills = {}
+        # Compiled RecipePlan when baking recipes instead of individual passes
+        self.recipe_plan = None
+        # Pass buffers kept for recipes until an output's last batch is baked,
+        # keyed by (object or atlas name, output name); SharedBuffers with the pool
+        self.recipe_buffers = {}
+        # Color attributes baked so far per object name, packed with the last batch
+        self.baked_attributes = {}
+        # OutputStore shared by every output of the run, see output_store()
+        self.outputs = None
+        # Per-pass stage timings, added to the estimator's history on close()
+        self.timings = []
+        # Tuning profile entries once loaded, and the scene values they replaced
+        self.tuning = None
+        self.original_settings = {}
+        # PostProcessPool once an output needs it, see postprocess_pool()
+        self.postprocess = None
+        # Pool tasks whose callbacks write outputs, see wait_for_outputs()
+        self.output_tasks = []
+        # PassCache when raw pass buffers are kept, and whether bakes replay them
+        self.pass_cache = None
+        self.replay = False
+
+    def _layout_key(self, obj, uv_name, width, height):
+        """Key identifying one UV layout at one resolution"""
+        if isinstance(obj, (list, tuple)):
+            return tuple(self._layout_key(part, uv_name, width, height) for part in obj)
+        layout = obj.name if obj.modifiers else obj.data.name
+        return (layout, uv_name, width, height)
+
+    def coverage_mask(self, obj, uv_name, width, height):
+        """Get the UV coverage mask for obj, rasterizing it once per UV layout
+
+        obj may be a list of objects sharing one image (an atlas), whose masks
+        are combined.
+        """
+        key = self._layout_key(obj, uv_name, width, height)
+        if key not in self.coverage_masks:
+            if isinstance(obj, (list, tuple)):
+                self.coverage_masks[key] = np.logical_or.reduce(
+                    [self.coverage_mask(part, uv_name, width, height) for part in obj]
+                )
+            else:
+                self.coverage_masks[key] = imaging.uv_coverage_mask(self.context, obj, uv_name, width, height)
+        return self.coverage_masks[key]
+
+    def margin_fill(self, obj, uv_name, width, height, margin):
+        """Get margin padding indices for obj, computing them once per UV layout"""
+        key = (self._layout_key(obj, uv_name, width, height), margin)
+        if key not in self.margin_fills:
+            mask = self.coverage_mask(obj, uv_name, width, height)
+            self.margin_fills[key] = imaging.margin_fill_indices(mask, margin)
+        return self.margin_fills[key]
+
+    def output_path(self, *parts):
+        """Get the absolute path of an output file inside the output folder"""
+        return os.path.join(self.output_dir, *parts)
+
+    def output_store(self, mode):
+        """Get the run's output store in the output folder, or None when mode is 'OFF'"""
+        if mode == 'OFF':
+            return None
+        if self.outputs is None:
+            self.outputs = OutputStore(self.output_dir, mode)
+        return self.outputs
+
+    def postprocess_pool(self, output_settings):
+        """Get the run's post-processing pool, or None when outputs are post-processed in process"""
+        if not output_settings.use_postprocess_pool:
+            return None
+        if self.postprocess is None:
+            self.postprocess = PostProcessPool(output_settings.postprocess_workers)
+        return self.postprocess
+
+    def wait_for_outputs(self):
+        """Wait until pool tasks writing outputs have written them
+
+        Called when a bake call returns, so the files it wrote are all in
+        written; encodes submitted with their path already listed keep going.
+        """
+        if self.output_tasks:
+            self.postprocess.wait(self.output_tasks)
+            self.output_tasks = []
+
+    def record_timing(self, bake_type, pixels, samples, bake_seconds, post_seconds=0.0,
+                      outputs=(), file_format="", output_pixels=0):
+        """Record how long one pass took to bake and post-process, and what it wrote
+
+        bake_seconds is None for passes replayed from the pass cache.
+        """
+        self.timings.append({
+            "bake_type": bake_type,
+            "pixels": pixels,
+            "samples": samples,
+            "bake_seconds": round(bake_seconds or 0.0, 4),
+            "replayed": bake_seconds is None,
+            "post_seconds": round(post_seconds, 4),
+            "format": file_format,
+            "output_pixels": output_pixels,
+            "output_bytes": sum(os.path.getsize(path) for path in outputs if os.path.exists(path)),
+        })
+
+    def remember_settings(self, paths):
+        """Keep the current scene values of settings about to be overridden, restored on close()"""
+        paths = [path for path in paths if path not in self.original_settings]
+        self.original_settings.update(tuning.read_settings(self.context.scene, paths))
+
+    def close(self):
+        """Finish the run: restore settings, wait for background outputs, write the manifest and timing history"""
+        if self.original_settings:
+            tuning.write_settings(self.context.scene, self.original_settings)
+            self.original_settings = {}
+        # Background outputs must land before the store writes its manifest
+        if self.postprocess:
+            for buffers in self.recipe_buffers.values():
+                for buffer in buffers.values():
+                    if isinstance(buffer, SharedBuffer):
+                        buffer.release()
+            self.recipe_buffers = {}
+            self.postprocess.close()
+            self.output_tasks = []
+            print(f"Post-processing pool: {self.postprocess.summary()}")
+        if self.outputs:
+            self.outputs.close()
+            print(f"Output store: {self.outputs.summary()}")
+        if self.pass_cache:
+            print(f"Pass cache: {self.pass_cache.summary()}")
+        if self.timings:
+            try:
+                estimate.record_history(self.timings)
+            except OSError as e:
+                print(f"Could not record bake timings: {str(e)}")
@@ -0,0 +1,98 @@
+"""
+Bake image storage for BakingBakes addon
+
+Bakes used to be packed into the .blend before saving, so every baked map
+was embedded and scene files grew by gigabytes. With the external policy a
+bake image only references its file by a relative path, and its pixel
+buffer is freed once saved so Blender reloads it from disk the first time
+something draws or reads it. Images packed by earlier runs can be unpacked
+to their files or purged in bulk.
+"""
+
+import os
+
+import bpy
+
+# Custom property marking images created by the bake engine
+BAKE_IMAGE_TAG = "bakingbakes_bake"
+# Bake texture nodes are labelled "Baked {suffix}" (see setup_material_for_baking)
+BAKE_NODE_LABEL_PREFIX = "Baked "
+
+def tag_bake_image(image):
+    """Mark image as a bake output"""
+    image[BAKE_IMAGE_TAG] = True
+
+def bake_node_images():
+    """Get images held by bake texture nodes, which also finds bakes from untagged runs"""
+    images = set()
+    for material in bpy.data.materials:
+        if not material.node_tree:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image and node.label.startswith(BAKE_NODE_LABEL_PREFIX):
+                images.add(node.image)
+    return images
+
+def find_bake_images(packed_only=False):
+    """Get every bake image in the file, sorted by name"""
+    images = bake_node_images()
+    images.update(image for image in bpy.data.images if image.get(BAKE_IMAGE_TAG))
+    if packed_only:
+        images = {image for image in images if image.packed_file}
+    return sorted(images, key=lambda image: image.name)
+
+def blend_relative_path(filepath):
+    """Make filepath relative to the .blend where possible (unsaved files and other drives stay absolute)"""
+    if not bpy.data.filepath:
+        return filepath
+    try:
+        return bpy.path.relpath(filepath)
+    except ValueError:
+        return filepath
+
+def finish_saved_image(image, filepath, policy):
+    """Point a freshly saved bake image at its file according to the storage policy
+
+    'EXTERNAL' keeps only a relative path and frees the pixels (reloaded
+    lazily); 'PACK' keeps the image packed into the .blend.
+    """
+    relative_path = blend_relative_path(filepath)
+    # Setting the path reloads the image, so only do it when it moved
+    if image.filepath != relative_path:
+        image.filepath = relative_path
+    if policy == 'EXTERNAL':
+        image.buffers_free()
+
+def unpack_bake_images(images):
+    """Move packed bake images out to their files, using existing files as they are
+
+    Returns (unpacked, failed) counts.
+    """
+    unpacked = failed = 0
+    for image in images:
+        if not image.packed_file:
+            continue
+        try:
+            image.unpack(method='USE_ORIGINAL')
+            image.filepath = blend_relative_path(bpy.path.abspath(image.filepath))
+            unpacked += 1
+        except RuntimeError as e:
+            print(f"Failed to unpack {image.name}: {str(e)}")
+            failed += 1
+    return unpacked, failed
+
+def purge_bake_images(images):
+    """Remove bake images from the file, keeping any whose file is missing on disk
+
+    Bake texture nodes lose their image; the files stay where they are.
+    Returns (purged, kept) counts.
+    """
+    purged = kept = 0
+    for image in list(images):
+        if not os.path.exists(bpy.path.abspath(image.filepath)):
+            # Purging would lose the only copy of this bake
+            kept += 1
+            continue
+        bpy.data.images.remove(image)
+        purged += 1
+    return purged, kept
@@ -0,0 +1,145 @@
+"""
+Cycles tuning profiles for BakingBakes addon
+
+The best device, thread count, tiling and persistent data settings for a
+bake depend on the machine, the resolution and the pass. Calibration times
+short bakes of one object while it searches those settings one dimension at
+a time (device, then threads, then tiles, then persistent data, keeping the
+fastest of each), for every pass type and resolution bucket asked for. The
+winners are saved to a profile in Blender's user config folder named after
+the machine, so farm nodes sharing a home folder each keep their own, and
+bake sessions apply the matching entry before every pass.
+"""
+
+import json
+import os
+import platform
+import time
+
+import bpy
+
+PROFILE_PREFIX = "bakingbakes_tuning_"
+# Bake resolutions are tuned in these buckets (the smallest bucket holding the bake)
+RESOLUTION_BUCKETS = (512, 1024, 2048, 4096, 8192)
+TILE_SIZES = (256, 1024, 2048)
+
+# Settings a profile may hold, keyed by path from the scene like apply_bake_configuration()
+TUNED_SETTINGS = (
+    'cycles.device',
+    'render.threads_mode',
+    'render.threads',
+    'cycles.use_auto_tile',
+    'cycles.tile_size',
+    'render.use_persistent_data',
+)
+
+def profile_path():
+    """Get this machine's profile file"""
+    directory = bpy.utils.user_resource('CONFIG', path="bakingbakes", create=True)
+    return os.path.join(directory, f"{PROFILE_PREFIX}{platform.node() or 'local'}.json")
+
+def load_profile(path=None):
+    """Load the profile's {key: entry} table"""
+    path = path or profile_path()
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle).get("entries", {})
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable tuning profile {path}: {e}")
+        return {}
+
+def save_profile(entries, path=None):
+    """Write the profile atomically"""
+    path = path or profile_path()
+    temp_path = path + ".tmp"
+    profile = {"machine": platform.node(), "cpu_count": os.cpu_count(), "entries": entries}
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(profile, handle, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def resolution_bucket(width, height):
+    """Get the bucket a bake resolution is tuned in"""
+    size = max(width, height)
+    for bucket in RESOLUTION_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return RESOLUTION_BUCKETS[-1]
+
+def profile_key(bake_type, width, height):
+    """Get the profile entry key for a pass at a resolution"""
+    return f"{bake_type}@{resolution_bucket(width, height)}"
+
+def profile_configuration(entries, bake_type, width, height):
+    """Get the tuned settings for a pass at a resolution, or {} when it was never calibrated"""
+    entry = entries.get(profile_key(bake_type, width, height))
+    return dict(entry["config"]) if entry else {}
+
+def gpu_available():
+    """Check whether Cycles has a GPU device enabled in the preferences"""
+    cycles_addon = bpy.context.preferences.addons.get('cycles')
+    return bool(cycles_addon and cycles_addon.preferences.has_active_device())
+
+def search_dimensions():
+    """Get the candidate values of each tuned dimension, searched in order"""
+    cpus = os.cpu_count() or 1
+    thread_counts = sorted({cpus, max(1, cpus // 2), max(1, cpus // 4)}, reverse=True)
+
+    devices = [{'cycles.device': 'CPU'}]
+    if gpu_available():
+        devices.append({'cycles.device': 'GPU'})
+
+    return [
+        devices,
+        [{'render.threads_mode': 'AUTO'}] + [
+            {'render.threads_mode': 'FIXED', 'render.threads': count} for count in thread_counts
+        ],
+        [{'cycles.use_auto_tile': False}] + [
+            {'cycles.use_auto_tile': True, 'cycles.tile_size': size} for size in TILE_SIZES
+        ],
+        [{'render.use_persistent_data': False}, {'render.use_persistent_data': True}],
+    ]
+
+def read_settings(scene, paths=TUNED_SETTINGS):
+    """Read the current values of tuned settings"""
+    values = {}
+    for path in paths:
+        owner_path, attr_name = path.rsplit('.', 1)
+        values[path] = getattr(scene.path_resolve(owner_path), attr_name)
+    return values
+
+def write_settings(scene, values):
+    """Write tuned settings"""
+    for path, value in values.items():
+        owner_path, attr_name = path.rsplit('.', 1)
+        setattr(scene.path_resolve(owner_path), attr_name, value)
+
+def calibrate(scene, bake_once, repeats=1):
+    """Search the fastest settings for one pass at one resolution
+
+    bake_once() runs one bake with whatever settings are current. Each
+    dimension keeps its fastest candidate before the next is searched.
+    Returns (config, seconds).
+    """
+    # Untimed first bake, so shader compilation and scene sync are not charged to a candidate
+    bake_once()
+
+    best = {}
+    best_seconds = None
+    for candidates in search_dimensions():
+        dimension_best = None
+        for candidate in candidates:
+            write_settings(scene, {**best, **candidate})
+            seconds = min(_timed(bake_once) for _ in range(repeats))
+            if dimension_best is None or seconds < dimension_best[1]:
+                dimension_best = (candidate, seconds)
+        best.update(dimension_best[0])
+        best_seconds = dimension_best[1]
+    return best, best_seconds
+
+def _timed(function):
+    """Run function and return how long it took"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
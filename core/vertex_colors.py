@@ -0,0 +1,67 @@
+"""
+Color attribute bake targets for BakingBakes addon
+
+Cycles can bake straight into a mesh color attribute (target='VERTEX_COLORS')
+instead of an image, which skips image allocation, encoding and texture memory.
+Each pass gets its own attribute, optionally packed into a single attribute
+one grayscale pass per channel, and every attribute reads back in one
+foreach_get call for export.
+"""
+
+import numpy as np
+
+ATTRIBUTE_PREFIX = "Bake_"
+PACKED_ATTRIBUTE = "Bake_Packed"
+PACK_CHANNELS = ('R', 'G', 'B', 'A')
+
+def attribute_name(suffix):
+    """Get the color attribute a pass is baked into"""
+    return f"{ATTRIBUTE_PREFIX}{suffix}"
+
+def ensure_color_attribute(mesh, name, domain='CORNER', data_type='BYTE_COLOR'):
+    """Get a color attribute, recreating it if its domain or type changed"""
+    attribute = mesh.color_attributes.get(name)
+    if attribute and (attribute.domain != domain or attribute.data_type != data_type):
+        mesh.color_attributes.remove(attribute)
+        attribute = None
+    if not attribute:
+        attribute = mesh.color_attributes.new(name=name, type=data_type, domain=domain)
+    return attribute
+
+def set_active_color_attribute(mesh, name):
+    """Make name the color attribute Cycles bakes into"""
+    mesh.color_attributes.active_color = mesh.color_attributes[name]
+
+def read_color_attribute(mesh, name):
+    """Read a color attribute into an (elements, 4) float32 array"""
+    attribute = mesh.color_attributes[name]
+    colors = np.empty(len(attribute.data) * 4, dtype=np.float32)
+    attribute.data.foreach_get("color", colors)
+    return colors.reshape(-1, 4)
+
+def write_color_attribute(mesh, name, colors):
+    """Write an (elements, 4) array into a color attribute"""
+    attribute = mesh.color_attributes[name]
+    attribute.data.foreach_set("color", np.ascontiguousarray(colors, dtype=np.float32).ravel())
+
+def pack_color_attributes(mesh, channels, domain='CORNER', data_type='BYTE_COLOR', name=PACKED_ATTRIBUTE):
+    """Pack the first channel of several attributes into one ({channel: attribute name})
+
+    Channels without a source are left at 0, except alpha which stays opaque.
+    """
+    ensure_color_attribute(mesh, name, domain, data_type)
+    packed = np.zeros((len(mesh.color_attributes[name].data), 4), dtype=np.float32)
+    packed[:, 3] = 1.0
+
+    for channel, source in channels.items():
+        packed[:, PACK_CHANNELS.index(channel)] = read_color_attribute(mesh, source)[:, 0]
+
+    write_color_attribute(mesh, name, packed)
+    return name
+
+def export_color_attributes(mesh, names=None):
+    """Read back baked attributes as {name: (elements, 4) array} for export"""
+    if names is None:
+        names = [attribute.name for attribute in mesh.color_attributes
+                 if attribute.name.startswith(ATTRIBUTE_PREFIX)]
+    return {name: read_color_attribute(mesh, name) for name in names}
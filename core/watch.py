@@ -0,0 +1,293 @@
+"""
+Watch mode for BakingBakes addon
+
+While watching, a depsgraph update handler records which bake-list objects
+changed geometry or shading (directly or through one of their materials).
+Once no change has arrived for the debounce interval, a timer rebakes just
+those objects, so outputs stay current during lookdev without rebaking the
+whole list. Objects joining a watched collection or pattern set are picked
+up as the scene changes.
+
+Rebakes run like isolated bakes (see watchdog.py): the current state of the
+file is saved as a copy next to it and a child Blender bakes the changed
+objects from that copy, so Blender stays responsive. A timer collects the
+child's result, records each object's status on the bake list and reloads
+the rebaked images. Changes made meanwhile wait for the next rebake.
+"""
+
+import os
+import threading
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+from . import bake_list
+
+# How often a running rebake is checked for completion
+POLL_SECONDS = 0.5
+
+class WatchState:
+    """What the running watch tracks"""
+    def __init__(self):
+        self.active = False
+        self.scene_name = ""
+        self.source_name = ""
+        self.debounce = 1.0
+        # Watched object names, and material name -> names of watched objects using it
+        self.objects = set()
+        self.material_users = {}
+        # Scene object names when the bake list was last resolved
+        self.known_objects = set()
+        self.dirty = set()
+        self.last_change = 0.0
+        self.timer_pending = False
+        # Set while our own image reloads run, so their updates are not taken for edits
+        self.baking = False
+        # Running background rebake: {"thread", "names", "copy_path", "outcomes"}
+        self.job = None
+
+_state = WatchState()
+
+def is_watching():
+    """Check whether watch mode is running"""
+    return _state.active
+
+def _resolve(scene):
+    """Resolve the bake list into the watched objects and their materials"""
+    source = scene.objects.get(_state.source_name) if _state.source_name else None
+    _state.objects = set()
+    _state.material_users = {}
+    _state.known_objects = set(scene.objects.keys())
+
+    for obj in bake_list.resolve_objects(scene, scene.bakingbakes_objects):
+        if obj == source:
+            continue
+        _state.objects.add(obj.name)
+        for slot in obj.material_slots:
+            if slot.material:
+                _state.material_users.setdefault(slot.material.name, set()).add(obj.name)
+
+    # The source's shading and geometry feed every target
+    if source:
+        _state.objects.add(source.name)
+        for slot in source.material_slots:
+            if slot.material:
+                _state.material_users.setdefault(slot.material.name, set()).add(source.name)
+
+def start_watch(scene, source=None, debounce=1.0):
+    """Start watching the scene's bake list (source is the selected-to-active high poly)"""
+    _state.active = True
+    _state.scene_name = scene.name
+    _state.source_name = source.name if source else ""
+    _state.debounce = debounce
+    _state.dirty = set()
+    _resolve(scene)
+
+def stop_watch():
+    """Stop watching and drop pending changes (a running rebake still finishes)"""
+    _state.active = False
+    _state.dirty = set()
+    if bpy.app.timers.is_registered(_rebake_when_idle):
+        bpy.app.timers.unregister(_rebake_when_idle)
+    _state.timer_pending = False
+
+def _schedule(interval):
+    """Run the rebake timer after interval unless it is already waiting"""
+    if not _state.timer_pending:
+        _state.timer_pending = True
+        bpy.app.timers.register(_rebake_when_idle, first_interval=interval)
+
+def _mark_dirty(names):
+    """Record changed objects and push the debounce deadline back"""
+    if _state.source_name in names:
+        names = _state.objects - {_state.source_name}
+    _state.dirty |= names
+    _state.last_change = time.time()
+    _schedule(_state.debounce)
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """depsgraph_update_post handler collecting changed bake objects"""
+    if not _state.active or _state.baking or scene.name != _state.scene_name:
+        return
+
+    # Objects added, renamed or moved between collections can change what the bake sets resolve to
+    restructured = any(
+        isinstance(update.id, (bpy.types.Collection, bpy.types.Scene))
+        or (isinstance(update.id, bpy.types.Object) and update.id.original.name not in _state.known_objects)
+        for update in depsgraph.updates if update.id
+    )
+    if restructured:
+        watched = _state.objects
+        _resolve(scene)
+        added = _state.objects - watched
+        if added:
+            _mark_dirty(added)
+
+    changed = set()
+    for update in depsgraph.updates:
+        id_data = update.id.original if update.id else None
+        if isinstance(id_data, bpy.types.Object):
+            if id_data.name in _state.objects and (update.is_updated_geometry or update.is_updated_shading):
+                changed.add(id_data.name)
+        elif isinstance(id_data, bpy.types.Material):
+            if update.is_updated_shading:
+                changed |= _state.material_users.get(id_data.name, set())
+
+    if changed:
+        _mark_dirty(changed)
+
+def _rebake_when_idle():
+    """Timer callback: wait out the debounce and any running rebake, then rebake dirty objects"""
+    if not _state.active:
+        _state.timer_pending = False
+        return None
+
+    remaining = _state.last_change + _state.debounce - time.time()
+    if remaining > 0:
+        return remaining
+    if _state.job:
+        return POLL_SECONDS
+
+    _state.timer_pending = False
+    dirty, _state.dirty = _state.dirty, set()
+    if dirty:
+        rebake(dirty)
+    return None
+
+def rebake(names):
+    """Start a background rebake of the named bake-list objects
+
+    Returns False when the file is unsaved or the scene is gone; saved files
+    are needed so the child writes outputs where an in-process bake would.
+    """
+    from . import watchdog
+
+    scene = bpy.data.scenes.get(_state.scene_name)
+    if not scene or not bpy.data.filepath:
+        print("Watch: save the file to rebake in the background")
+        return False
+
+    # Selected-to-active bakes take their source from the selection saved with the copy
+    source = scene.objects.get(_state.source_name) if _state.source_name else None
+    if source:
+        for obj in scene.objects:
+            obj.select_set(obj == source)
+
+    directory, filename = os.path.split(bpy.data.filepath)
+    copy_path = os.path.join(directory, f".{os.path.splitext(filename)[0]}_watch.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=copy_path, copy=True)
+
+    bake_settings = scene.bakingbakes_settings
+    policy = watchdog.WatchdogPolicy(
+        timeout=bake_settings.isolated_timeout,
+        max_rss_mb=bake_settings.isolated_memory_limit,
+        retries=bake_settings.isolated_retries,
+        backoff=bake_settings.isolated_backoff
+    )
+    job = {"file": copy_path, "objects": sorted(names)}
+    blender = bpy.app.binary_path
+    addon = __package__.split(".")[0]
+    outcomes = []
+
+    # The watchdog needs no bpy, so it can wait on the child off the main thread
+    def run():
+        outcomes.extend(watchdog.run_job(job, blender, addon, policy))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    _state.job = {"thread": thread, "names": names, "copy_path": copy_path, "outcomes": outcomes}
+    bpy.app.timers.register(_collect_rebake, first_interval=POLL_SECONDS)
+
+    print(f"Watch: rebaking {', '.join(sorted(names))} in the background")
+    return True
+
+def _collect_rebake():
+    """Timer callback: once the background rebake ends, record statuses and reload its images"""
+    job = _state.job
+    if not job:
+        return None
+    if job["thread"].is_alive():
+        return POLL_SECONDS
+
+    _state.job = None
+    if os.path.exists(job["copy_path"]):
+        os.remove(job["copy_path"])
+
+    scene = bpy.data.scenes.get(_state.scene_name)
+    if not scene:
+        return None
+
+    resolved = bake_list.resolve_items(scene, scene.bakingbakes_objects)
+    status = bake_list.StatusRecorder(resolved)
+    by_name = {obj.name: obj for obj, item in resolved}
+    baked = []
+    for names, result in job["outcomes"]:
+        if result["status"] == "split":
+            continue
+        object_results = result.get("objects", {})
+        for name in names:
+            success, message = object_results.get(name, (False, result.get("error") or "Not baked"))
+            if name in by_name:
+                status.record(by_name[name], success, message)
+            if success:
+                baked.append(name)
+            else:
+                print(f"Watch: rebake of {name} failed: {message}")
+    status.finish()
+
+    _state.baking = True
+    try:
+        reloaded = reload_baked_images(scene, baked, scene.bakingbakes_output)
+        # Evaluate what the reloads tagged now, while their updates are still ignored
+        bpy.context.view_layer.update()
+    finally:
+        _state.baking = False
+
+    print(f"Watch: rebaked {len(baked)} of {len(job['names'])} objects, reloaded {reloaded} images")
+    return None
+
+def reload_baked_images(scene, names, output_settings):
+    """Reload the bake images on the named objects' materials from the files a child wrote
+
+    Images that were never saved are pointed at the PNG the child wrote for
+    them, when there is one. Returns the number of images reloaded.
+    """
+    from . import storage
+
+    materials = {
+        slot.material for name in names if scene.objects.get(name)
+        for slot in scene.objects[name].material_slots if slot.material and slot.material.node_tree
+    }
+    images = {
+        node.image for material in materials for node in material.node_tree.nodes
+        if node.type == 'TEX_IMAGE' and node.image and node.label.startswith(storage.BAKE_NODE_LABEL_PREFIX)
+    }
+
+    reloaded = 0
+    for image in images:
+        if not image.filepath and output_settings.file_format == 'PNG':
+            written = bpy.path.abspath(f"//{image.name}.png")
+            if os.path.exists(written):
+                image.source = 'FILE'
+                image.filepath = storage.blend_relative_path(written)
+                reloaded += 1
+            continue
+        if image.filepath and os.path.exists(bpy.path.abspath(image.filepath)):
+            image.reload()
+            reloaded += 1
+    return reloaded
+
+def register():
+    """Install the depsgraph handler"""
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+
+def unregister():
+    """Stop watching and remove the depsgraph handler"""
+    stop_watch()
+    if bpy.app.timers.is_registered(_collect_rebake):
+        bpy.app.timers.unregister(_collect_rebake)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
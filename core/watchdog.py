@@ -0,0 +1,164 @@
+"""
+Job watchdog for BakingBakes addon
+
+Runs bake jobs in child Blender processes (see library_worker.py), so a hang
+or native crash inside Cycles only costs that job instead of the whole run.
+Every attempt gets a wall-clock timeout and a resident memory cap; a child
+that exceeds either, or dies without answering, is killed and its job is
+retried with exponential backoff. Batches that fail that way are retried one
+object at a time, so a single bad mesh cannot keep the rest of its batch
+from baking. Runs without bpy.
+"""
+
+import collections
+import json
+import os
+import subprocess
+import threading
+import time
+
+from .library import RESULT_PREFIX, WORKER_SCRIPT
+
+REPORT_FILENAME = ".bakingbakes_run_report.json"
+# How often a running child is checked against its limits
+POLL_SECONDS = 0.5
+# Child output lines kept for the report when a child dies
+OUTPUT_TAIL_LINES = 20
+
+class WatchdogPolicy:
+    """Limits and retries for child bake processes
+
+    timeout is in seconds and includes Blender startup and file loading;
+    max_rss_mb of 0 disables the memory cap. A failed attempt waits
+    backoff * 2 ** (attempt - 1) seconds before the next one.
+    """
+    def __init__(self, timeout=1800.0, max_rss_mb=0, retries=1, backoff=5.0):
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.retries = retries
+        self.backoff = backoff
+
+def process_rss_mb(pid):
+    """Get the resident memory of a process in MB, or None when it cannot be read"""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # Other platforms need psutil, which is optional
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+def run_attempt(job, blender, addon, policy):
+    """Run one job in a fresh child Blender and watch it until it answers or is killed
+
+    Returns (result or None, attempt record).
+    """
+    start = time.time()
+    process = subprocess.Popen(
+        [blender, "-b", "--python", WORKER_SCRIPT, "--", "--addon", addon],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    process.stdin.write(json.dumps(job) + "\n")
+    process.stdin.close()
+
+    # Read output on a thread so the limits can be checked while the child is silent
+    results = []
+    tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+
+    def read_output():
+        for line in process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                results.append(json.loads(line[len(RESULT_PREFIX):]))
+            else:
+                tail.append(line.rstrip())
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+
+    reason = None
+    peak_rss = 0.0
+    while process.poll() is None:
+        rss = process_rss_mb(process.pid)
+        if rss is not None:
+            peak_rss = max(peak_rss, rss)
+        if time.time() - start > policy.timeout:
+            reason = f"timed out after {policy.timeout:g}s"
+        elif policy.max_rss_mb and rss is not None and rss > policy.max_rss_mb:
+            reason = f"exceeded memory limit ({rss:.0f} MB > {policy.max_rss_mb} MB)"
+        if reason:
+            process.kill()
+            break
+        time.sleep(POLL_SECONDS)
+
+    process.wait()
+    reader.join(timeout=5.0)
+
+    result = results[-1] if results and not reason else None
+    if result is None and not reason:
+        reason = f"Blender exited with code {process.returncode}"
+
+    attempt = {
+        "seconds": round(time.time() - start, 3),
+        "peak_rss_mb": round(peak_rss),
+        "exit_code": process.returncode,
+        "error": reason,
+    }
+    if reason:
+        attempt["output"] = list(tail)
+    return result, attempt
+
+def run_job(job, blender, addon, policy):
+    """Run a job with retries, splitting a failing batch into single objects
+
+    Returns a list of (objects, result) pairs. result has "status", "error",
+    "attempts" and, when the child answered, "objects": {name: [success, message]}.
+    A batch that was split keeps its failed attempts in a first pair with
+    status "split", followed by the pairs of its single-object retries.
+    """
+    attempts = []
+    for attempt_number in range(1, policy.retries + 2):
+        result, attempt = run_attempt(job, blender, addon, policy)
+        attempts.append(attempt)
+        if result is not None:
+            result["attempts"] = attempts
+            return [(job["objects"], result)]
+
+        print(f"Isolated bake of {', '.join(job['objects'])} failed: {attempt['error']}")
+        if attempt_number > policy.retries:
+            break
+
+        # A crashing batch most likely holds one bad object; retry the objects on their own
+        if len(job["objects"]) > 1:
+            outcomes = [(job["objects"], {"status": "split", "error": attempt["error"], "attempts": attempts})]
+            for name in job["objects"]:
+                outcomes.extend(run_job(dict(job, objects=[name]), blender, addon, policy))
+            return outcomes
+
+        time.sleep(policy.backoff * 2 ** (attempt_number - 1))
+
+    return [(job["objects"], {"status": "failed", "error": attempts[-1]["error"], "attempts": attempts})]
+
+def write_report(directory, entries):
+    """Write the run report next to the .blend atomically"""
+    path = os.path.join(directory, REPORT_FILENAME)
+    temp_path = path + ".tmp"
+    report = {
+        "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "failed": sum(1 for entry in entries if entry["status"] not in ("done", "split")),
+        "jobs": entries,
+    }
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=1)
+    os.replace(temp_path, path)
+    return path
@@ -1,10 +1,20 @@
 """
 Baking operators for BakingBakes addon
+
+These are shells: the bake engine (core/baking.py) and everything it pulls
+in are imported inside execute/invoke on first use, not at registration.
 """
 
+import os
+import subprocess
+import sys
+import time
+
 import bpy
 from bpy.types import Operator
-from core.baking import perform_multi_baking, check_uv_maps_for_objects
+
+from ..core import bake_list, preview, watch
+from ..presets.defaults import PRESETS
 
 class BAKINGBAKES_OT_BakeObjects(Operator):
     """Bake all objects in the list"""
@@ -12,52 +22,428 @@ class BAKINGBAKES_OT_BakeObjects(Operator):
     bl_label = "BAKE OBJECTS"
     bl_description = "Bake all objects in the list"
 
+    objects_filter: bpy.props.StringProperty(
+        name="Objects",
+        description="Only bake these listed objects (newline separated names, used by watch mode)",
+        default="",
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    replay: bpy.props.BoolProperty(
+        name="Replay",
+        description="Post-process and export cached raw pass buffers instead of baking; passes without a cached buffer are baked",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
+    def execute(self, context):
+        from ..core import baking
+        return baking.BakeRun(self).execute(context)
+
+class BAKINGBAKES_OT_PlanBake(Operator):
+    """Estimate the bake list's time, memory and disk use without baking"""
+    bl_idname = "bakingbakes.plan_bake"
+    bl_label = "Plan"
+    bl_description = "Expand the bake list into its jobs and estimate Cycles time, memory and output size without baking"
+
     def execute(self, context):
+        from ..core import estimate
+
+        scene = context.scene
+        source = None
+        if scene.bakingbakes_objects.bake_selected_to_targets:
+            selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+            source = selected_objects[0] if selected_objects else None
+
+        plan = estimate.plan_scene(scene, source)
+        if not plan["jobs"]:
+            self.report({'WARNING'}, "Bake list expands to no jobs")
+            return {'CANCELLED'}
+
+        table = estimate.format_plan(plan)
+        print(table)
+        if bpy.data.filepath:
+            estimate.write_plan(os.path.dirname(bpy.data.filepath), plan)
+
+        self.report({'WARNING'} if plan["over_memory"] else {'INFO'}, table.splitlines()[-1])
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_CalibrateTuning(Operator):
+    """Find the fastest Cycles settings for bakes on this machine"""
+    bl_idname = "bakingbakes.calibrate_tuning"
+    bl_label = "Calibrate Cycles"
+    bl_description = "Time short bakes of the active object across devices, thread counts and tile settings, and save the fastest per pass and resolution"
+
+    resolutions: bpy.props.EnumProperty(
+        name="Resolutions",
+        items=[(str(size), str(size), f"Calibrate bakes up to {size}px") for size in (512, 1024, 2048, 4096, 8192)],
+        default={'1024', '2048'},
+        options={'ENUM_FLAG'}
+    )
+    repeats: bpy.props.IntProperty(
+        name="Repeats",
+        description="Bakes per candidate; the fastest counts",
+        default=1,
+        min=1,
+        max=5
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        from ..core import baking, planner, tuning
+
+        scene = context.scene
+        obj = context.active_object
+        if not obj or obj.type != 'MESH' or not obj.data.uv_layers:
+            self.report({'ERROR'}, "Select a mesh object with a UV map to calibrate on")
+            return {'CANCELLED'}
+        material = next((slot.material for slot in obj.material_slots if slot.material and slot.material.node_tree), None)
+        if not material:
+            self.report({'ERROR'}, f"{obj.name} has no node material to bake")
+            return {'CANCELLED'}
+
+        passes = baking.get_selected_bakes(scene.bakingbakes_settings)
+        if not passes:
+            self.report({'WARNING'}, "No bake types selected")
+            return {'CANCELLED'}
+
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        scene.render.engine = 'CYCLES'
+        scene.render.bake.target = 'IMAGE_TEXTURES'
+        scene.render.bake.use_selected_to_active = False
+
+        original = tuning.read_settings(scene, tuning.TUNED_SETTINGS + ('cycles.samples',))
+        entries = tuning.load_profile()
+        try:
+            for resolution in sorted(int(size) for size in self.resolutions):
+                image = baking.create_bake_image(material.name, "Calibration", resolution=resolution)
+                tex_node = baking.setup_material_for_baking(material, image)
+                try:
+                    for bake_type, suffix in passes:
+                        tuning.write_settings(scene, planner.pass_configuration(bake_type, scene.bakingbakes_settings))
+                        config, seconds = tuning.calibrate(
+                            scene, lambda: baking.perform_bake_operation(bake_type), self.repeats
+                        )
+                        entries[tuning.profile_key(bake_type, resolution, resolution)] = {
+                            "config": config,
+                            "seconds": round(seconds, 3),
+                            "calibrated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        }
+                        print(f"Calibrated {bake_type} at {resolution}: {seconds:.2f}s with {config}")
+                finally:
+                    material.node_tree.nodes.remove(tex_node)
+                    bpy.data.images.remove(image)
+        finally:
+            tuning.write_settings(scene, original)
+            tuning.save_profile(entries)
+
+        self.report({'INFO'}, f"Calibrated {len(passes)} passes at {len(self.resolutions)} resolutions")
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_PreviewBake(Operator):
+    """Progressively bake a low resolution preview of the bake list"""
+    bl_idname = "bakingbakes.preview_bake"
+    bl_label = "Preview Bake"
+    bl_description = "Bake one pass at 128, 512 and full resolution with one sample, restarting whenever settings change (Esc to stop)"
+
+    def invoke(self, context, event):
+        scene = context.scene
+        bake_objects = scene.bakingbakes_objects
+
+        self._source = None
+        if bake_objects.bake_selected_to_targets:
+            selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+            if not selected_objects:
+                self.report({'ERROR'}, "No source object selected. Select high-poly object and try again.")
+                return {'CANCELLED'}
+            self._source = selected_objects[0]
+
+        if not self._targets(context):
+            self.report({'WARNING'}, "No objects in bake list")
+            return {'CANCELLED'}
+
+        from ..core.session import BakeSession
+
+        # Previews override samples, margins and ray settings; the session puts
+        # the scene's own values back when the preview ends
+        self._session = BakeSession(context)
+        self._materials = set()
+        self._auto_cages = {}
+        self._steps = []
+        self._signature = None
+        self._start(context)
+
+        self._timer = context.window_manager.event_timer_add(0.05, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._finish(context, keep_preview=False)
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Any change invalidates the running preview, so start over from the smallest size
+        if preview.settings_signature(context.scene, self._objects(context)) != self._signature:
+            print("Preview settings changed, restarting preview bake")
+            self._start(context)
+
+        if not self._steps:
+            self._finish(context, keep_preview=True)
+            return {'FINISHED'}
+
+        resolution, target = self._steps.pop(0)
+        try:
+            self._bake_step(context, target, resolution)
+        except Exception as e:
+            self.report({'ERROR'}, f"Preview bake failed for {target.name}: {str(e)}")
+            self._finish(context, keep_preview=False)
+            return {'CANCELLED'}
+
+        return {'RUNNING_MODAL'}
+
+    def _targets(self, context):
+        """Get objects the preview bakes into"""
+        scene = context.scene
+        return [obj for obj in bake_list.resolve_objects(scene, scene.bakingbakes_objects) if obj != self._source]
+
+    def _objects(self, context):
+        """Get every object whose transform affects the preview"""
+        return self._targets(context) + [self._source]
+
+    def _start(self, context):
+        """(Re)build the step queue: every target at every preview resolution"""
+        from ..core import cage
+
+        scene = context.scene
+        bake_objects = scene.bakingbakes_objects
+        self._signature = preview.settings_signature(scene, self._objects(context))
+        self._remove_auto_cages()
+        # Rebuilt cages are new objects, so every setting is written again
+        self._session.applied_config = {}
+
+        targets = self._targets(context)
+        if self._source and bake_objects.use_auto_cage:
+            for target in targets:
+                self._auto_cages[target] = cage.create_auto_cage(context, target, self._source, bake_objects)
+
+        self._steps = [
+            (resolution, target)
+            for resolution in preview.preview_resolutions(scene.bakingbakes_output.bake_width)
+            for target in targets
+        ]
+
+    def _bake_step(self, context, target, resolution):
+        """Bake the preview pass for one target at one resolution"""
+        from ..core import baking
+
         scene = context.scene
         bake_objects = scene.bakingbakes_objects
         bake_settings = scene.bakingbakes_settings
+        output_settings = scene.bakingbakes_output
+
+        for slot in target.material_slots:
+            material = slot.material
+            if material and material.node_tree:
+                preview.ensure_preview_node(material, preview.ensure_preview_image(material, resolution))
+                self._materials.add(material)
+
+        bpy.ops.object.select_all(action='DESELECT')
+        target.select_set(True)
+        context.view_layer.objects.active = target
+
+        configuration = {
+            'cycles.samples': 1,
+            'render.bake.target': 'IMAGE_TEXTURES',
+            'render.bake.margin': preview.preview_margin(
+                output_settings.bake_margin, resolution, output_settings.bake_width
+            ),
+            'render.bake.use_selected_to_active': self._source is not None,
+        }
+
+        if self._source:
+            self._source.select_set(True)
+            configuration['render.bake.cage_extrusion'] = bake_objects.extrusion
+            configuration['render.bake.max_ray_distance'] = bake_objects.max_ray_distance
+
+            auto_cage = self._auto_cages.get(target)
+            if auto_cage:
+                configuration['render.bake.use_cage'] = True
+                configuration['render.bake.cage_object'] = auto_cage
+                configuration['render.bake.cage_extrusion'] = 0.0
+            elif bake_objects.use_cage and bake_objects.cage_object:
+                configuration['render.bake.use_cage'] = True
+                configuration['render.bake.cage_object'] = bake_objects.cage_object
+            else:
+                configuration['render.bake.use_cage'] = False
+        elif bake_settings.auto_uv_bake_map and "Bake" in target.data.uv_layers:
+            target.data.uv_layers.active = target.data.uv_layers["Bake"]
+
+        self._session.remember_settings(configuration)
+        baking.apply_bake_configuration(scene, configuration, self._session.applied_config)
+
+        baking.perform_bake_operation(bake_settings.preview_pass)
+        preview.show_preview(context)
+        print(f"Preview {bake_settings.preview_pass} for {target.name} at {resolution}x{resolution}")
+
+    def _remove_auto_cages(self):
+        """Remove cages built for the current preview pass"""
+        from ..core import cage
+
+        for auto_cage in self._auto_cages.values():
+            cage.remove_auto_cage(auto_cage)
+        self._auto_cages = {}
+
+    def _finish(self, context, keep_preview):
+        """Stop the timer and undo temporary changes, keeping the preview nodes if asked"""
+        context.window_manager.event_timer_remove(self._timer)
+        self._remove_auto_cages()
+        self._session.close()
+        if not keep_preview:
+            preview.remove_preview_nodes(self._materials)
+
+class BAKINGBAKES_OT_ToggleWatch(Operator):
+    """Start or stop rebaking changed objects automatically"""
+    bl_idname = "bakingbakes.toggle_watch"
+    bl_label = "Watch"
+    bl_description = "Rebake bake list objects whose geometry or materials change, once editing pauses, in a background Blender process"
+
+    def execute(self, context):
+        scene = context.scene
+        bake_objects = scene.bakingbakes_objects
+
+        if watch.is_watching():
+            watch.stop_watch()
+            self.report({'INFO'}, "Stopped watching")
+            return {'FINISHED'}
 
         if not bake_objects.objects:
             self.report({'WARNING'}, "No objects in bake list")
             return {'CANCELLED'}
 
-        # Check UV maps if required
-        if bake_settings.auto_uv_bake_map:
-            uv_check_passed, missing_uv_objects = check_uv_maps_for_objects(bake_objects, require_bake_uv=True)
-            if not uv_check_passed:
-                missing_list = ", ".join(missing_uv_objects)
-                self.report({'ERROR'}, f"Bake UV map not found in objects: {missing_list}")
+        # Rebakes run from a copy saved next to the file
+        if not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the file before watching")
+            return {'CANCELLED'}
+
+        source = None
+        if bake_objects.bake_selected_to_targets:
+            selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+            if not selected_objects:
+                self.report({'ERROR'}, "No source object selected. Select high-poly object and try again.")
                 return {'CANCELLED'}
+            source = selected_objects[0]
 
-        # Multi-bake mode - bake all selected types for each object
-        success_count = 0
-        failed_objects = []
-        total_bakes = 0
+        watch.start_watch(scene, source, scene.bakingbakes_settings.watch_debounce)
+        self.report({'INFO'}, "Watching bake list for changes")
+        return {'FINISHED'}
 
-        for item in bake_objects.objects:
-            obj = item.object
-            if not obj:
-                continue
+class BAKINGBAKES_OT_BakeLibrary(Operator):
+    """Bake every .blend file in a directory tree with a preset"""
+    bl_idname = "bakingbakes.bake_library"
+    bl_label = "Bake Library"
+    bl_description = "Bake every .blend file under a directory in background Blender processes"
 
-            success, message = perform_multi_baking(context, obj, bake_settings)
-            if success:
-                success_count += 1
-                # Extract number of baked types from message
-                try:
-                    baked_count = int(message.split()[-2])  # "Successfully baked X types"
-                    total_bakes += baked_count
-                except:
-                    total_bakes += 1
-            else:
-                failed_objects.append(f"{obj.name}: {message}")
+    directory: bpy.props.StringProperty(
+        name="Library",
+        description="Root directory of the asset library",
+        subtype='DIR_PATH'
+    )
+    preset: bpy.props.EnumProperty(
+        name="Preset",
+        items=[(key, preset['name'], preset['description']) for key, preset in PRESETS.items()],
+    )
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        description="Number of background Blender processes",
+        default=2,
+        min=1,
+        max=64
+    )
+    collection: bpy.props.StringProperty(
+        name="Collection",
+        description="Only bake meshes in this collection (all meshes when empty)",
+        default=""
+    )
+    force: bpy.props.BoolProperty(
+        name="Rebake All",
+        description="Rebake files already marked as done in the library index",
+        default=False
+    )
+    timeout: bpy.props.FloatProperty(
+        name="Timeout",
+        description="Seconds one file may take before its Blender process is killed and restarted (0 for no limit)",
+        default=1800.0,
+        min=0.0
+    )
 
-        # Report results
-        if success_count > 0:
-            self.report({'INFO'}, f"Successfully baked {success_count} objects ({total_bakes} total maps)")
-            if failed_objects:
-                print("Failed objects:", failed_objects)
-        else:
-            self.report({'ERROR'}, "No objects were baked successfully")
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        from ..core import library
+
+        root = bpy.path.abspath(self.directory)
+        if not os.path.isdir(root):
+            self.report({'ERROR'}, f"Library directory not found: {root}")
+            return {'CANCELLED'}
+
+        # The controller needs no bpy, so run it detached on Blender's Python
+        command = [
+            sys.executable, library.__file__,
+            "--blender", bpy.app.binary_path,
+            "--root", root,
+            "--preset", self.preset,
+            "--workers", str(self.workers),
+            "--collection", self.collection,
+            "--addon", __name__.split(".")[0],
+            "--timeout", str(self.timeout),
+        ]
+        if self.force:
+            command.append("--force")
+
+        subprocess.Popen(command)
+        self.report({'INFO'}, f"Library bake started, progress in {os.path.join(root, library.INDEX_FILENAME)}")
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_CleanupBakeImages(Operator):
+    """Unpack or purge bake images packed into the .blend"""
+    bl_idname = "bakingbakes.cleanup_bake_images"
+    bl_label = "Clean Up Packed Bakes"
+    bl_description = "Unpack or purge every bake image packed into this .blend file"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    action: bpy.props.EnumProperty(
+        name="Action",
+        items=[
+            ('UNPACK', 'Unpack', 'Write packed bakes to their files (existing files are kept) and reference them by relative path'),
+            ('PURGE', 'Purge', 'Remove packed bake images whose files exist on disk from the .blend'),
+        ],
+        default='UNPACK'
+    )
+
+    def execute(self, context):
+        from ..core import storage
+
+        images = storage.find_bake_images(packed_only=True)
+        if not images:
+            self.report({'INFO'}, "No packed bake images")
             return {'CANCELLED'}
 
+        if self.action == 'UNPACK':
+            done, skipped = storage.unpack_bake_images(images)
+            message = f"Unpacked {done} bake images"
+            if skipped:
+                message += f", {skipped} failed"
+        else:
+            done, skipped = storage.purge_bake_images(images)
+            message = f"Purged {done} bake images"
+            if skipped:
+                message += f", kept {skipped} without a file on disk"
+
+        self.report({'WARNING'} if skipped else {'INFO'}, message)
         return {'FINISHED'}
@@ -5,6 +5,8 @@ Object management operators for BakingBakes addon
 import bpy
 from bpy.types import Operator
 
+from ..core import bake_list
+
 class BAKINGBAKES_OT_AddObject(Operator):
     """Add selected object to bake list"""
     bl_idname = "bakingbakes.add_object"
@@ -22,13 +24,63 @@ class BAKINGBAKES_OT_AddObject(Operator):
             self.report({'WARNING'}, "No mesh objects selected")
             return {'CANCELLED'}
 
-        # Add objects to bake list
-        for obj in selected_objects:
-            # Check if object is already in list
-            if not any(item.object == obj for item in bake_objects.objects):
-                item = bake_objects.objects.add()
-                item.object = obj
+        # Add objects to bake list, skipping ones already listed
+        added = bake_list.add_objects(bake_objects, selected_objects)
+        if added != len(selected_objects):
+            self.report({'INFO'}, f"Added {added} objects ({len(selected_objects) - added} already listed)")
+
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_RemoveSelectedObjects(Operator):
+    """Remove selected objects from bake list"""
+    bl_idname = "bakingbakes.remove_selected_objects"
+    bl_label = "Remove Selected"
+    bl_description = "Remove every selected object from the bake list"
+
+    def execute(self, context):
+        bake_objects = context.scene.bakingbakes_objects
+        removed = bake_list.remove_objects(bake_objects, context.selected_objects)
+        self.report({'INFO'}, f"Removed {removed} objects")
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_AddCollection(Operator):
+    """Add the active collection as a bake set"""
+    bl_idname = "bakingbakes.add_collection"
+    bl_label = "Add Collection"
+    bl_description = "Add the active collection as a bake set; its meshes are gathered at bake time"
+
+    def execute(self, context):
+        collection = context.collection
+        if not collection or collection == context.scene.collection:
+            self.report({'WARNING'}, "No active collection")
+            return {'CANCELLED'}
+
+        if not bake_list.add_set(context.scene.bakingbakes_objects, collection=collection):
+            self.report({'INFO'}, f"Collection {collection.name} is already in the bake list")
+        return {'FINISHED'}
+
+class BAKINGBAKES_OT_AddPattern(Operator):
+    """Add an object name pattern as a bake set"""
+    bl_idname = "bakingbakes.add_pattern"
+    bl_label = "Add Name Pattern"
+    bl_description = "Add every mesh whose name matches a pattern; matches are gathered at bake time"
+
+    pattern: bpy.props.StringProperty(
+        name="Pattern",
+        description="Object name pattern using * and ? wildcards, e.g. 'SM_*_LOD0'",
+        default="*"
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        if not self.pattern:
+            self.report({'WARNING'}, "Empty pattern")
+            return {'CANCELLED'}
 
+        if not bake_list.add_set(context.scene.bakingbakes_objects, pattern=self.pattern):
+            self.report({'INFO'}, f"Pattern {self.pattern} is already in the bake list")
         return {'FINISHED'}
 
 class BAKINGBAKES_OT_RemoveObject(Operator):
@@ -73,6 +125,5 @@ class BAKINGBAKES_OT_RefreshObjects(Operator):
     bl_description = "Refresh the bake objects list"
 
     def execute(self, context):
-        # For now, just report success
         self.report({'INFO'}, "Bake objects list refreshed")
         return {'FINISHED'}
@@ -37,7 +37,15 @@ PRESETS = {
             'bake_roughness_glossy': True,
             'bake_metalness': True,
             'bake_ao': True,
-        }
+        },
+        # Recipe outputs, see core/recipes.py
+        'resolution': 2048,
+        'format': 'PNG',
+        'outputs': [
+            {'suffix': 'BaseColor', 'source': 'DIFFUSE'},
+            {'suffix': 'Normal', 'source': 'NORMAL'},
+            {'suffix': 'ORM', 'pack': {'R': 'AO', 'G': 'ROUGHNESS', 'B': 'METALNESS'}},
+        ]
     },
     'VFX_FILM': {
         'name': 'VFX/Film',
@@ -49,7 +57,17 @@ PRESETS = {
             'bake_specular': True,
             'bake_emission': True,
             'bake_alpha': True,
-        }
+        },
+        'resolution': 4096,
+        'format': 'OPEN_EXR',
+        'outputs': [
+            {'suffix': 'BaseColor', 'source': 'DIFFUSE'},
+            {'suffix': 'Normal', 'source': 'NORMAL'},
+            {'suffix': 'Roughness', 'source': 'ROUGHNESS'},
+            {'suffix': 'Specular', 'source': 'SPECULAR'},
+            {'suffix': 'Emission', 'source': 'EMIT'},
+            {'suffix': 'Alpha', 'source': 'ALPHA'},
+        ]
     },
     'ARCHITECTURAL': {
         'name': 'Architectural',
@@ -60,6 +78,30 @@ PRESETS = {
             'bake_roughness_glossy': True,
             'bake_ao': True,
             'bake_bump': True,
-        }
+        },
+        'resolution': 2048,
+        'format': 'JPEG',
+        'outputs': [
+            {'suffix': 'BaseColor', 'source': 'DIFFUSE'},
+            {'suffix': 'Normal', 'source': 'NORMAL'},
+            {'suffix': 'Glossiness', 'source': 'ROUGHNESS', 'invert': True},
+            {'suffix': 'AmbientOcclusion', 'source': 'AO', 'resolution': 1024},
+            {'suffix': 'Bump', 'source': 'BUMP', 'format': 'PNG'},
+        ]
     }
 }
+
+def get_preset_settings(preset_name):
+    """Get every bake toggle for a preset; toggles the preset does not list are off"""
+    if preset_name not in PRESETS:
+        raise ValueError(f"Unknown preset: {preset_name}")
+
+    settings = {attr_name: False for attr_name in DEFAULT_BAKE_SETTINGS}
+    settings.update(PRESETS[preset_name]['settings'])
+    return settings
+
+def apply_preset(bake_settings, preset_name):
+    """Apply a preset to a bake settings property group, skipping unknown toggles"""
+    for attr_name, value in get_preset_settings(preset_name).items():
+        if hasattr(bake_settings, attr_name):
+            setattr(bake_settings, attr_name, value)
@@ -2,17 +2,83 @@
 UI panels for BakingBakes addon
 """
 
+import fnmatch
+
 import bpy
 from bpy.types import Panel, UIList
-from core.properties import BakeObjectItem, BakeObjectsList, BakeSettings
+
+from ..core import bake_list, watch
+
+# List icons per item source and cached bake result
+BAKE_LIST_SOURCE_ICONS = {'OBJECT': 'OBJECT_DATA', 'COLLECTION': 'OUTLINER_COLLECTION', 'PATTERN': 'FILTER'}
+BAKE_LIST_RESULT_ICONS = {'NONE': 'BLANK1', 'DONE': 'CHECKMARK', 'FAILED': 'ERROR'}
 
 class BAKINGBAKES_UL_ObjectsList(UIList):
-    """UI List for bake objects"""
+    """UI List for bake objects with name filtering and sorting by name or status"""
+    sort_by_status: bpy.props.BoolProperty(
+        name="Sort by Status",
+        description="Show failed items first, then unbaked, then baked",
+        default=False
+    )
+    show_failed_only: bpy.props.BoolProperty(
+        name="Failed Only",
+        description="Only show items whose last bake failed",
+        default=False
+    )
+
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
-        if item.object:
-            layout.prop(item.object, "name", text="", emboss=False)
+        # Only cached item properties are read here, never the baked objects
+        label = bake_list.item_label(item)
+        valid = item.object if item.source_type == 'OBJECT' else (item.collection or item.pattern)
+
+        row = layout.row(align=True)
+        if item.source_type == 'OBJECT' and item.object:
+            row.prop(item.object, "name", text="", emboss=False, icon=BAKE_LIST_SOURCE_ICONS['OBJECT'])
         else:
-            layout.label(text="Invalid Object", icon='ERROR')
+            row.label(text=label, icon=BAKE_LIST_SOURCE_ICONS[item.source_type] if valid else 'ERROR')
+
+        status = row.row()
+        status.alignment = 'RIGHT'
+        status.label(text=item.last_bake_time[-8:] if item.last_bake_time else "", icon=BAKE_LIST_RESULT_ICONS[item.last_result])
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+        row = layout.row(align=True)
+        row.prop(self, "use_filter_sort_alpha", text="", icon='SORTALPHA')
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+        row.prop(self, "sort_by_status", text="Status", toggle=True)
+        row.prop(self, "show_failed_only", text="Failed", toggle=True)
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        labels = [bake_list.item_label(item) for item in items]
+
+        flags = [self.bitflag_filter_item] * len(items)
+        if self.filter_name:
+            pattern = f"*{self.filter_name.lower()}*"
+            flags = [
+                self.bitflag_filter_item if fnmatch.fnmatchcase(label.lower(), pattern) else 0
+                for label in labels
+            ]
+        if self.show_failed_only:
+            flags = [flag if item.last_result == 'FAILED' else 0 for flag, item in zip(flags, items)]
+
+        order = []
+        if self.sort_by_status:
+            rank = {'FAILED': 0, 'NONE': 1, 'DONE': 2}
+            order = bpy.types.UI_UL_list.sort_items_helper(
+                [(index, (rank[item.last_result], label.lower())) for index, (item, label) in enumerate(zip(items, labels))],
+                key=lambda entry: entry[1]
+            )
+        elif self.use_filter_sort_alpha:
+            order = bpy.types.UI_UL_list.sort_items_helper(
+                [(index, label.lower()) for index, label in enumerate(labels)],
+                key=lambda entry: entry[1]
+            )
+
+        return flags, order
 
 class BAKINGBAKES_PT_MainPanel(Panel):
     """Main BakingBakes panel with toggle interface"""
@@ -28,7 +94,7 @@ class BAKINGBAKES_PT_MainPanel(Panel):
         scene = context.scene
 
         # Header
-        layout.label(text="BakingBakes", icon='SHADING_SOLID'')
+        layout.label(text="BakingBakes", icon='RENDER_RESULT')
 
         # Bake Objects toggle section
         icon = 'TRIA_DOWN' if scene.bb_show_bake_objects else 'TRIA_RIGHT'
@@ -51,15 +117,46 @@ class BAKINGBAKES_PT_MainPanel(Panel):
             col = row.column(align=True)
             col.operator("bakingbakes.add_object", icon='ADD', text="")
             col.operator("bakingbakes.remove_object", icon='REMOVE', text="")
+            col.separator()
+            col.operator("bakingbakes.add_collection", icon='OUTLINER_COLLECTION', text="")
+            col.operator("bakingbakes.add_pattern", icon='FILTER', text="")
+            col.operator("bakingbakes.remove_selected_objects", icon='RESTRICT_SELECT_OFF', text="")
+            col.separator()
             col.operator("bakingbakes.clear_objects", icon='X', text="")
             col.operator("bakingbakes.refresh_objects", icon='FILE_REFRESH', text="")
 
             # Bake Selected to Target Objects checkbox
             box.prop(bake_objects, "bake_selected_to_targets", text="Bake Selected Object to Target Objects")
 
+            # Selected to Active settings subpanel
+            if bake_objects.bake_selected_to_targets:
+                sub_box = box.box()
+                sub_box.label(text="Selected to Active Settings:")
+
+                # Cage settings
+                sub_box.prop(bake_objects, "use_cage", text="Use Cage")
+                if bake_objects.use_cage:
+                    sub_box.prop(bake_objects, "cage_object", text="Cage Object")
+
+                # Auto cage settings
+                sub_box.prop(bake_objects, "use_auto_cage", text="Auto Cage")
+                if bake_objects.use_auto_cage:
+                    sub_box.prop(bake_objects, "auto_cage_distance_mode", text="Cage Distance")
+                    if bake_objects.auto_cage_distance_mode == 'VERTEX_GROUP':
+                        sub_box.prop(bake_objects, "auto_cage_vertex_group", text="Vertex Group")
+                    elif bake_objects.auto_cage_distance_mode == 'SOURCE':
+                        sub_box.prop(bake_objects, "auto_cage_margin", text="Cage Margin")
+
+                # Ray settings
+                sub_box.prop(bake_objects, "extrusion", text="Extrusion")
+                sub_box.prop(bake_objects, "max_ray_distance", text="Max Ray Distance")
+
             # Show count
             if bake_objects.objects:
-                box.label(text=f"Total objects: {len(bake_objects.objects)}")
+                box.label(text=f"Total items: {len(bake_objects.objects)}")
+                active = bake_objects.objects[bake_objects.active_index] if 0 <= bake_objects.active_index < len(bake_objects.objects) else None
+                if active and active.last_result != 'NONE':
+                    box.label(text=f"Last bake: {active.last_bake_time} {active.last_message}".strip())
             else:
                 box.label(text="No objects in list")
 
@@ -106,6 +203,50 @@ class BAKINGBAKES_PT_MainPanel(Panel):
             # Baking options
             box.separator()
             box.prop(bake_settings, "auto_uv_bake_map", text="Bake to UV Maps named 'Bake'")
+            box.prop(bake_settings, "lit_samples", text="Lit Samples")
+            box.prop(bake_settings, "share_linked_duplicates", text="Share Linked Duplicates")
+            box.prop(bake_settings, "use_evaluated_proxies", text="Cache Evaluated Meshes")
+            box.prop(bake_settings, "prune_shader_graphs", text="Prune Shader Graphs")
+            box.prop(bake_settings, "isolate_bake_scene", text="Isolate Bake Scene")
+            if bake_settings.isolate_bake_scene:
+                box.prop(bake_settings, "occluder_radius", text="Occluder Radius")
+            box.prop(bake_settings, "use_tuning_profile", text="Tuned Cycles Settings")
+            box.prop(bake_settings, "use_isolated_jobs", text="Isolated Processes")
+            if bake_settings.use_isolated_jobs:
+                col = box.column(align=True)
+                col.prop(bake_settings, "isolated_batch_size")
+                col.prop(bake_settings, "isolated_timeout")
+                col.prop(bake_settings, "isolated_memory_limit")
+                row = col.row(align=True)
+                row.prop(bake_settings, "isolated_retries")
+                row.prop(bake_settings, "isolated_backoff")
+
+            # Derived maps
+            box.separator()
+            box.label(text="Derived Maps")
+            row = box.row()
+            row.prop(bake_settings, "derive_curvature", text="Curvature")
+            row.prop(bake_settings, "derive_cavity", text="Cavity")
+            row.prop(bake_settings, "derive_normal_from_bump", text="Normal from Bump")
+            if bake_settings.derive_curvature or bake_settings.derive_cavity or bake_settings.derive_normal_from_bump:
+                row = box.row()
+                row.prop(bake_settings, "derived_strength", text="Strength")
+                if bake_settings.derive_cavity:
+                    row.prop(bake_settings, "cavity_radius", text="Cavity Radius")
+
+            # Texture atlases
+            box.separator()
+            box.prop(bake_settings, "use_atlas", text="Bake Atlas")
+            if bake_settings.use_atlas:
+                row = box.row()
+                row.prop(bake_settings, "atlas_grouping", text="")
+                row.prop(bake_settings, "atlas_name", text="")
+
+            # Recipes
+            box.separator()
+            box.prop(bake_settings, "use_recipes", text="Bake Recipes")
+            if bake_settings.use_recipes:
+                box.prop(bake_settings, "recipes", expand=True)
 
             # Show selected bake types count
             selected_types = sum([
@@ -117,6 +258,62 @@ class BAKINGBAKES_PT_MainPanel(Panel):
             ])
             box.label(text=f"Selected: {selected_types} bake types")
 
+        # Output Settings toggle section (NEW!)
+        icon = 'TRIA_DOWN' if scene.bb_show_output_settings else 'TRIA_RIGHT'
+        layout.prop(scene, "bb_show_output_settings", text="Output Settings", icon=icon, toggle=True)
+
+        if scene.bb_show_output_settings:
+            box = layout.box()
+            output_settings = scene.bakingbakes_output
+
+            box.prop(output_settings, "bake_target", text="Target")
+            if output_settings.bake_target == 'VERTEX_COLORS':
+                box.prop(output_settings, "vertex_color_domain", text="Domain")
+                box.prop(output_settings, "vertex_color_pack", text="Pack Channels")
+                if output_settings.vertex_color_pack:
+                    row = box.row(align=True)
+                    row.prop(output_settings, "vertex_pack_r", text="R")
+                    row.prop(output_settings, "vertex_pack_g", text="G")
+                    row = box.row(align=True)
+                    row.prop(output_settings, "vertex_pack_b", text="B")
+                    row.prop(output_settings, "vertex_pack_a", text="A")
+            else:
+                # Bake resolution settings
+                box.label(text="Bake at:")
+                row = box.row()
+                row.prop(output_settings, "bake_width", text="Bake Width")
+                row.prop(output_settings, "bake_height", text="Bake Height")
+
+                # Output resolution settings
+                box.label(text="Output at:")
+                row = box.row()
+                row.prop(output_settings, "output_width", text="Output Width")
+                row.prop(output_settings, "output_height", text="Output Height")
+
+                # File format
+                box.prop(output_settings, "file_format", text="Format")
+                if output_settings.file_format != 'PNG':
+                    row = box.row()
+                    row.prop(output_settings, "color_codec", text="Color")
+                    row.prop(output_settings, "generate_mips", text="Mipmaps")
+                row = box.row()
+                row.prop(output_settings, "use_postprocess_pool", text="Background Post-Processing")
+                if output_settings.use_postprocess_pool:
+                    row.prop(output_settings, "postprocess_workers", text="Processes")
+                box.prop(output_settings, "output_store", text="Store")
+                box.prop(output_settings, "collapse_uniform")
+                box.prop(output_settings, "storage_policy", text="Images")
+                row = box.row(align=True)
+                row.operator("bakingbakes.cleanup_bake_images", text="Unpack Packed Bakes", icon='PACKAGE').action = 'UNPACK'
+                row.operator("bakingbakes.cleanup_bake_images", text="Purge", icon='TRASH').action = 'PURGE'
+
+                # Margin settings
+                box.prop(output_settings, "margin_mode", text="Margin Mode")
+                if output_settings.margin_mode == 'CYCLES':
+                    box.label(text="Margin Type:")
+                    box.prop(output_settings, "margin_type", text="")
+                box.prop(output_settings, "bake_margin", text="Bake Margin")
+
         # Bake toggle section
         icon = 'TRIA_DOWN' if scene.bb_show_bake_panel else 'TRIA_RIGHT'
         layout.prop(scene, "bb_show_bake_panel", text="Bake", icon=icon, toggle=True)
@@ -128,3 +325,26 @@ class BAKINGBAKES_PT_MainPanel(Panel):
             bake_row = box.row()
             bake_row.scale_y = 2.0
             bake_row.operator("bakingbakes.bake_objects", text="BAKE OBJECTS")
+
+            row = box.row(align=True)
+            row.prop(scene.bakingbakes_settings, "cache_raw_passes", text="Cache Raw Passes")
+            row.operator("bakingbakes.bake_objects", icon='FILE_REFRESH', text="Replay").replay = True
+
+            row = box.row(align=True)
+            row.operator("bakingbakes.preview_bake", icon='SHADING_TEXTURE', text="Preview Bake")
+            row.prop(scene.bakingbakes_settings, "preview_pass", text="")
+
+            row = box.row(align=True)
+            watching = watch.is_watching()
+            row.operator(
+                "bakingbakes.toggle_watch",
+                icon='PAUSE' if watching else 'HIDE_OFF',
+                text="Stop Watching" if watching else "Watch",
+                depress=watching
+            )
+            row.prop(scene.bakingbakes_settings, "watch_debounce", text="Delay")
+
+            row = box.row(align=True)
+            row.operator("bakingbakes.plan_bake", icon='TIME', text="Plan")
+            row.operator("bakingbakes.calibrate_tuning", icon='PREFERENCES', text="Calibrate")
+            box.operator("bakingbakes.bake_library", icon='FILE_FOLDER', text="Bake Library...")